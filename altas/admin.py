@@ -1,6 +1,8 @@
 # altas/admin.py
 from django.contrib import admin
 from .models import Alta
+from usuarios.validador import filtro_rut
+from .revalidacion import revalidar_altas
 
 @admin.register(Alta)
 class AltaAdmin(admin.ModelAdmin):
@@ -70,18 +72,26 @@ class AltaAdmin(admin.ModelAdmin):
         }),
     )
     
+    def get_search_results(self, request, queryset, search_term):
+        """Las búsquedas por RUT usan la clave numérica indexada"""
+        por_rut = filtro_rut(search_term, campo='madre__rut_numero')
+        if por_rut is not None:
+            return queryset.filter(por_rut), False
+        return super().get_search_results(request, queryset, search_term)
+    
     actions = ['validar_registros_action']
     
     def validar_registros_action(self, request, queryset):
-        """Acción para validar registros de altas seleccionadas"""
-        validadas = 0
-        for alta in queryset:
-            if alta.validar_registros():
-                validadas += 1
+        """
+        Acción para validar registros de altas seleccionadas, en lote
+        (ver altas/revalidacion.py). Las altas ya confirmadas no se tocan.
+        """
+        resumen = revalidar_altas(queryset)
+        omitidas = queryset.count() - resumen['revisadas']
         
-        self.message_user(
-            request,
-            f"{validadas} alta(s) validada(s) correctamente."
-        )
+        mensaje = f"{resumen['completas']} alta(s) validada(s) correctamente."
+        if omitidas:
+            mensaje += f" {omitidas} alta(s) ya confirmada(s) no se revalidaron."
+        self.message_user(request, mensaje)
     
     validar_registros_action.short_description = "Validar registros de altas seleccionadas"
\ No newline at end of file
@@ -0,0 +1,32 @@
+# altas/almacenamiento.py
+import os
+
+from django.conf import settings
+from django.core.files.storage import FileSystemStorage
+
+
+class AlmacenamientoPrivado(FileSystemStorage):
+    """
+    Archivos con datos de pacientes guardados fuera de MEDIA_ROOT, en
+    settings.EXPORTACIONES_ROOT: no tienen URL pública (en desarrollo
+    MEDIA_ROOT se sirve sin sesión) y solo se entregan a través de las
+    vistas que revisan permisos.
+
+    La ubicación se lee del setting en cada uso, así se puede cambiar en
+    pruebas sin recargar el modelo.
+    """
+
+    def __init__(self, **kwargs):
+        kwargs.pop('base_url', None)
+        super().__init__(**kwargs)
+
+    @property
+    def base_location(self):
+        return self._location or settings.EXPORTACIONES_ROOT
+
+    @property
+    def location(self):
+        return os.path.abspath(self.base_location)
+
+    def url(self, name):
+        raise ValueError("Los archivos privados no tienen URL; se descargan desde su vista.")
@@ -0,0 +1,119 @@
+# altas/autocompletar.py
+"""
+Búsquedas acotadas para los selectores con autocompletado de los formularios
+de registro y de alta (ver SelectAutocompletar en altas/widgets.py).
+
+Cada búsqueda usa un índice por prefijo:
+- RUT: rangos sobre rut_numero (usuarios.validador.filtro_rut).
+- Nombre: índice de palabras TokenNombreMadre (pacientes.busqueda).
+- Código del recién nacido: LIKE 'RN-XXXX%' sobre codigo_unico (único).
+y retorna a lo más LIMITE_AUTOCOMPLETAR registros, con sus relaciones ya
+cargadas para armar la etiqueta sin consultas extra.
+
+En la creación del alta, el parto y el recién nacido se eligen encadenados:
+al elegir la madre se piden solo sus partos y al elegir el parto solo sus
+recién nacidos (partos_de_madre / recien_nacidos_de_parto).
+"""
+from pacientes.busqueda import buscar_madres, filtro_nombre
+from pacientes.models import Madre
+from partos.models import Parto
+from recien_nacidos.models import RecienNacido
+from usuarios.validador import filtro_rut
+
+LIMITE_AUTOCOMPLETAR = 20
+
+# Largo mínimo del texto para buscar
+LARGO_MINIMO = 2
+
+PREFIJO_CODIGO_RN = 'RN-'
+
+
+def _filtro_madre(texto, campo):
+    """Filtro por RUT o, si no parece RUT, por nombre de la madre en 'campo'"""
+    por_rut = filtro_rut(texto, campo=f'{campo}__rut_numero')
+    if por_rut is not None:
+        return por_rut
+    return filtro_nombre(texto, campo=campo)
+
+
+def buscar_madres_autocompletar(texto, queryset=None, limite=LIMITE_AUTOCOMPLETAR):
+    texto = (texto or '').strip()
+    if len(texto) < LARGO_MINIMO:
+        return []
+    queryset = Madre.objects.all() if queryset is None else queryset
+    por_rut = filtro_rut(texto, campo='rut_numero')
+    if por_rut is not None:
+        return list(queryset.filter(por_rut).order_by('rut_numero')[:limite])
+    return buscar_madres(texto, limite=limite, queryset=queryset)
+
+
+def buscar_partos_autocompletar(texto, queryset=None, limite=LIMITE_AUTOCOMPLETAR):
+    texto = (texto or '').strip()
+    if len(texto) < LARGO_MINIMO:
+        return []
+    filtro = _filtro_madre(texto, 'madre')
+    if filtro is None:
+        return []
+    queryset = Parto.objects.all() if queryset is None else queryset
+    return list(
+        queryset.filter(filtro)
+        .select_related('madre')
+        .order_by('-fecha_hora_inicio', '-pk')[:limite]
+    )
+
+
+def buscar_recien_nacidos_autocompletar(texto, queryset=None, limite=LIMITE_AUTOCOMPLETAR):
+    texto = (texto or '').strip()
+    if len(texto) < LARGO_MINIMO:
+        return []
+    queryset = RecienNacido.objects.all() if queryset is None else queryset
+    if texto.upper().startswith(PREFIJO_CODIGO_RN):
+        queryset = queryset.filter(codigo_unico__startswith=texto.upper()).order_by('codigo_unico')
+    else:
+        filtro = _filtro_madre(texto, 'parto__madre')
+        if filtro is None:
+            return []
+        queryset = queryset.filter(filtro).order_by('-parto__fecha_hora_inicio', '-pk')
+    return list(queryset.select_related('parto__madre')[:limite])
+
+
+# ==========================================
+# SELECCIÓN ENCADENADA (MADRE -> PARTO -> RN)
+# ==========================================
+
+def _id(valor):
+    try:
+        return int(valor)
+    except (TypeError, ValueError):
+        return None
+
+
+def partos_de_madre(madre_id, queryset=None, limite=LIMITE_AUTOCOMPLETAR):
+    """Partos de una madre, recientes primero (índice parto_madre_inicio_idx)"""
+    madre_id = _id(madre_id)
+    if madre_id is None:
+        return []
+    queryset = Parto.objects.all() if queryset is None else queryset
+    return list(
+        queryset.filter(madre_id=madre_id)
+        .select_related('madre')
+        .order_by('-fecha_hora_inicio', '-pk')[:limite]
+    )
+
+
+def recien_nacidos_de_parto(parto_id, queryset=None, limite=LIMITE_AUTOCOMPLETAR):
+    """Recién nacidos de un parto (índice de la clave foránea parto_id)"""
+    parto_id = _id(parto_id)
+    if parto_id is None:
+        return []
+    queryset = RecienNacido.objects.all() if queryset is None else queryset
+    return list(
+        queryset.filter(parto_id=parto_id)
+        .select_related('parto__madre')
+        .order_by('pk')[:limite]
+    )
+
+
+def resultados_json(objetos, etiqueta=str):
+    """Lista [{'id', 'texto'}] para las respuestas JSON"""
+    return [{'id': objeto.pk, 'texto': etiqueta(objeto)} for objeto in objetos]
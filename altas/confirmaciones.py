@@ -0,0 +1,154 @@
+# altas/confirmaciones.py
+"""
+Confirmación en lote de altas clínicas y administrativas.
+
+En la visita de la mañana un médico firma decenas de altas; en vez de un
+formulario y varias escrituras por alta, el lote:
+1. Lee en una consulta (SELECT ... FOR UPDATE) el estado de las altas pedidas
+   y decide cuáles se pueden confirmar.
+2. Confirma todas las elegibles con un solo UPDATE ... WHERE id IN (...),
+   dentro de la misma transacción.
+3. Envía transicion_en_lote para que los contadores del panel y los
+   resúmenes diarios se ajusten una vez por lote y no una vez por alta.
+
+Retorna un resultado por cada id pedido, en el orden recibido.
+"""
+from django.db import transaction
+from django.utils import timezone
+
+from .models import (
+    CAMPOS_PANEL,
+    Alta,
+    TransicionConflicto,
+    agregar_observaciones,
+    campos_confirmacion_administrativa,
+    campos_confirmacion_clinica,
+    nota_observaciones,
+    transicion_en_lote,
+)
+
+# Máximo de altas por lote
+LIMITE_LOTE = 100
+
+ESTADOS = dict(Alta.ESTADO_ALTA)
+
+
+def normalizar_ids(ids):
+    """Ids enteros sin repetir, en el orden recibido; los no numéricos se descartan"""
+    normalizados = []
+    for valor in ids:
+        try:
+            pk = int(valor)
+        except (TypeError, ValueError):
+            continue
+        if pk not in normalizados:
+            normalizados.append(pk)
+    return normalizados
+
+
+def _motivo_clinica(estado, completos, clinica, administrativa):
+    """Por qué un alta no admite la confirmación clínica (None si la admite)"""
+    if clinica:
+        return 'El alta clínica ya estaba confirmada'
+    if not completos:
+        return 'Registros incompletos'
+    if estado != 'validada':
+        return f'Estado actual: {ESTADOS.get(estado, estado)}'
+    return None
+
+
+def _motivo_administrativa(estado, completos, clinica, administrativa):
+    """Por qué un alta no admite la confirmación administrativa (None si la admite)"""
+    if administrativa:
+        return 'El alta administrativa ya estaba confirmada'
+    if not clinica:
+        return 'Debe confirmarse primero el alta clínica'
+    if estado != 'alta_clinica':
+        return f'Estado actual: {ESTADOS.get(estado, estado)}'
+    return None
+
+
+def _panel_despues(panel, campos):
+    """Valores de panel tras aplicar 'campos'"""
+    return tuple(campos.get(campo, valor) for campo, valor in zip(CAMPOS_PANEL, panel))
+
+
+def _confirmar_lote(ids, desde, hacia, motivo, campos, nota, mensaje):
+    """
+    Aplica la transición desde -> hacia a las altas de 'ids' que la admiten
+    según 'motivo'. Retorna (resultados, ids confirmados); cada resultado es
+    {'id', 'confirmada', 'mensaje'}.
+    """
+    ids = normalizar_ids(ids)[:LIMITE_LOTE]
+    if not ids:
+        return [], []
+
+    with transaction.atomic():
+        # FOR UPDATE: las filas quedan bloqueadas hasta el UPDATE, así la
+        # elegibilidad no cambia entre la lectura y la escritura
+        filas = {
+            pk: (estado, fecha_creacion, panel)
+            for pk, estado, fecha_creacion, *panel in (
+                Alta.objects.select_for_update()
+                .filter(pk__in=ids)
+                .values_list('pk', 'estado', 'fecha_creacion', *CAMPOS_PANEL)
+            )
+        }
+
+        resultados = []
+        elegibles = []
+        for pk in ids:
+            if pk not in filas:
+                resultados.append({'id': pk, 'confirmada': False, 'mensaje': 'El alta no existe'})
+                continue
+            estado, _, panel = filas[pk]
+            no_admite = motivo(estado, *panel)
+            resultados.append({'id': pk, 'confirmada': not no_admite, 'mensaje': no_admite or mensaje})
+            if not no_admite:
+                elegibles.append(pk)
+
+        if not elegibles:
+            return resultados, []
+
+        # update() no toca auto_now: fecha_actualizacion va explícita
+        actualizacion = {**campos, 'estado': hacia, 'fecha_actualizacion': timezone.now()}
+        if nota:
+            actualizacion['observaciones'] = agregar_observaciones(nota)
+        actualizadas = Alta.objects.filter(pk__in=elegibles, estado=desde).update(**actualizacion)
+        if actualizadas != len(elegibles):
+            # Solo posible en motores sin bloqueo de filas: se revierte el lote completo
+            raise TransicionConflicto(
+                "Algunas altas fueron modificadas por otro usuario. Revisa su estado actual."
+            )
+
+        transicion_en_lote.send(
+            sender=Alta, desde=desde, hacia=hacia,
+            filas=[
+                (filas[pk][1], tuple(filas[pk][2]), _panel_despues(filas[pk][2], campos))
+                for pk in elegibles
+            ],
+        )
+    return resultados, elegibles
+
+
+def confirmar_clinica_lote(ids, medico_nombre, observaciones=''):
+    """Confirma el alta clínica de las altas validadas de 'ids'"""
+    return _confirmar_lote(
+        ids, 'validada', 'alta_clinica', _motivo_clinica,
+        campos_confirmacion_clinica(medico_nombre),
+        nota_observaciones('Alta Clínica', observaciones),
+        f'Alta clínica confirmada por {medico_nombre}',
+    )
+
+
+def confirmar_administrativa_lote(ids, administrativo_nombre, observaciones=''):
+    """
+    Confirma el alta administrativa de las altas con alta clínica de 'ids';
+    quedan completadas en la misma escritura.
+    """
+    return _confirmar_lote(
+        ids, 'alta_clinica', 'completada', _motivo_administrativa,
+        campos_confirmacion_administrativa(administrativo_nombre),
+        nota_observaciones('Alta Administrativa', observaciones),
+        f'Alta completada por {administrativo_nombre}',
+    )
@@ -0,0 +1,185 @@
+# altas/contadores.py
+"""
+Contadores de altas por estado y contadores del panel principal.
+
+Todos los estados se cuentan en un único agregado condicional sobre el
+queryset filtrado, y el resultado se guarda en la caché compartida (setting
+CACHES) por combinación de filtros. Las entradas se invalidan subiendo una
+versión global cada vez que cambia el estado de un alta (ver
+altas/signals.py), una vez confirmada la transacción del cambio.
+
+Los contadores del panel (app.views.home) y el censo de madres
+hospitalizadas se guardan en la tabla ContadorPanel: se cuentan una vez y
+luego las señales de Alta, Parto y Madre les suman o restan cada cambio
+dentro de la misma transacción que lo produce, así abrir el panel lee una
+fila por contador y no ejecuta ningún COUNT.
+"""
+import hashlib
+import time
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, F, Q
+from django.utils import timezone
+
+from pacientes.models import Madre
+from partos.models import Parto
+from reportes.periodos import rango_dia, filtro_rango
+from .models import Alta, ContadorPanel
+from .eventos import publicar_recalculo
+
+TTL_CONTADORES = 60  # segundos
+CLAVE_VERSION = 'altas:contadores:version'
+
+# Los contadores del panel se recuentan al menos cada 5 minutos: acota el
+# desfase si algún cambio no pasa por las señales (por ejemplo, un update())
+TTL_PANEL = timedelta(minutes=5)
+
+
+def _version(clave_version):
+    version = cache.get(clave_version)
+    if version is None:
+        cache.add(clave_version, time.time_ns(), None)
+        version = cache.get(clave_version)
+    return version
+
+
+def _subir_version(clave_version):
+    try:
+        cache.incr(clave_version)
+    except ValueError:
+        cache.set(clave_version, time.time_ns(), None)
+
+
+def _version_actual():
+    return _version(CLAVE_VERSION)
+
+
+def invalidar_contadores(panel=True):
+    """
+    Descarta todos los contadores cacheados al confirmarse la transacción en
+    curso (antes, otro proceso podría volver a cachear los datos anteriores).
+    Con panel=False se conservan los del panel principal (cuando el cambio
+    ya se les sumó con ajustar_panel).
+    """
+    transaction.on_commit(lambda: _subir_version(CLAVE_VERSION))
+    if panel:
+        transaction.on_commit(lambda: ContadorPanel.objects.update(valor=None))
+        publicar_recalculo()
+
+
+def _clave_filtros(filtros):
+    firma = repr(sorted((k, str(v)) for k, v in (filtros or {}).items() if v not in (None, '')))
+    resumen = hashlib.md5(firma.encode()).hexdigest()
+    return f'altas:contadores:{_version_actual()}:{resumen}'
+
+
+def contar_por_estado(queryset, filtros=None):
+    """
+    Retorna un diccionario {'total': n, '<estado>': n, ...} para el queryset.
+    'filtros' identifica la combinación de filtros aplicada al queryset y se
+    usa como clave de caché.
+    """
+    clave = _clave_filtros(filtros)
+    contadores = cache.get(clave)
+    if contadores is None:
+        contadores = queryset.aggregate(
+            total=Count('pk'),
+            **{
+                estado: Count('pk', filter=Q(estado=estado))
+                for estado, _ in Alta.ESTADO_ALTA
+            }
+        )
+        cache.set(clave, contadores, TTL_CONTADORES)
+    return contadores
+
+
+# ==========================================
+# CONTADORES DEL PANEL PRINCIPAL
+# ==========================================
+
+def _nombre_registros(usuario_id, fecha):
+    return f'registros:{usuario_id}:{fecha.isoformat()}'
+
+
+def _contador_panel(nombre, contar):
+    fila = ContadorPanel.objects.filter(nombre=nombre).values_list('valor', 'fecha_calculo').first()
+    if fila is not None and fila[0] is not None and fila[1] > timezone.now() - TTL_PANEL:
+        return fila[0]
+    return _recontar(nombre, contar)
+
+
+def _recontar(nombre, contar):
+    """
+    Cuenta con 'contar' y guarda el valor en la fila del contador.
+    La fila queda bloqueada (FOR UPDATE) durante el recuento. Cada ajuste se
+    aplica en la transacción del cambio (ajustar_panel), así que un cambio
+    confirmado antes del bloqueo ya está en el COUNT y no trae ajuste
+    pendiente, y uno sin confirmar espera el bloqueo y se suma después sobre
+    el valor recontado: nada se pierde ni se cuenta dos veces.
+    """
+    ContadorPanel.objects.get_or_create(nombre=nombre)
+    with transaction.atomic():
+        contador = ContadorPanel.objects.select_for_update().get(nombre=nombre)
+        if contador.valor is not None and contador.fecha_calculo > timezone.now() - TTL_PANEL:
+            # Otro proceso lo recontó mientras se esperaba el bloqueo
+            return contador.valor
+        contador.valor = contar()
+        contador.fecha_calculo = timezone.now()
+        contador.save(update_fields=['valor', 'fecha_calculo'])
+    return contador.valor
+
+
+def ajustar_panel(nombre, delta):
+    """
+    Suma 'delta' a un contador del panel dentro de la transacción en curso:
+    la fila queda bloqueada hasta que esta termina y, si se revierte, el
+    ajuste también. Un contador sin recontar (valor=None) sigue así: se
+    contará en la próxima carga del panel.
+    """
+    if not delta:
+        return
+    ContadorPanel.objects.filter(nombre=nombre, valor__isnull=False).update(valor=F('valor') + delta)
+
+
+def ajustar_registros(usuario_id, fecha_registro, delta):
+    """Suma 'delta' a los registros del día de una matrona"""
+    if usuario_id is None or fecha_registro is None:
+        return
+    ajustar_panel(_nombre_registros(usuario_id, timezone.localdate(fecha_registro)), delta)
+
+
+def pendientes_clinica():
+    """Altas esperando confirmación del médico"""
+    return _contador_panel(
+        'pendientes_clinica',
+        lambda: Alta.objects.pendientes_clinica().count()
+    )
+
+
+def pendientes_administrativa():
+    """Altas esperando confirmación administrativa"""
+    return _contador_panel(
+        'pendientes_administrativa',
+        lambda: Alta.objects.pendientes_administrativa().count()
+    )
+
+
+def registros_hoy(usuario):
+    """Partos registrados hoy por el usuario"""
+    hoy = timezone.localdate()
+    return _contador_panel(
+        _nombre_registros(usuario.pk, hoy),
+        lambda: Parto.objects.filter(
+            creado_por=usuario, **filtro_rango('fecha_registro', rango_dia(hoy))
+        ).count()
+    )
+
+
+def madres_hospitalizadas():
+    """Censo actual: madres ingresadas que aún no tienen un alta completada"""
+    return _contador_panel(
+        'hospitalizadas',
+        lambda: Madre.objects.exclude(alta__estado='completada').count()
+    )
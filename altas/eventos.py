@@ -0,0 +1,133 @@
+# altas/eventos.py
+"""
+Eventos en vivo de los contadores del panel principal.
+
+Las señales de Alta y Parto publican cada ajuste de contador (ver
+altas/signals.py) y la vista app.views.eventos_panel los envía como
+Server-Sent Events a los paneles abiertos, sin recargar la página.
+
+El difusor por defecto reparte los eventos entre los clientes conectados al
+mismo proceso. Se puede cambiar con el setting EVENTOS_PANEL_BACKEND (ruta a
+una clase con suscribir(), cancelar() y publicar()); si el sitio corre en
+varios procesos, el backend debe repartir los eventos entre ellos (por
+ejemplo, sobre Redis pub/sub).
+"""
+import asyncio
+import threading
+
+from django.conf import settings
+from django.db import transaction
+from django.utils.module_loading import import_string
+
+BACKEND_POR_DEFECTO = 'altas.eventos.DifusorLocal'
+
+# Eventos pendientes por cliente; si un cliente se atrasa más, se le
+# reenvía el valor completo en vez de los ajustes perdidos
+TAMANO_COLA = 100
+
+# Contador del panel que ve cada rol
+CONTADOR_POR_ROL = {
+    'medico': 'pendientes_clinica',
+    'administrativo': 'pendientes_administrativa',
+    'matrona': 'registros_hoy',
+}
+
+
+class Suscripcion:
+    """Cola de eventos de un cliente conectado, atada a su event loop"""
+
+    def __init__(self, contador, usuario_id=None):
+        self.contador = contador
+        self.usuario_id = usuario_id
+        self.loop = asyncio.get_running_loop()
+        self.cola = asyncio.Queue(maxsize=TAMANO_COLA)
+        self.desfasada = False
+
+    @property
+    def clave(self):
+        return self.contador, self.usuario_id
+
+    def entregar(self, evento):
+        """Se ejecuta dentro del event loop del cliente"""
+        try:
+            self.cola.put_nowait(evento)
+        except asyncio.QueueFull:
+            self.desfasada = True
+
+    async def siguiente(self, espera):
+        """Próximo evento; lanza asyncio.TimeoutError si no llega en 'espera' segundos"""
+        return await asyncio.wait_for(self.cola.get(), espera)
+
+
+class DifusorLocal:
+    """
+    Reparte eventos entre las suscripciones del proceso.
+    publicar() se llama desde código síncrono (señales, en cualquier hilo):
+    la entrega se agenda en el event loop de cada suscripción.
+    """
+
+    def __init__(self):
+        self._suscripciones = {}
+        self._candado = threading.Lock()
+
+    def suscribir(self, contador, usuario_id=None):
+        suscripcion = Suscripcion(contador, usuario_id)
+        with self._candado:
+            self._suscripciones.setdefault(suscripcion.clave, set()).add(suscripcion)
+        return suscripcion
+
+    def cancelar(self, suscripcion):
+        with self._candado:
+            grupo = self._suscripciones.get(suscripcion.clave)
+            if grupo is not None:
+                grupo.discard(suscripcion)
+                if not grupo:
+                    del self._suscripciones[suscripcion.clave]
+
+    def publicar(self, evento):
+        """
+        Entrega el evento a las suscripciones de su contador (y usuario, si
+        trae usuario_id). Un evento sin contador llega a todas.
+        """
+        with self._candado:
+            if evento.get('contador') is None:
+                destinos = [s for grupo in self._suscripciones.values() for s in grupo]
+            else:
+                clave = evento['contador'], evento.get('usuario_id')
+                destinos = list(self._suscripciones.get(clave, ()))
+
+        for suscripcion in destinos:
+            try:
+                suscripcion.loop.call_soon_threadsafe(suscripcion.entregar, evento)
+            except RuntimeError:
+                # El event loop del cliente ya se cerró
+                self.cancelar(suscripcion)
+
+
+_difusor = None
+_candado_difusor = threading.Lock()
+
+
+def difusor():
+    """Difusor del proceso, creado con el backend configurado"""
+    global _difusor
+    with _candado_difusor:
+        if _difusor is None:
+            backend = getattr(settings, 'EVENTOS_PANEL_BACKEND', BACKEND_POR_DEFECTO)
+            _difusor = import_string(backend)()
+    return _difusor
+
+
+def publicar_ajuste(contador, delta, usuario_id=None):
+    """Publica el ajuste de un contador cuando se confirme la transacción actual"""
+    if not delta:
+        return
+    evento = {'contador': contador, 'delta': int(delta)}
+    if usuario_id is not None:
+        evento['usuario_id'] = usuario_id
+    transaction.on_commit(lambda: difusor().publicar(evento))
+
+
+def publicar_recalculo():
+    """Pide a todos los paneles conectados volver a leer sus contadores"""
+    transaction.on_commit(lambda: difusor().publicar({'contador': None, 'recalcular': True}))
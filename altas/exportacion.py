@@ -0,0 +1,125 @@
+# altas/exportacion.py
+"""
+Filas de exportación de altas.
+
+Las columnas se leen con una sola proyección values_list (los joins con
+madre, parto y recién nacido se resuelven en SQL), por lotes, y las
+etiquetas de los campos con choices se obtienen de diccionarios armados una
+vez, en lugar de cargar modelos y llamar get_*_display() por fila.
+"""
+import csv
+import json
+from operator import itemgetter
+
+from partos.models import Parto
+from .models import Alta
+from .paginacion import TAMANO_LOTE, recorrer_por_lotes
+
+COLUMNAS = [
+    'ID',
+    'RUT Madre',
+    'Nombre Madre',
+    'Tipo Parto',
+    'Código RN',
+    'Peso RN (kg)',
+    'Vitalidad RN (1/5 min)',
+    'Estado Alta',
+    'Alta Clínica',
+    'Alta Administrativa',
+    'Médico',
+    'Administrativo',
+    'Fecha Alta',
+    'Fecha Creación'
+]
+
+# Claves de cada columna en la exportación NDJSON
+CLAVES = [
+    'id',
+    'rut_madre',
+    'nombre_madre',
+    'tipo_parto',
+    'codigo_rn',
+    'peso_rn',
+    'vitalidad_rn',
+    'estado',
+    'alta_clinica',
+    'alta_administrativa',
+    'medico',
+    'administrativo',
+    'fecha_alta',
+    'fecha_creacion',
+]
+
+CAMPOS = (
+    'id',
+    'madre__rut',
+    'madre__nombre',
+    'parto__tipo',
+    'recien_nacido__codigo_unico',
+    'recien_nacido__peso',
+    'recien_nacido__apgar_1_min',
+    'recien_nacido__apgar_5_min',
+    'estado',
+    'alta_clinica_confirmada',
+    'alta_administrativa_confirmada',
+    'medico_confirma',
+    'administrativo_confirma',
+    'fecha_alta',
+    'fecha_creacion',
+)
+
+
+def _fecha(valor):
+    return valor.strftime('%d/%m/%Y %H:%M') if valor else '-'
+
+
+def filas_exportacion(altas, tamano=None):
+    """
+    Genera una tupla por alta con los valores de COLUMNAS, ya formateados.
+    'altas' es un queryset de Alta con los filtros a exportar.
+    """
+    tipos_parto = dict(Parto.TIPO_PARTO)
+    estados = dict(Alta.ESTADO_ALTA)
+    filas = altas.values_list(*CAMPOS)
+    
+    for (pk, rut, nombre, tipo, codigo, peso, apgar_1, apgar_5, estado,
+         clinica, administrativa, medico, administrativo,
+         fecha_alta, fecha_creacion) in recorrer_por_lotes(
+            filas, tamano or TAMANO_LOTE, clave=itemgetter(0)):
+        yield (
+            pk,
+            rut,
+            nombre,
+            tipos_parto.get(tipo, tipo),
+            codigo,
+            float(peso),
+            f"{apgar_1}/{apgar_5}",
+            estados.get(estado, estado),
+            'Sí' if clinica else 'No',
+            'Sí' if administrativa else 'No',
+            medico or '-',
+            administrativo or '-',
+            _fecha(fecha_alta),
+            _fecha(fecha_creacion),
+        )
+
+
+class _Eco:
+    """Pseudo-archivo que devuelve lo escrito, para usar csv.writer al vuelo"""
+    
+    def write(self, valor):
+        return valor
+
+
+def lineas_csv(filas):
+    """Genera el CSV línea por línea, comenzando por los encabezados"""
+    escritor = csv.writer(_Eco())
+    yield escritor.writerow(COLUMNAS)
+    for fila in filas:
+        yield escritor.writerow(fila)
+
+
+def lineas_ndjson(filas):
+    """Genera un objeto JSON por fila, uno por línea"""
+    for fila in filas:
+        yield json.dumps(dict(zip(CLAVES, fila)), ensure_ascii=False) + '\n'
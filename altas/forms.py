@@ -1,9 +1,14 @@
 # altas/forms.py
 from django import forms
+from django.utils import timezone
 from .models import Alta
 from pacientes.models import Madre
 from partos.models import Parto
 from recien_nacidos.models import RecienNacido
+from pacientes.busqueda import filtro_nombre
+from usuarios.validador import filtro_rut
+from reportes.periodos import filtro_fechas
+from .widgets import SelectAutocompletar, SelectDependiente
 
 class MadreForm(forms.ModelForm):
     """Formulario para registrar una nueva madre"""
@@ -38,7 +43,7 @@ class PartoForm(forms.ModelForm):
             'matrona_responsable', 'personal_apoyo', 'observaciones'
         ]
         widgets = {
-            'madre': forms.Select(attrs={'class': 'form-select'}),
+            'madre': SelectAutocompletar('altas:autocompletar_madres'),
             'tipo': forms.Select(attrs={'class': 'form-select'}),
             'fecha_hora_inicio': forms.DateTimeInput(attrs={
                 'class': 'form-control',
@@ -69,7 +74,9 @@ class RecienNacidoForm(forms.ModelForm):
             'vacunas_aplicadas', 'examenes_realizados', 'observaciones'
         ]
         widgets = {
-            'parto': forms.Select(attrs={'class': 'form-select'}),
+            'parto': SelectAutocompletar(
+                'altas:autocompletar_partos', placeholder='Buscar por RUT o nombre de la madre...'
+            ),
             'nombre': forms.TextInput(attrs={'class': 'form-control', 'placeholder': 'Opcional'}),
             'sexo': forms.Select(attrs={'class': 'form-select'}),
             'peso': forms.NumberInput(attrs={'class': 'form-control', 'step': '0.01'}),
@@ -84,6 +91,11 @@ class RecienNacidoForm(forms.ModelForm):
             'examenes_realizados': forms.Textarea(attrs={'class': 'form-control', 'rows': 2}),
             'observaciones': forms.Textarea(attrs={'class': 'form-control', 'rows': 3}),
         }
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # La etiqueta del parto usa el nombre de la madre
+        self.fields['parto'].queryset = Parto.objects.select_related('madre')
 
 
 class CrearAltaForm(forms.ModelForm):
@@ -96,9 +108,10 @@ class CrearAltaForm(forms.ModelForm):
         model = Alta
         fields = ['madre', 'parto', 'recien_nacido', 'observaciones']
         widgets = {
-            'madre': forms.Select(attrs={'class': 'form-select'}),
-            'parto': forms.Select(attrs={'class': 'form-select'}),
-            'recien_nacido': forms.Select(attrs={'class': 'form-select'}),
+            'madre': SelectAutocompletar('altas:autocompletar_madres', {'sin_alta': 1}),
+            # Encadenados: los partos de la madre elegida y los RN del parto elegido
+            'parto': SelectDependiente('altas:autocompletar_partos', 'madre', {'sin_alta': 1}),
+            'recien_nacido': SelectDependiente('altas:autocompletar_recien_nacidos', 'parto', {'sin_alta': 1}),
             'observaciones': forms.Textarea(attrs={
                 'class': 'form-control',
                 'rows': 3,
@@ -110,8 +123,10 @@ class CrearAltaForm(forms.ModelForm):
         super().__init__(*args, **kwargs)
         # Filtrar solo madres que no tienen alta aún
         self.fields['madre'].queryset = Madre.objects.filter(alta__isnull=True)
-        self.fields['parto'].queryset = Parto.objects.filter(alta__isnull=True)
-        self.fields['recien_nacido'].queryset = RecienNacido.objects.filter(alta__isnull=True)
+        self.fields['parto'].queryset = Parto.objects.filter(alta__isnull=True).select_related('madre')
+        self.fields['recien_nacido'].queryset = (
+            RecienNacido.objects.filter(alta__isnull=True).select_related('parto__madre')
+        )
         
         # Labels en español
         self.fields['madre'].label = "Seleccionar Madre"
@@ -119,25 +134,31 @@ class CrearAltaForm(forms.ModelForm):
         self.fields['recien_nacido'].label = "Seleccionar Recién Nacido"
         self.fields['observaciones'].label = "Observaciones"
     
+    def _get_validation_exclusions(self):
+        # Los registros ya se cargaron desde la base con querysets que solo
+        # admiten los que no tienen alta: se omiten las validaciones del modelo
+        # (existencia de cada clave foránea y unicidad, una consulta por campo)
+        exclusiones = super()._get_validation_exclusions()
+        exclusiones.update(['madre', 'parto', 'recien_nacido'])
+        return exclusiones
+    
     def clean(self):
         cleaned_data = super().clean()
         madre = cleaned_data.get('madre')
         parto = cleaned_data.get('parto')
         recien_nacido = cleaned_data.get('recien_nacido')
         
-        # Validar que el parto pertenece a la madre seleccionada
-        if madre and parto:
-            if parto.madre != madre:
-                raise forms.ValidationError(
-                    "El parto seleccionado no corresponde a la madre seleccionada."
-                )
+        # Cada campo ya cargó su registro (sin alta): basta comparar las
+        # claves foráneas, sin cargar parto.madre ni recien_nacido.parto
+        if madre and parto and parto.madre_id != madre.pk:
+            raise forms.ValidationError(
+                "El parto seleccionado no corresponde a la madre seleccionada."
+            )
         
-        # Validar que el recién nacido pertenece al parto seleccionado
-        if parto and recien_nacido:
-            if recien_nacido.parto != parto:
-                raise forms.ValidationError(
-                    "El recién nacido seleccionado no corresponde al parto seleccionado."
-                )
+        if parto and recien_nacido and recien_nacido.parto_id != parto.pk:
+            raise forms.ValidationError(
+                "El recién nacido seleccionado no corresponde al parto seleccionado."
+            )
         
         return cleaned_data
 
@@ -245,4 +266,69 @@ class BuscarAltaForm(forms.Form):
             'class': 'form-control',
             'type': 'date'
         })
-    )
\ No newline at end of file
+    )
+    
+    def filtrar(self, altas):
+        """
+        Aplica los filtros del formulario (ya validado) a un queryset de altas.
+        """
+        buscar = self.cleaned_data.get('buscar')
+        estado = self.cleaned_data.get('estado')
+        fecha_desde = self.cleaned_data.get('fecha_desde')
+        fecha_hasta = self.cleaned_data.get('fecha_hasta')
+        
+        if buscar:
+            # Si parece un RUT se busca por la clave numérica indexada,
+            # si no, por el índice de palabras del nombre
+            por_rut = filtro_rut(buscar, campo='madre__rut_numero')
+            por_nombre = filtro_nombre(buscar, campo='madre')
+            if por_rut is not None:
+                altas = altas.filter(por_rut)
+            elif por_nombre is not None:
+                altas = altas.filter(por_nombre)
+            else:
+                # Texto sin términos buscables: no coincide con nada
+                return altas.none()
+        
+        if estado:
+            altas = altas.filter(estado=estado)
+        
+        # Días locales completos, como rango UTC sobre la columna indexada
+        altas = altas.filter(**filtro_fechas('fecha_creacion', fecha_desde, fecha_hasta))
+        
+        return altas
+
+
+class LoteCertificadosForm(forms.Form):
+    """
+    Rango de fechas de alta para descargar certificados por lote.
+    Sin fechas se toman las altas completadas hoy.
+    """
+    
+    fecha_desde = forms.DateField(
+        required=False,
+        label="Altas desde",
+        widget=forms.DateInput(attrs={
+            'class': 'form-control form-control-sm',
+            'type': 'date'
+        })
+    )
+    
+    fecha_hasta = forms.DateField(
+        required=False,
+        label="Altas hasta",
+        widget=forms.DateInput(attrs={
+            'class': 'form-control form-control-sm',
+            'type': 'date'
+        })
+    )
+    
+    def filtrar(self, altas):
+        """Altas completadas en el rango de fechas del formulario (ya validado)"""
+        hoy = timezone.localdate()
+        fecha_desde = self.cleaned_data.get('fecha_desde') or hoy
+        fecha_hasta = self.cleaned_data.get('fecha_hasta') or fecha_desde
+        return altas.filter(
+            estado='completada',
+            **filtro_fechas('fecha_alta', fecha_desde, fecha_hasta)
+        )
@@ -0,0 +1,90 @@
+# altas/incremental.py
+"""
+Exportación incremental por marca de agua.
+
+Entrega solo las filas de Madre, Parto, RecienNacido y Alta modificadas
+después de una posición (fecha_actualizacion, id). La posición funciona como
+cursor reanudable: se recorre en orden ascendente con el índice
+(fecha_actualizacion, id) de cada modelo, así el costo depende de los
+cambios y no del historial completo.
+
+La entrega es "al menos una vez": si una ejecución se interrumpe, el último
+lote puede volver a enviarse, por lo que el consumidor debe insertar o
+actualizar por id.
+"""
+from datetime import timedelta
+
+from django.db.models import Q
+from django.utils import timezone
+
+from pacientes.models import Madre
+from partos.models import Parto
+from recien_nacidos.models import RecienNacido
+from .models import Alta, MarcaIncremental
+
+MODELOS = {
+    'madres': Madre,
+    'partos': Parto,
+    'recien_nacidos': RecienNacido,
+    'altas': Alta,
+}
+
+TAMANO_LOTE = 1000
+
+# No se entregan filas más nuevas que este margen: una transacción más lenta
+# podría confirmar después una fila con fecha anterior a la marca ya guardada.
+MARGEN_SEGURIDAD = timedelta(seconds=60)
+
+
+def campos_de(modelo):
+    """Columnas exportadas de un modelo (todas las concretas, con ids de FK)"""
+    return [campo.attname for campo in modelo._meta.concrete_fields]
+
+
+def cambios_desde(modelo, posicion=None, lote=TAMANO_LOTE, hasta=None):
+    """
+    Retorna (filas, nueva_posicion) con hasta 'lote' filas modificadas después
+    de 'posicion' = (fecha_actualizacion, id), en orden ascendente.
+    'hasta' limita las filas a las modificadas antes de esa fecha.
+    Si no hay cambios, nueva_posicion es la misma posición recibida.
+    """
+    filas = modelo.objects.order_by('fecha_actualizacion', 'pk')
+    if hasta is not None:
+        filas = filas.filter(fecha_actualizacion__lt=hasta)
+    if posicion is not None:
+        fecha, pk = posicion
+        filas = filas.filter(
+            Q(fecha_actualizacion__gt=fecha) | Q(fecha_actualizacion=fecha, pk__gt=pk)
+        )
+    filas = list(filas.values(*campos_de(modelo))[:lote])
+    if not filas:
+        return filas, posicion
+    ultima = filas[-1]
+    return filas, (ultima['fecha_actualizacion'], ultima['id'])
+
+
+def exportar_desde_marca(consumidor, nombre_modelo, escribir, lote=TAMANO_LOTE,
+                         margen=MARGEN_SEGURIDAD):
+    """
+    Recorre los cambios de un modelo desde la marca guardada del consumidor,
+    llamando escribir(filas) por cada lote y guardando la marca después de
+    cada uno. Retorna la cantidad de filas entregadas.
+    """
+    modelo = MODELOS[nombre_modelo]
+    marca, _ = MarcaIncremental.objects.get_or_create(
+        consumidor=consumidor, modelo=nombre_modelo
+    )
+    hasta = timezone.now() - margen
+    posicion = marca.posicion()
+    total = 0
+    
+    while True:
+        filas, posicion = cambios_desde(modelo, posicion, lote, hasta)
+        if not filas:
+            return total
+        escribir(filas)
+        total += len(filas)
+        marca.fecha_actualizacion, marca.ultimo_id = posicion
+        marca.save(update_fields=['fecha_actualizacion', 'ultimo_id', 'fecha_ejecucion'])
+        if len(filas) < lote:
+            return total
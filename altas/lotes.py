@@ -0,0 +1,106 @@
+# altas/lotes.py
+"""
+Certificados por lote.
+
+Arma un ZIP con los certificados de un conjunto de altas completadas. Los
+datos se leen en este proceso y los PDF que no están en el caché de disco
+se dibujan en un grupo de procesos pequeño (varias descargas simultáneas no
+deben ocupar todos los núcleos del servidor web). El ZIP se entrega por
+partes: cada certificado se agrega apenas está listo, sin esperar al resto.
+Si un certificado no se puede dibujar, el ZIP lleva un archivo de error en
+su lugar y la descarga continúa.
+"""
+import logging
+import os
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from .paginacion import recorrer_por_lotes
+from .pdf import escribir_certificado
+from .utils import datos_certificado, huella_certificado, ubicacion_certificado, registrar_certificado
+
+logger = logging.getLogger(__name__)
+
+# Procesos por descarga cuando no se indica otro número
+MAXIMO_PROCESOS = 2
+
+
+class _Bufer:
+    """
+    Pseudo-archivo de solo escritura para zipfile: acumula lo escrito hasta
+    que se vacía. Sin seek(), zipfile escribe el ZIP en forma secuencial.
+    """
+    
+    def __init__(self):
+        self.partes = []
+        self.posicion = 0
+    
+    def write(self, datos):
+        self.partes.append(bytes(datos))
+        self.posicion += len(datos)
+        return len(datos)
+    
+    def tell(self):
+        return self.posicion
+    
+    def flush(self):
+        pass
+    
+    def vaciar(self):
+        datos = b''.join(self.partes)
+        self.partes = []
+        return datos
+
+
+def nombre_en_zip(alta):
+    return f'certificado_alta_{alta.madre.rut}_{alta.pk}.pdf'
+
+
+def nombre_error_en_zip(alta):
+    return f'ERROR_certificado_alta_{alta.madre.rut}_{alta.pk}.txt'
+
+
+def certificados_zip(altas, procesos=None):
+    """
+    Genera el ZIP con los certificados de 'altas' en bloques de bytes.
+    'procesos' es el tamaño del grupo de procesos (por defecto
+    MAXIMO_PROCESOS, o menos si hay menos núcleos). Los certificados que ya
+    están en disco se agregan de inmediato; el resto, a medida que los
+    procesos terminan de dibujarlos.
+    """
+    altas = altas.select_related('madre', 'parto', 'recien_nacido')
+    bufer = _Bufer()
+    
+    with zipfile.ZipFile(bufer, 'w', compression=zipfile.ZIP_DEFLATED) as archivo_zip:
+        grupo = ProcessPoolExecutor(max_workers=procesos or min(MAXIMO_PROCESOS, os.cpu_count() or 1))
+        try:
+            en_curso = {}
+            for alta in recorrer_por_lotes(altas):
+                datos = datos_certificado(alta)
+                relativa, ruta = ubicacion_certificado(huella_certificado(datos))
+                if os.path.exists(ruta):
+                    registrar_certificado(alta, relativa)
+                    archivo_zip.write(ruta, nombre_en_zip(alta))
+                    yield bufer.vaciar()
+                else:
+                    en_curso[grupo.submit(escribir_certificado, datos, ruta)] = (alta, relativa)
+            
+            for futuro in as_completed(en_curso):
+                alta, relativa = en_curso[futuro]
+                try:
+                    ruta = futuro.result()
+                except Exception as error:
+                    logger.exception("Error dibujando el certificado del alta %s", alta.pk)
+                    archivo_zip.writestr(
+                        nombre_error_en_zip(alta),
+                        f"No se pudo generar el certificado del alta {alta.pk}: {error}\n",
+                    )
+                else:
+                    registrar_certificado(alta, relativa)
+                    archivo_zip.write(ruta, nombre_en_zip(alta))
+                yield bufer.vaciar()
+        finally:
+            # Si el cliente corta la descarga no se dibuja lo que quedaba en cola
+            grupo.shutdown(cancel_futures=True)
+    
+    yield bufer.vaciar()
@@ -0,0 +1,84 @@
+# altas/management/commands/exportar_incremental.py
+import json
+import os
+from datetime import datetime, timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.core.serializers.json import DjangoJSONEncoder
+
+from altas.incremental import MODELOS, TAMANO_LOTE, MARGEN_SEGURIDAD, exportar_desde_marca
+from altas.models import MarcaIncremental
+
+
+class Command(BaseCommand):
+    help = (
+        "Exporta a NDJSON las madres, partos, recién nacidos y altas modificados "
+        "desde la última ejecución del consumidor"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--consumidor',
+            default='bodega_datos',
+            help='Nombre del consumidor dueño de la marca de agua (por defecto bodega_datos)'
+        )
+        parser.add_argument(
+            '--directorio',
+            required=True,
+            help='Directorio donde se escriben los archivos <modelo>_<fecha>.ndjson'
+        )
+        parser.add_argument(
+            '--modelos',
+            nargs='+',
+            choices=list(MODELOS),
+            default=list(MODELOS),
+            help='Modelos a exportar (por defecto todos)'
+        )
+        parser.add_argument(
+            '--lote',
+            type=int,
+            default=TAMANO_LOTE,
+            help=f'Filas por consulta (por defecto {TAMANO_LOTE})'
+        )
+        parser.add_argument(
+            '--margen',
+            type=int,
+            default=int(MARGEN_SEGURIDAD.total_seconds()),
+            help='Segundos recientes que no se exportan aún (por defecto 60)'
+        )
+        parser.add_argument(
+            '--reiniciar',
+            action='store_true',
+            help='Borra las marcas del consumidor y exporta todo desde el inicio'
+        )
+
+    def handle(self, *args, **options):
+        directorio = options['directorio']
+        if not os.path.isdir(directorio):
+            raise CommandError(f"El directorio {directorio} no existe")
+
+        consumidor = options['consumidor']
+        if options['reiniciar']:
+            MarcaIncremental.objects.filter(consumidor=consumidor).delete()
+
+        sello = datetime.now().strftime('%Y%m%d_%H%M%S')
+        for nombre in options['modelos']:
+            ruta = os.path.join(directorio, f'{nombre}_{sello}.ndjson')
+            with open(ruta, 'w', encoding='utf-8') as archivo:
+                def escribir(filas):
+                    for fila in filas:
+                        archivo.write(json.dumps(fila, cls=DjangoJSONEncoder, ensure_ascii=False) + '\n')
+                    # La marca se guarda después de cada lote: el archivo debe estar en disco antes
+                    archivo.flush()
+                    os.fsync(archivo.fileno())
+
+                total = exportar_desde_marca(
+                    consumidor,
+                    nombre,
+                    escribir,
+                    lote=options['lote'],
+                    margen=timedelta(seconds=options['margen']),
+                )
+            if not total:
+                os.remove(ruta)
+            self.stdout.write(self.style.SUCCESS(f"{nombre}: {total} fila(s) modificada(s)"))
@@ -0,0 +1,53 @@
+# altas/management/commands/generar_certificados.py
+import os
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+
+from altas.forms import LoteCertificadosForm
+from altas.lotes import certificados_zip
+from altas.models import Alta
+
+
+class Command(BaseCommand):
+    help = "Genera en un ZIP los certificados de las altas completadas en un rango de fechas"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'salida',
+            help='Ruta del archivo ZIP a escribir'
+        )
+        parser.add_argument(
+            '--desde',
+            type=date.fromisoformat,
+            help='Fecha de alta inicial (AAAA-MM-DD, por defecto hoy)'
+        )
+        parser.add_argument(
+            '--hasta',
+            type=date.fromisoformat,
+            help='Fecha de alta final (AAAA-MM-DD, por defecto igual a --desde)'
+        )
+        parser.add_argument(
+            '--procesos',
+            type=int,
+            default=os.cpu_count(),
+            help=f'Procesos que dibujan certificados (por defecto {os.cpu_count()})'
+        )
+
+    def handle(self, *args, **options):
+        form = LoteCertificadosForm({
+            'fecha_desde': options['desde'],
+            'fecha_hasta': options['hasta'],
+        })
+        if not form.is_valid():
+            raise CommandError(f"Rango de fechas no válido: {form.errors.as_text()}")
+
+        altas = form.filtrar(Alta.objects.all())
+        total = altas.count()
+        with open(options['salida'], 'wb') as archivo:
+            for bloque in certificados_zip(altas, procesos=options['procesos']):
+                archivo.write(bloque)
+
+        self.stdout.write(self.style.SUCCESS(
+            f"{total} certificado(s) escritos en {options['salida']}"
+        ))
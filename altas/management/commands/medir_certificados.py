@@ -0,0 +1,75 @@
+# altas/management/commands/medir_certificados.py
+import io
+import time
+
+from django.core.management.base import BaseCommand
+
+from altas.pdf import PlantillaCertificado, plantilla
+
+# Datos de un certificado típico; no se consulta la base de datos
+DATOS_EJEMPLO = {
+    'madre': [
+        ['RUT:', '12.345.678-5'],
+        ['Nombre:', 'María José González Pérez'],
+        ['Edad:', '29 años'],
+        ['Dirección:', 'Av. Alemania 0123, Temuco'],
+        ['Teléfono:', '+56 9 1234 5678'],
+    ],
+    'parto': [
+        ['Tipo de parto:', 'Parto Natural'],
+        ['Fecha y hora:', '01/03/2025 04:15'],
+        ['Médico responsable:', 'Dr. Pedro Soto'],
+        ['Matrona responsable:', 'Carolina Muñoz'],
+        ['Complicaciones:', 'No'],
+    ],
+    'recien_nacido': [
+        ['Código único:', 'RN-20250301-0001'],
+        ['Sexo:', 'Femenino'],
+        ['Peso:', '3.25 kg'],
+        ['Talla:', '49.5 cm'],
+        ['Vitalidad (1/5 min):', '8 / 9'],
+        ['Condición:', 'Vivo'],
+    ],
+    'alta': [
+        ['Fecha de alta:', '03/03/2025 11:40'],
+        ['Médico confirmante:', 'Dr. Pedro Soto'],
+        ['Fecha conf. clínica:', '03/03/2025 09:10'],
+        ['Admin. confirmante:', 'Ana Pérez'],
+        ['Fecha conf. admin.:', '03/03/2025 11:40'],
+    ],
+    'observaciones': 'Control en CESFAM a los 7 días.\nLactancia materna exclusiva.',
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Mide cuántos certificados por segundo se dibujan armando los estilos "
+        "en cada dibujo (como antes) y con la plantilla compartida"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--repeticiones',
+            type=int,
+            default=200,
+            help='Certificados dibujados en cada medición (por defecto 200)'
+        )
+
+    def _medir(self, obtener_plantilla, repeticiones):
+        # Un dibujo previo para no medir importaciones ni cachés de fuentes
+        obtener_plantilla().dibujar(DATOS_EJEMPLO, io.BytesIO())
+        inicio = time.perf_counter()
+        for _ in range(repeticiones):
+            obtener_plantilla().dibujar(DATOS_EJEMPLO, io.BytesIO())
+        return repeticiones / (time.perf_counter() - inicio)
+
+    def handle(self, *args, **options):
+        repeticiones = options['repeticiones']
+
+        antes = self._medir(PlantillaCertificado, repeticiones)
+        self.stdout.write(f"Estilos armados en cada dibujo: {antes:8.1f} certificados/s")
+
+        despues = self._medir(plantilla, repeticiones)
+        self.stdout.write(f"Plantilla compartida:           {despues:8.1f} certificados/s")
+
+        self.stdout.write(self.style.SUCCESS(f"Mejora: x{despues / antes:.2f}"))
@@ -0,0 +1,32 @@
+# altas/management/commands/procesar_certificados.py
+import time
+
+from django.core.management.base import BaseCommand
+
+from altas.trabajos import procesar_certificados
+
+
+class Command(BaseCommand):
+    help = "Trabajador local que genera los certificados PDF de altas completadas"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--una-vez',
+            action='store_true',
+            help='Genera los certificados pendientes y termina'
+        )
+        parser.add_argument(
+            '--intervalo',
+            type=float,
+            default=2.0,
+            help='Segundos de espera entre revisiones de la cola (por defecto 2)'
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            procesados = procesar_certificados()
+            if procesados:
+                self.stdout.write(self.style.SUCCESS(f"{procesados} certificado(s) generado(s)"))
+            if options['una_vez']:
+                return
+            time.sleep(options['intervalo'])
@@ -0,0 +1,32 @@
+# altas/management/commands/procesar_exportaciones.py
+import time
+
+from django.core.management.base import BaseCommand
+
+from altas.trabajos import procesar_cola
+
+
+class Command(BaseCommand):
+    help = "Trabajador local que procesa la cola de exportaciones de altas"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--una-vez',
+            action='store_true',
+            help='Procesa los trabajos pendientes y termina'
+        )
+        parser.add_argument(
+            '--intervalo',
+            type=float,
+            default=5.0,
+            help='Segundos de espera entre revisiones de la cola (por defecto 5)'
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            procesados = procesar_cola()
+            if procesados:
+                self.stdout.write(self.style.SUCCESS(f"{procesados} exportación(es) procesada(s)"))
+            if options['una_vez']:
+                return
+            time.sleep(options['intervalo'])
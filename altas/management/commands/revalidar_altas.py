@@ -0,0 +1,29 @@
+# altas/management/commands/revalidar_altas.py
+from django.core.management.base import BaseCommand, CommandError
+
+from altas.revalidacion import TAMANO_LOTE, revalidar_altas
+
+
+class Command(BaseCommand):
+    help = (
+        "Revalida los registros de todas las altas pendientes o validadas, "
+        "en lotes y con las reglas de validar_registros evaluadas en SQL"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--tamano',
+            type=int,
+            default=TAMANO_LOTE,
+            help=f'Altas por lote (por defecto {TAMANO_LOTE})'
+        )
+
+    def handle(self, *args, **options):
+        if options['tamano'] < 1:
+            raise CommandError("--tamano debe ser mayor que cero")
+
+        resumen = revalidar_altas(tamano=options['tamano'])
+        self.stdout.write(self.style.SUCCESS(
+            f"{resumen['revisadas']} alta(s) revisada(s): {resumen['completas']} con registros completos, "
+            f"{resumen['actualizadas']} actualizada(s)"
+        ))
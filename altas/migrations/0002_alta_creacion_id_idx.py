@@ -0,0 +1,20 @@
+# Generated by Django 5.2.6 on 2026-10-18 04:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('altas', '0001_initial'),
+        ('pacientes', '0002_madre_creado_por'),
+        ('partos', '0002_parto_creado_por'),
+        ('recien_nacidos', '0003_reciennacido_creado_por'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='alta',
+            index=models.Index(fields=['fecha_creacion', 'id'], name='alta_creacion_id_idx'),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.6 on 2026-10-18 04:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('altas', '0002_alta_creacion_id_idx'),
+        ('pacientes', '0004_tokennombremadre'),
+        ('partos', '0002_parto_creado_por'),
+        ('recien_nacidos', '0003_reciennacido_creado_por'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='alta',
+            index=models.Index(fields=['estado', 'fecha_creacion'], name='alta_estado_creacion_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='alta',
+            index=models.Index(fields=['registros_completos', 'alta_clinica_confirmada'], name='alta_pend_clinica_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='alta',
+            index=models.Index(fields=['alta_clinica_confirmada', 'alta_administrativa_confirmada'], name='alta_pend_admin_idx'),
+        ),
+    ]
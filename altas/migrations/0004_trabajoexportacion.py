@@ -0,0 +1,39 @@
+# Generated by Django 5.2.6 on 2026-10-18 04:34
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('altas', '0003_indices_paneles'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TrabajoExportacion',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('formato', models.CharField(choices=[('xlsx', 'Excel'), ('csv', 'CSV'), ('ndjson', 'NDJSON')], default='xlsx', max_length=10, verbose_name='Formato')),
+                ('filtros', models.JSONField(blank=True, default=dict, help_text='Parámetros de BuscarAltaForm usados para la exportación', verbose_name='Filtros')),
+                ('estado', models.CharField(choices=[('pendiente', 'En cola'), ('en_proceso', 'En proceso'), ('completado', 'Completado'), ('error', 'Error')], default='pendiente', max_length=20, verbose_name='Estado')),
+                ('total_filas', models.PositiveIntegerField(blank=True, null=True, verbose_name='Total de filas')),
+                ('filas_procesadas', models.PositiveIntegerField(default=0, verbose_name='Filas procesadas')),
+                ('archivo', models.FileField(blank=True, upload_to='exportaciones/', verbose_name='Archivo generado')),
+                ('error', models.TextField(blank=True, verbose_name='Detalle del error')),
+                ('fecha_creacion', models.DateTimeField(auto_now_add=True, verbose_name='Fecha de solicitud')),
+                ('fecha_inicio', models.DateTimeField(blank=True, null=True, verbose_name='Inicio del proceso')),
+                ('fecha_termino', models.DateTimeField(blank=True, null=True, verbose_name='Término del proceso')),
+                ('solicitado_por', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='exportaciones', to=settings.AUTH_USER_MODEL, verbose_name='Solicitado por')),
+            ],
+            options={
+                'verbose_name': 'Trabajo de exportación',
+                'verbose_name_plural': 'Trabajos de exportación',
+                'ordering': ['-fecha_creacion'],
+                'indexes': [models.Index(fields=['estado', 'fecha_creacion'], name='exportacion_cola_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 5.2.6 on 2026-10-18 04:36
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('altas', '0004_trabajoexportacion'),
+        ('pacientes', '0005_incremental'),
+        ('partos', '0004_incremental'),
+        ('recien_nacidos', '0004_incremental'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MarcaIncremental',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('consumidor', models.CharField(help_text='Nombre del proceso que consume la exportación (ej: bodega_datos)', max_length=100, verbose_name='Consumidor')),
+                ('modelo', models.CharField(max_length=50, verbose_name='Modelo exportado')),
+                ('fecha_actualizacion', models.DateTimeField(blank=True, null=True, verbose_name='Última fecha de actualización entregada')),
+                ('ultimo_id', models.BigIntegerField(blank=True, null=True, verbose_name='Último id entregado')),
+                ('fecha_ejecucion', models.DateTimeField(auto_now=True, verbose_name='Última ejecución')),
+            ],
+            options={
+                'verbose_name': 'Marca de exportación incremental',
+                'verbose_name_plural': 'Marcas de exportación incremental',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='alta',
+            index=models.Index(fields=['fecha_actualizacion', 'id'], name='alta_actualizacion_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='marcaincremental',
+            constraint=models.UniqueConstraint(fields=('consumidor', 'modelo'), name='marca_consumidor_modelo_unica'),
+        ),
+    ]
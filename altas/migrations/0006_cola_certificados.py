@@ -0,0 +1,42 @@
+# Generated by Django 5.2.6 on 2026-10-18 04:40
+
+from django.db import migrations, models
+
+
+def marcar_generados(apps, schema_editor):
+    """Las altas con certificado ya generado quedan con estado 'generado'"""
+    Alta = apps.get_model('altas', 'Alta')
+    Alta.objects.filter(certificado_generado=True).update(estado_certificado='generado')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('altas', '0005_incremental'),
+        ('pacientes', '0005_incremental'),
+        ('partos', '0004_incremental'),
+        ('recien_nacidos', '0004_incremental'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='alta',
+            name='error_certificado',
+            field=models.TextField(blank=True, verbose_name='Error al generar el certificado'),
+        ),
+        migrations.AddField(
+            model_name='alta',
+            name='estado_certificado',
+            field=models.CharField(choices=[('sin_solicitar', 'Sin solicitar'), ('pendiente', 'En cola'), ('en_proceso', 'Generándose'), ('generado', 'Generado'), ('error', 'Error')], default='sin_solicitar', max_length=20, verbose_name='Estado del certificado PDF'),
+        ),
+        migrations.AddField(
+            model_name='alta',
+            name='fecha_solicitud_certificado',
+            field=models.DateTimeField(blank=True, null=True, verbose_name='Fecha de solicitud del certificado'),
+        ),
+        migrations.AddIndex(
+            model_name='alta',
+            index=models.Index(fields=['estado_certificado', 'fecha_solicitud_certificado'], name='alta_cola_certificado_idx'),
+        ),
+        migrations.RunPython(marcar_generados, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,51 @@
+# Generated by Django 5.2.6 on 2026-10-18 05:19
+
+import os
+import secrets
+import shutil
+
+import altas.almacenamiento
+from django.conf import settings
+from django.db import migrations, models
+
+
+def mover_archivos(apps, schema_editor):
+    """
+    Saca de MEDIA_ROOT los archivos de exportaciones anteriores (que quedaban
+    públicos en desarrollo) y les da un nombre aleatorio.
+    """
+    TrabajoExportacion = apps.get_model('altas', 'TrabajoExportacion')
+    os.makedirs(settings.EXPORTACIONES_ROOT, exist_ok=True)
+    for trabajo in TrabajoExportacion.objects.exclude(archivo=''):
+        anterior = os.path.join(settings.MEDIA_ROOT, trabajo.archivo.name)
+        if not os.path.exists(anterior):
+            continue
+        nombre = f'{secrets.token_urlsafe(24)}{os.path.splitext(anterior)[1]}'
+        shutil.move(anterior, os.path.join(settings.EXPORTACIONES_ROOT, nombre))
+        TrabajoExportacion.objects.filter(pk=trabajo.pk).update(archivo=nombre)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('altas', '0006_cola_certificados'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='trabajoexportacion',
+            name='fecha_latido',
+            field=models.DateTimeField(blank=True, null=True, verbose_name='Último avance informado'),
+        ),
+        migrations.AddField(
+            model_name='trabajoexportacion',
+            name='intentos',
+            field=models.PositiveSmallIntegerField(default=0, verbose_name='Veces que se tomó el trabajo'),
+        ),
+        migrations.AlterField(
+            model_name='trabajoexportacion',
+            name='archivo',
+            field=models.FileField(blank=True, help_text='Nombre aleatorio en EXPORTACIONES_ROOT; se descarga solo desde la vista', storage=altas.almacenamiento.AlmacenamientoPrivado(), upload_to='', verbose_name='Archivo generado'),
+        ),
+        migrations.RunPython(mover_archivos, migrations.RunPython.noop),
+    ]
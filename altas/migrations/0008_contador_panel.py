@@ -0,0 +1,26 @@
+# Generated by Django 5.2.6 on 2026-10-18 05:25
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('altas', '0007_exportacion_privada'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ContadorPanel',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('nombre', models.CharField(max_length=100, unique=True, verbose_name='Nombre')),
+                ('valor', models.IntegerField(blank=True, null=True, verbose_name='Valor')),
+                ('fecha_calculo', models.DateTimeField(blank=True, null=True, verbose_name='Fecha del último recuento')),
+            ],
+            options={
+                'verbose_name': 'Contador del panel',
+                'verbose_name_plural': 'Contadores del panel',
+            },
+        ),
+    ]
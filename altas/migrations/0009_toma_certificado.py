@@ -0,0 +1,18 @@
+# Generated by Django 5.2.6 on 2026-10-18 05:28
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('altas', '0008_contador_panel'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='alta',
+            name='fecha_toma_certificado',
+            field=models.DateTimeField(blank=True, null=True, verbose_name='Fecha en que un trabajador tomó el certificado'),
+        ),
+    ]
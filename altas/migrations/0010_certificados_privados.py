@@ -0,0 +1,36 @@
+# Generated by Django 5.2.6 on 2026-10-18 06:10
+
+import os
+import shutil
+
+from django.conf import settings
+from django.db import migrations
+
+
+def mover_certificados(apps, schema_editor):
+    """
+    Saca de MEDIA_ROOT los certificados ya guardados (que quedaban públicos
+    en desarrollo) y los deja con la misma ruta relativa en el almacenamiento
+    privado, así ruta_certificado sigue siendo válida.
+    """
+    origen = os.path.join(settings.MEDIA_ROOT, 'certificados')
+    if not os.path.isdir(origen):
+        return
+    for carpeta, _, archivos in os.walk(origen):
+        relativa = os.path.relpath(carpeta, settings.MEDIA_ROOT)
+        destino = os.path.join(settings.EXPORTACIONES_ROOT, relativa)
+        os.makedirs(destino, exist_ok=True)
+        for archivo in archivos:
+            shutil.move(os.path.join(carpeta, archivo), os.path.join(destino, archivo))
+    shutil.rmtree(origen, ignore_errors=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('altas', '0009_toma_certificado'),
+    ]
+
+    operations = [
+        migrations.RunPython(mover_certificados, migrations.RunPython.noop),
+    ]
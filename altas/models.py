@@ -1,10 +1,105 @@
 # altas/models.py
-from django.db import models
+from django.db import models, router, transaction
+from django.db.models.functions import Concat
+from django.db.models.signals import post_init
+from django.dispatch import Signal
+from django.conf import settings
 from django.core.exceptions import ValidationError
 from pacientes.models import Madre
 from partos.models import Parto
 from recien_nacidos.models import RecienNacido
 from django.utils import timezone
+from .almacenamiento import AlmacenamientoPrivado
+
+
+class TransicionConflicto(ValidationError):
+    """
+    El alta ya no estaba en el estado esperado: otro usuario la cambió entre
+    que se cargó y que se intentó confirmar.
+    """
+
+
+# Se envía tras cambiar el estado de altas con update() (Alta._transicionar y
+# las confirmaciones en lote de altas/confirmaciones.py), que no envía
+# post_save por cada alta. Argumentos: desde, hacia (estados) y
+# filas: [(fecha_creacion, valores de panel antes, valores de panel después)],
+# con los valores de panel de CAMPOS_PANEL.
+transicion_en_lote = Signal()
+
+CAMPOS_PANEL = ('registros_completos', 'alta_clinica_confirmada', 'alta_administrativa_confirmada')
+
+
+def campos_confirmacion_clinica(medico_nombre, ahora=None):
+    """Campos que fija la confirmación del alta clínica"""
+    return {
+        'alta_clinica_confirmada': True,
+        'medico_confirma': medico_nombre,
+        'fecha_confirmacion_clinica': ahora or timezone.now(),
+    }
+
+
+def campos_confirmacion_administrativa(administrativo_nombre, ahora=None):
+    """Campos que fija la confirmación administrativa, que además completa el alta"""
+    ahora = ahora or timezone.now()
+    return {
+        'alta_administrativa_confirmada': True,
+        'administrativo_confirma': administrativo_nombre,
+        'fecha_confirmacion_administrativa': ahora,
+        'fecha_alta': ahora,
+    }
+
+
+def nota_observaciones(etiqueta, observaciones):
+    """Texto que se agrega a las observaciones del alta al confirmar"""
+    return f"\n[{etiqueta}] {observaciones}" if observaciones else ''
+
+
+def agregar_observaciones(nota):
+    """Expresión que agrega 'nota' al final de las observaciones dentro del UPDATE"""
+    return Concat(models.F('observaciones'), models.Value(nota), output_field=models.TextField())
+
+
+def resultado_validacion(madre_completa, parto_completo, rn_completo, estado):
+    """
+    (registros_completos, observaciones_validacion, estado) que deja la
+    validación de registros. La usan Alta.validar_registros y la
+    revalidación en lote (altas/revalidacion.py).
+    """
+    problemas = []
+    if not madre_completa:
+        problemas.append("Madre: faltan datos personales o clínicos")
+    if not parto_completo:
+        problemas.append("Parto: faltan datos del proceso o personal clínico")
+    if not rn_completo:
+        problemas.append("Recién Nacido: faltan datos clínicos o valoración APGAR")
+    
+    if problemas:
+        return False, " | ".join(problemas), 'pendiente'
+    return True, "Todos los registros están completos", 'validada' if estado == 'pendiente' else estado
+
+
+class AltaQuerySet(models.QuerySet):
+    """
+    Consultas de los paneles.
+    Los booleanos se comparan con Value(...) para que el SQL quede como
+    "campo = 1" y no como "campo" / "NOT campo", forma que los motores
+    pueden resolver con los índices compuestos de Alta.Meta.indexes.
+    """
+    
+    def pendientes_clinica(self):
+        """Altas con registros completos esperando confirmación del médico"""
+        return self.filter(
+            registros_completos=models.Value(True),
+            alta_clinica_confirmada=models.Value(False)
+        )
+    
+    def pendientes_administrativa(self):
+        """Altas con alta clínica esperando confirmación administrativa"""
+        return self.filter(
+            alta_clinica_confirmada=models.Value(True),
+            alta_administrativa_confirmada=models.Value(False)
+        )
+
 
 class Alta(models.Model):
     """
@@ -21,6 +116,14 @@ class Alta(models.Model):
         ('rechazada', 'Rechazada'),
     ]
     
+    ESTADO_CERTIFICADO = [
+        ('sin_solicitar', 'Sin solicitar'),
+        ('pendiente', 'En cola'),
+        ('en_proceso', 'Generándose'),
+        ('generado', 'Generado'),
+        ('error', 'Error'),
+    ]
+    
     # Relaciones
     madre = models.OneToOneField(
         Madre,
@@ -102,6 +205,26 @@ class Alta(models.Model):
         blank=True,
         verbose_name="Ruta del certificado PDF"
     )
+    estado_certificado = models.CharField(
+        max_length=20,
+        choices=ESTADO_CERTIFICADO,
+        default='sin_solicitar',
+        verbose_name="Estado del certificado PDF"
+    )
+    fecha_solicitud_certificado = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name="Fecha de solicitud del certificado"
+    )
+    fecha_toma_certificado = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name="Fecha en que un trabajador tomó el certificado"
+    )
+    error_certificado = models.TextField(
+        blank=True,
+        verbose_name="Error al generar el certificado"
+    )
     
     # Fechas del proceso
     fecha_alta = models.DateTimeField(
@@ -124,81 +247,129 @@ class Alta(models.Model):
         verbose_name="Observaciones generales"
     )
     
+    objects = AltaQuerySet.as_manager()
+    
     class Meta:
         verbose_name = "Alta"
         verbose_name_plural = "Altas"
         ordering = ['-fecha_creacion']
+        indexes = [
+            # Soporta la paginación por cursor de lista_altas
+            models.Index(fields=['fecha_creacion', 'id'], name='alta_creacion_id_idx'),
+            # Filtro por estado ordenado por fecha (lista de altas)
+            models.Index(fields=['estado', 'fecha_creacion'], name='alta_estado_creacion_idx'),
+            # Pendientes de alta clínica (panel del médico)
+            models.Index(fields=['registros_completos', 'alta_clinica_confirmada'], name='alta_pend_clinica_idx'),
+            # Pendientes de alta administrativa (panel administrativo)
+            models.Index(fields=['alta_clinica_confirmada', 'alta_administrativa_confirmada'], name='alta_pend_admin_idx'),
+            # Exportación incremental por marca de agua (altas/incremental.py)
+            models.Index(fields=['fecha_actualizacion', 'id'], name='alta_actualizacion_idx'),
+            # Cola de certificados (altas/trabajos.py)
+            models.Index(fields=['estado_certificado', 'fecha_solicitud_certificado'], name='alta_cola_certificado_idx'),
+        ]
     
     def __str__(self):
         return f"Alta - {self.madre.nombre} ({self.get_estado_display()})"
     
+    def save(self, *args, **kwargs):
+        """
+        Guarda en una transacción: el ajuste de los contadores del panel
+        (post_save) se aplica en la misma, no después de confirmado el cambio.
+        """
+        with transaction.atomic(using=kwargs.get('using') or router.db_for_write(Alta, instance=self)):
+            super().save(*args, **kwargs)
+    
     def validar_registros(self):
         """
         Valida que madre, parto y recién nacido tengan registros completos.
         Actualiza el campo registros_completos y observaciones_validacion.
         """
-        problemas = []
+        self.registros_completos, self.observaciones_validacion, self.estado = resultado_validacion(
+            self.madre.tiene_registros_completos(),
+            self.parto.tiene_registros_completos(),
+            self.recien_nacido.tiene_registros_completos(),
+            self.estado,
+        )
         
-        # Validar madre
-        if not self.madre.tiene_registros_completos():
-            problemas.append("Madre: faltan datos personales o clínicos")
-        
-        # Validar parto
-        if not self.parto.tiene_registros_completos():
-            problemas.append("Parto: faltan datos del proceso o personal clínico")
+        self.save(update_fields=[
+            'registros_completos', 'observaciones_validacion', 'estado', 'fecha_actualizacion'
+        ])
+        return self.registros_completos
+    
+    def _transicionar(self, hacia, campos, observacion='', condiciones=None):
+        """
+        Cambia el estado del alta a 'hacia' con un único
+        UPDATE ... SET <campos> WHERE id = <pk> AND estado = <estado cargado>
+        AND <condiciones>. Si ninguna fila coincide (otro usuario cambió el
+        alta antes), lanza TransicionConflicto sin modificar nada ni enviar
+        señales.
         
-        # Validar recién nacido
-        if not self.recien_nacido.tiene_registros_completos():
-            problemas.append("Recién Nacido: faltan datos clínicos o valoración APGAR")
+        update() no envía señales ni toca auto_now: fecha_actualizacion se
+        fija aquí y, solo si el UPDATE cambió el alta, se envía
+        transicion_en_lote con esta alta, para que los contadores del panel y
+        los resúmenes de reportes se ajusten igual que con save(). Retorna el
+        nuevo estado, sin volver a leer el alta.
+        """
+        diferidos = {'estado', 'fecha_creacion', *CAMPOS_PANEL} & self.get_deferred_fields()
+        if diferidos:
+            self.refresh_from_db(fields=diferidos)
+        desde = self.estado
+        antes = tuple(getattr(self, campo) for campo in CAMPOS_PANEL)
         
-        # Actualizar estado
-        if problemas:
-            self.registros_completos = False
-            self.observaciones_validacion = " | ".join(problemas)
-            self.estado = 'pendiente'
-        else:
-            self.registros_completos = True
-            self.observaciones_validacion = "Todos los registros están completos"
-            if self.estado == 'pendiente':
-                self.estado = 'validada'
+        valores = {**campos, 'estado': hacia, 'fecha_actualizacion': timezone.now()}
+        actualizacion = dict(valores)
+        if observacion:
+            actualizacion['observaciones'] = agregar_observaciones(observacion)
         
-        self.save()
-        return self.registros_completos
+        using = router.db_for_write(Alta, instance=self)
+        with transaction.atomic(using=using):
+            filas = Alta.objects.using(using).filter(
+                pk=self.pk, estado=desde, **(condiciones or {})
+            ).update(**actualizacion)
+            if not filas:
+                raise TransicionConflicto(
+                    "El alta fue modificada por otro usuario. Revisa su estado actual."
+                )
+            
+            for campo, valor in valores.items():
+                setattr(self, campo, valor)
+            if observacion and 'observaciones' in self.__dict__:
+                self.observaciones += observacion
+            transicion_en_lote.send(
+                sender=Alta, desde=desde, hacia=hacia,
+                filas=[(self.fecha_creacion, antes, tuple(getattr(self, campo) for campo in CAMPOS_PANEL))],
+            )
+        # Las señales vuelven a tomar los valores iniciales, ahora los guardados
+        post_init.send(sender=Alta, instance=self)
+        return hacia
     
-    def confirmar_alta_clinica(self, medico_nombre):
-        """Confirma el alta clínica por parte del médico"""
+    def confirmar_alta_clinica(self, medico_nombre, observaciones=''):
+        """Confirma el alta clínica por parte del médico; retorna el nuevo estado"""
         if not self.registros_completos:
             raise ValidationError("No se puede confirmar alta clínica sin registros completos")
         
-        self.alta_clinica_confirmada = True
-        self.medico_confirma = medico_nombre
-        self.fecha_confirmacion_clinica = timezone.now()
-        self.estado = 'alta_clinica'
-        self.save()
-        
-        # Verificar si se completa el alta
-        self._verificar_alta_completa()
+        return self._transicionar(
+            'alta_clinica',
+            campos_confirmacion_clinica(medico_nombre),
+            observacion=nota_observaciones('Alta Clínica', observaciones),
+            condiciones={'registros_completos': models.Value(True)},
+        )
     
-    def confirmar_alta_administrativa(self, administrativo_nombre):
-        """Confirma el alta administrativa"""
+    def confirmar_alta_administrativa(self, administrativo_nombre, observaciones=''):
+        """
+        Confirma el alta administrativa. Como el alta clínica ya está
+        confirmada, el alta queda completada en la misma escritura.
+        Retorna el nuevo estado.
+        """
         if not self.alta_clinica_confirmada:
             raise ValidationError("Debe confirmarse primero el alta clínica")
         
-        self.alta_administrativa_confirmada = True
-        self.administrativo_confirma = administrativo_nombre
-        self.fecha_confirmacion_administrativa = timezone.now()
-        self.estado = 'alta_administrativa'
-        self.save()
-        
-        # Verificar si se completa el alta
-        self._verificar_alta_completa()
-    
-    def _verificar_alta_completa(self):
-        """Verifica si ambas confirmaciones están completas"""
-        if self.alta_clinica_confirmada and self.alta_administrativa_confirmada:
-            self.estado = 'completada'
-            self.fecha_alta = timezone.now()
-            self.save()
+        return self._transicionar(
+            'completada',
+            campos_confirmacion_administrativa(administrativo_nombre),
+            observacion=nota_observaciones('Alta Administrativa', observaciones),
+            condiciones={'alta_clinica_confirmada': models.Value(True)},
+        )
     
     def puede_confirmar_alta_clinica(self):
         """Verifica si se puede confirmar el alta clínica"""
@@ -210,4 +381,206 @@ class Alta(models.Model):
     
     def esta_completada(self):
         """Verifica si el proceso de alta está completado"""
-        return self.estado == 'completada'
\ No newline at end of file
+        return self.estado == 'completada'
+
+class TrabajoExportacion(models.Model):
+    """
+    Exportación de altas procesada en segundo plano.
+    Los trabajos quedan en cola en la base de datos y los toma el comando
+    procesar_exportaciones (ver altas/trabajos.py).
+    """
+    
+    FORMATOS = [
+        ('xlsx', 'Excel'),
+        ('csv', 'CSV'),
+        ('ndjson', 'NDJSON'),
+    ]
+    
+    ESTADOS = [
+        ('pendiente', 'En cola'),
+        ('en_proceso', 'En proceso'),
+        ('completado', 'Completado'),
+        ('error', 'Error'),
+    ]
+    
+    formato = models.CharField(
+        max_length=10,
+        choices=FORMATOS,
+        default='xlsx',
+        verbose_name="Formato"
+    )
+    filtros = models.JSONField(
+        default=dict,
+        blank=True,
+        verbose_name="Filtros",
+        help_text="Parámetros de BuscarAltaForm usados para la exportación"
+    )
+    estado = models.CharField(
+        max_length=20,
+        choices=ESTADOS,
+        default='pendiente',
+        verbose_name="Estado"
+    )
+    
+    # Progreso
+    total_filas = models.PositiveIntegerField(
+        null=True,
+        blank=True,
+        verbose_name="Total de filas"
+    )
+    filas_procesadas = models.PositiveIntegerField(
+        default=0,
+        verbose_name="Filas procesadas"
+    )
+    
+    # Resultado
+    archivo = models.FileField(
+        storage=AlmacenamientoPrivado(),
+        blank=True,
+        verbose_name="Archivo generado",
+        help_text="Nombre aleatorio en EXPORTACIONES_ROOT; se descarga solo desde la vista"
+    )
+    error = models.TextField(
+        blank=True,
+        verbose_name="Detalle del error"
+    )
+    
+    # Auditoría
+    solicitado_por = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='exportaciones',
+        verbose_name="Solicitado por"
+    )
+    fecha_creacion = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name="Fecha de solicitud"
+    )
+    fecha_inicio = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name="Inicio del proceso"
+    )
+    fecha_termino = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name="Término del proceso"
+    )
+    
+    # Plazo de la toma: el trabajador renueva fecha_latido mientras avanza;
+    # si se detiene (caída del proceso) otro trabajador retoma el trabajo
+    fecha_latido = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name="Último avance informado"
+    )
+    intentos = models.PositiveSmallIntegerField(
+        default=0,
+        verbose_name="Veces que se tomó el trabajo"
+    )
+    
+    class Meta:
+        verbose_name = "Trabajo de exportación"
+        verbose_name_plural = "Trabajos de exportación"
+        ordering = ['-fecha_creacion']
+        indexes = [
+            # Cola: el trabajador busca los pendientes más antiguos
+            models.Index(fields=['estado', 'fecha_creacion'], name='exportacion_cola_idx'),
+        ]
+    
+    def __str__(self):
+        return f"Exportación #{self.pk} {self.get_formato_display()} ({self.get_estado_display()})"
+    
+    def porcentaje(self):
+        """Avance del trabajo entre 0 y 100"""
+        if self.estado == 'completado':
+            return 100
+        if not self.total_filas:
+            return 0
+        return min(100, int(self.filas_procesadas * 100 / self.total_filas))
+    
+    def esta_terminado(self):
+        return self.estado in ('completado', 'error')
+
+
+class MarcaIncremental(models.Model):
+    """
+    Marca de agua de la exportación incremental.
+    Guarda, por consumidor y modelo, la última posición (fecha_actualizacion, id)
+    entregada, para que la siguiente ejecución continúe desde ahí.
+    """
+    
+    consumidor = models.CharField(
+        max_length=100,
+        verbose_name="Consumidor",
+        help_text="Nombre del proceso que consume la exportación (ej: bodega_datos)"
+    )
+    modelo = models.CharField(
+        max_length=50,
+        verbose_name="Modelo exportado"
+    )
+    fecha_actualizacion = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name="Última fecha de actualización entregada"
+    )
+    ultimo_id = models.BigIntegerField(
+        null=True,
+        blank=True,
+        verbose_name="Último id entregado"
+    )
+    fecha_ejecucion = models.DateTimeField(
+        auto_now=True,
+        verbose_name="Última ejecución"
+    )
+    
+    class Meta:
+        verbose_name = "Marca de exportación incremental"
+        verbose_name_plural = "Marcas de exportación incremental"
+        constraints = [
+            models.UniqueConstraint(fields=['consumidor', 'modelo'], name='marca_consumidor_modelo_unica'),
+        ]
+    
+    def __str__(self):
+        return f"{self.consumidor} / {self.modelo}: {self.fecha_actualizacion} #{self.ultimo_id}"
+    
+    def posicion(self):
+        """Retorna (fecha_actualizacion, id) o None si aún no se exporta nada"""
+        if self.fecha_actualizacion is None:
+            return None
+        return self.fecha_actualizacion, self.ultimo_id
+
+
+class ContadorPanel(models.Model):
+    """
+    Contador del panel principal (altas/contadores.py).
+    Las señales le suman cada cambio con un UPDATE dentro de la misma
+    transacción que lo produce (no al confirmarse), así un recuento nunca ve
+    el cambio sin su ajuste y un rollback también revierte el ajuste.
+    valor=None indica que debe recontarse.
+    """
+    
+    nombre = models.CharField(
+        max_length=100,
+        unique=True,
+        verbose_name="Nombre"
+    )
+    valor = models.IntegerField(
+        null=True,
+        blank=True,
+        verbose_name="Valor"
+    )
+    fecha_calculo = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name="Fecha del último recuento"
+    )
+    
+    class Meta:
+        verbose_name = "Contador del panel"
+        verbose_name_plural = "Contadores del panel"
+    
+    def __str__(self):
+        return f"{self.nombre}: {self.valor}"
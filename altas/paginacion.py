@@ -0,0 +1,134 @@
+# altas/paginacion.py
+"""
+Paginación por cursor (keyset) para listados ordenados por fecha.
+
+En lugar de OFFSET, cada página se obtiene filtrando a partir del último
+registro mostrado sobre el par (fecha, id), por lo que el costo de la
+consulta no depende de cuántas páginas se hayan recorrido.
+"""
+import base64
+import binascii
+
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+
+POR_PAGINA = 25
+
+
+def codificar_cursor(fecha, pk):
+    """Codifica la posición (fecha, id) en un token seguro para URL"""
+    crudo = f"{fecha.isoformat()}|{pk}".encode()
+    return base64.urlsafe_b64encode(crudo).decode().rstrip('=')
+
+
+def decodificar_cursor(cursor):
+    """
+    Decodifica un cursor generado por codificar_cursor.
+    Retorna (fecha, id) o None si el cursor no es válido.
+    """
+    if not cursor:
+        return None
+    try:
+        relleno = '=' * (-len(cursor) % 4)
+        crudo = base64.urlsafe_b64decode(cursor + relleno).decode()
+        fecha_txt, pk_txt = crudo.rsplit('|', 1)
+        fecha = parse_datetime(fecha_txt)
+        pk = int(pk_txt)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        return None
+    if fecha is None:
+        return None
+    return fecha, pk
+
+
+class PaginaKeyset:
+    """Resultado de una página: objetos y cursores para navegar"""
+
+    def __init__(self, objetos, campo, tiene_anterior, tiene_siguiente):
+        self.objetos = objetos
+        self.tiene_anterior = tiene_anterior
+        self.tiene_siguiente = tiene_siguiente
+        self.cursor_anterior = None
+        self.cursor_siguiente = None
+        if objetos:
+            primero, ultimo = objetos[0], objetos[-1]
+            if tiene_anterior:
+                self.cursor_anterior = codificar_cursor(getattr(primero, campo), primero.pk)
+            if tiene_siguiente:
+                self.cursor_siguiente = codificar_cursor(getattr(ultimo, campo), ultimo.pk)
+
+    def __iter__(self):
+        return iter(self.objetos)
+
+    def __len__(self):
+        return len(self.objetos)
+
+
+def paginar_keyset(queryset, cursor=None, direccion='siguiente',
+                   campo='fecha_creacion', por_pagina=POR_PAGINA):
+    """
+    Pagina un queryset en orden descendente por (campo, id).
+
+    - cursor: token de la última (o primera) fila vista; None para la primera página.
+    - direccion: 'siguiente' avanza hacia registros más antiguos,
+      'anterior' retrocede hacia registros más recientes.
+
+    Se pide una fila extra para saber si existe otra página sin usar COUNT.
+    """
+    posicion = decodificar_cursor(cursor)
+
+    if posicion is not None and direccion == 'anterior':
+        fecha, pk = posicion
+        filas = list(
+            queryset.filter(
+                Q(**{f'{campo}__gt': fecha}) | Q(**{campo: fecha, 'pk__gt': pk})
+            ).order_by(campo, 'pk')[:por_pagina + 1]
+        )
+        if not filas:
+            # No hay registros más recientes que el cursor (por ejemplo, se
+            # eliminaron): se muestra la primera página
+            return paginar_keyset(queryset, campo=campo, por_pagina=por_pagina)
+        hay_mas = len(filas) > por_pagina
+        objetos = filas[:por_pagina][::-1]
+        # La fila del cursor y las más antiguas quedan después de esta página
+        return PaginaKeyset(objetos, campo, tiene_anterior=hay_mas, tiene_siguiente=True)
+
+    queryset = queryset.order_by(f'-{campo}', '-pk')
+    if posicion is not None:
+        fecha, pk = posicion
+        queryset = queryset.filter(
+            Q(**{f'{campo}__lt': fecha}) | Q(**{campo: fecha, 'pk__lt': pk})
+        )
+    filas = list(queryset[:por_pagina + 1])
+    hay_mas = len(filas) > por_pagina
+    return PaginaKeyset(
+        filas[:por_pagina],
+        campo,
+        tiene_anterior=posicion is not None,
+        tiene_siguiente=hay_mas,
+    )
+
+
+TAMANO_LOTE = 2000
+
+
+def recorrer_por_lotes(queryset, tamano=TAMANO_LOTE, clave=None):
+    """
+    Recorre un queryset completo en orden descendente por id, pidiendo
+    'tamano' filas por consulta (keyset sobre id).
+    La memoria usada no depende del total de filas, en cualquier motor
+    (el driver de MySQL carga en memoria el resultado completo de .iterator()).
+    
+    'clave' obtiene el id de una fila; por defecto fila.pk. Para querysets
+    de values_list se puede pasar, por ejemplo, operator.itemgetter(0).
+    """
+    clave = clave or (lambda fila: fila.pk)
+    queryset = queryset.order_by('-pk')
+    ultimo = None
+    while True:
+        lote = queryset if ultimo is None else queryset.filter(pk__lt=ultimo)
+        filas = list(lote[:tamano])
+        yield from filas
+        if len(filas) < tamano:
+            break
+        ultimo = clave(filas[-1])
@@ -0,0 +1,159 @@
+# altas/pdf.py
+"""
+Dibujo del certificado de alta con ReportLab.
+
+Este módulo no importa modelos: recibe los textos ya armados por
+utils.datos_certificado, así sus funciones pueden ejecutarse en otros
+procesos (generación por lotes en altas/lotes.py).
+"""
+import copy
+import os
+import tempfile
+from datetime import datetime
+
+from reportlab.lib.pagesizes import letter
+from reportlab.lib import colors
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.lib.units import inch
+from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
+from reportlab.lib.enums import TA_CENTER
+
+# Subir al cambiar el diseño del certificado, para que se vuelvan a dibujar
+VERSION_CERTIFICADO = 1
+
+
+ANCHOS_TABLA = [2*inch, 4*inch]
+
+# (subtítulo, clave en los datos, espacio posterior en pulgadas)
+SECCIONES = [
+    ("DATOS DE LA MADRE", 'madre', 0.3),
+    ("INFORMACIÓN DEL PARTO", 'parto', 0.3),
+    ("DATOS DEL RECIÉN NACIDO", 'recien_nacido', 0.4),
+    ("INFORMACIÓN DEL ALTA", 'alta', 0.5),
+]
+
+
+class PlantillaCertificado:
+    """
+    Estilos y bloques fijos del certificado, armados una sola vez.
+    Cada dibujo solo crea las tablas y párrafos con los datos del alta; los
+    bloques fijos se copian (copia superficial) porque ReportLab guarda en
+    ellos el resultado de la diagramación.
+    """
+    
+    def __init__(self):
+        styles = getSampleStyleSheet()
+        self.estilo_normal = styles['Normal']
+        
+        # Estilo personalizado para el título
+        self.estilo_titulo = ParagraphStyle(
+            'CustomTitle',
+            parent=styles['Heading1'],
+            fontSize=18,
+            textColor=colors.HexColor('#1a365d'),
+            spaceAfter=30,
+            alignment=TA_CENTER
+        )
+        
+        # Estilo para subtítulos
+        self.estilo_subtitulo = ParagraphStyle(
+            'Subtitle',
+            parent=styles['Heading2'],
+            fontSize=14,
+            textColor=colors.HexColor('#2c5282'),
+            spaceAfter=12,
+            spaceBefore=12
+        )
+        
+        # Pie de página
+        self.estilo_pie = ParagraphStyle(
+            'Footer',
+            parent=styles['Normal'],
+            fontSize=9,
+            textColor=colors.grey,
+            alignment=TA_CENTER
+        )
+        
+        # Las cuatro tablas de datos comparten el mismo estilo
+        self.estilo_tabla = TableStyle([
+            ('BACKGROUND', (0, 0), (0, -1), colors.HexColor('#e2e8f0')),
+            ('TEXTCOLOR', (0, 0), (-1, -1), colors.black),
+            ('ALIGN', (0, 0), (0, -1), 'LEFT'),
+            ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (-1, -1), 10),
+            ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
+            ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
+        ])
+        
+        # Bloques fijos (el texto ya queda interpretado)
+        self.titulo = Paragraph("CERTIFICADO DE ALTA HOSPITALARIA", self.estilo_titulo)
+        self.subtitulos = {
+            clave: Paragraph(subtitulo, self.estilo_subtitulo)
+            for subtitulo, clave, _ in SECCIONES
+        }
+        self.subtitulo_observaciones = Paragraph("OBSERVACIONES", self.estilo_subtitulo)
+    
+    def story(self, datos):
+        """Lista de bloques del certificado para los datos de un alta"""
+        story = [copy.copy(self.titulo), Spacer(1, 0.3 * inch)]
+        
+        for _, clave, espacio in SECCIONES:
+            story.append(copy.copy(self.subtitulos[clave]))
+            story.append(Table(datos[clave], colWidths=ANCHOS_TABLA, style=self.estilo_tabla))
+            story.append(Spacer(1, espacio * inch))
+        
+        # Observaciones
+        if datos['observaciones']:
+            story.append(copy.copy(self.subtitulo_observaciones))
+            story.append(Paragraph(datos['observaciones'].replace('\n', '<br/>'), self.estilo_normal))
+            story.append(Spacer(1, 0.3 * inch))
+        
+        story.append(Spacer(1, 0.5 * inch))
+        story.append(Paragraph(
+            f"Certificado emitido el {datetime.now().strftime('%d/%m/%Y a las %H:%M')}",
+            self.estilo_pie
+        ))
+        return story
+    
+    def dibujar(self, datos, destino):
+        """Dibuja el certificado en 'destino' (ruta o archivo binario)"""
+        doc = SimpleDocTemplate(destino, pagesize=letter)
+        doc.build(self.story(datos))
+
+
+_plantilla = None
+
+
+def plantilla():
+    """Plantilla compartida del proceso; se arma en el primer uso"""
+    global _plantilla
+    if _plantilla is None:
+        _plantilla = PlantillaCertificado()
+    return _plantilla
+
+
+def dibujar_certificado(datos, destino):
+    """
+    Dibuja el certificado de alta con ReportLab en 'destino'
+    (ruta o archivo abierto en modo binario).
+    """
+    plantilla().dibujar(datos, destino)
+
+
+def escribir_certificado(datos, ruta):
+    """
+    Dibuja el certificado en 'ruta'. Se escribe en un temporal de la misma
+    carpeta y se renombra, así nadie lee un PDF a medio escribir.
+    Retorna la ruta.
+    """
+    carpeta = os.path.dirname(ruta)
+    os.makedirs(carpeta, exist_ok=True)
+    descriptor, temporal = tempfile.mkstemp(suffix='.pdf', dir=carpeta)
+    try:
+        with os.fdopen(descriptor, 'wb') as archivo:
+            dibujar_certificado(datos, archivo)
+        os.replace(temporal, ruta)
+    except BaseException:
+        os.remove(temporal)
+        raise
+    return ruta
@@ -0,0 +1,40 @@
+# altas/respuestas.py
+"""
+Descargas por partes también bajo ASGI.
+
+Bajo ASGI, Django envía un StreamingHttpResponse (o FileResponse) de contenido
+síncrono consumiéndolo entero con sync_to_async(list): el archivo completo
+queda en memoria antes del primer byte. por_partes() cambia ese contenido por
+un iterador asíncrono que pide al hilo de la petición unas pocas partes a la
+vez (un lote de filas, un bloque del archivo o un certificado del ZIP), así la
+memoria usada sigue siendo la de una parte. Bajo WSGI la respuesta no cambia.
+"""
+from itertools import islice
+
+from asgiref.sync import sync_to_async
+from django.core.handlers.asgi import ASGIRequest
+
+
+def _siguientes(iterador, paso):
+    return list(islice(iterador, paso))
+
+
+async def _partes(iterador, paso):
+    # thread_sensitive (por defecto): las consultas usan la conexión de la petición
+    siguientes = sync_to_async(_siguientes)
+    while True:
+        partes = await siguientes(iterador, paso)
+        if not partes:
+            return
+        yield b''.join(partes)
+
+
+def por_partes(request, response, paso=1):
+    """
+    Prepara 'response' (StreamingHttpResponse o FileResponse) para enviarse
+    por partes. 'paso' es cuántas partes del contenido se piden por vez; se
+    envían juntas. Retorna la misma respuesta.
+    """
+    if isinstance(request, ASGIRequest) and not response.is_async:
+        response.streaming_content = _partes(iter(response.streaming_content), paso)
+    return response
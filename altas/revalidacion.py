@@ -0,0 +1,101 @@
+# altas/revalidacion.py
+"""
+Revalidación en lote de los registros de las altas.
+
+Alta.validar_registros carga la madre, el parto y el recién nacido de una
+alta, evalúa tiene_registros_completos() en Python y guarda la fila. Aquí las
+mismas reglas se evalúan en SQL (filtro_registros_completos de cada modelo)
+para un lote de altas a la vez:
+1. Una consulta (SELECT ... FOR UPDATE) trae, por alta, si cada registro
+   está completo.
+2. resultado_validacion() decide lo mismo que validar_registros.
+3. Las altas que cambian se guardan con un UPDATE por cada resultado
+   distinto (a lo más unos pocos por lote), y transicion_en_lote ajusta
+   contadores del panel y resúmenes diarios.
+
+Solo se revalidan altas aún no confirmadas (pendientes o validadas): una
+revalidación masiva no debe devolver a pendiente un alta ya firmada.
+"""
+from collections import defaultdict
+
+from django.db import transaction
+from django.utils import timezone
+
+from pacientes.models import Madre
+from partos.models import Parto
+from recien_nacidos.models import RecienNacido
+from .models import CAMPOS_PANEL, Alta, resultado_validacion, transicion_en_lote
+
+ESTADOS_REVALIDABLES = ('pendiente', 'validada')
+
+# Altas por consulta y transacción
+TAMANO_LOTE = 500
+
+
+def _con_validacion(queryset):
+    return queryset.annotate(
+        madre_completa=Madre.filtro_registros_completos('madre__'),
+        parto_completo=Parto.filtro_registros_completos('parto__'),
+        rn_completo=RecienNacido.filtro_registros_completos('recien_nacido__'),
+    ).values_list(
+        'pk', 'estado', 'fecha_creacion', 'observaciones_validacion', *CAMPOS_PANEL,
+        'madre_completa', 'parto_completo', 'rn_completo',
+    )
+
+
+def _revalidar_lote(filas):
+    """Guarda los cambios de un lote ya leído; retorna cuántas altas cambiaron"""
+    # (estado anterior, nuevo resultado) -> [(pk, fecha_creacion, panel antes)]
+    grupos = defaultdict(list)
+    for (pk, estado, fecha_creacion, observaciones, completos, clinica, administrativa,
+         madre_completa, parto_completo, rn_completo) in filas:
+        resultado = resultado_validacion(
+            bool(madre_completa), bool(parto_completo), bool(rn_completo), estado
+        )
+        if resultado != (completos, observaciones, estado):
+            grupos[estado, resultado].append((pk, fecha_creacion, (completos, clinica, administrativa)))
+
+    ahora = timezone.now()
+    for (desde, (completos, observaciones, hacia)), altas in grupos.items():
+        Alta.objects.filter(pk__in=[pk for pk, _, _ in altas]).update(
+            registros_completos=completos,
+            observaciones_validacion=observaciones,
+            estado=hacia,
+            fecha_actualizacion=ahora,
+        )
+        transicion_en_lote.send(
+            sender=Alta, desde=desde, hacia=hacia,
+            filas=[
+                (fecha_creacion, panel, (completos, *panel[1:]))
+                for _, fecha_creacion, panel in altas
+            ],
+        )
+    return sum(len(altas) for altas in grupos.values())
+
+
+def revalidar_altas(queryset=None, tamano=TAMANO_LOTE):
+    """
+    Revalida las altas pendientes o validadas de 'queryset' (por defecto
+    todas), en lotes de 'tamano' recorridos por id descendente.
+    Retorna {'revisadas', 'actualizadas', 'completas'}.
+    """
+    queryset = Alta.objects.all() if queryset is None else queryset
+    filas_lote = _con_validacion(
+        queryset.filter(estado__in=ESTADOS_REVALIDABLES).order_by('-pk')
+    )
+
+    resumen = {'revisadas': 0, 'actualizadas': 0, 'completas': 0}
+    ultimo = None
+    while True:
+        with transaction.atomic():
+            # FOR UPDATE: nadie confirma ni edita estas altas entre la lectura y el UPDATE
+            lote = filas_lote if ultimo is None else filas_lote.filter(pk__lt=ultimo)
+            filas = list(lote.select_for_update()[:tamano])
+            resumen['actualizadas'] += _revalidar_lote(filas)
+        resumen['revisadas'] += len(filas)
+        resumen['completas'] += sum(
+            1 for fila in filas if fila[-3] and fila[-2] and fila[-1]
+        )
+        if len(filas) < tamano:
+            return resumen
+        ultimo = filas[-1][0]
@@ -0,0 +1,144 @@
+# altas/signals.py
+from django.db.models.signals import post_init, post_save, post_delete
+from django.dispatch import receiver
+from django.utils import timezone
+
+from pacientes.models import Madre
+from partos.models import Parto
+from .models import Alta, transicion_en_lote
+from .contadores import invalidar_contadores, ajustar_panel, ajustar_registros
+from .eventos import publicar_ajuste
+
+
+def _en_paneles(valores):
+    """
+    (pendiente de alta clínica, pendiente de alta administrativa) a partir de
+    (registros_completos, alta_clinica_confirmada, alta_administrativa_confirmada).
+    Mismos criterios que AltaQuerySet.
+    """
+    completos, clinica, administrativa = valores
+    return (
+        bool(completos) and not clinica,
+        bool(clinica) and not administrativa,
+    )
+
+
+def _ajustar(contador, delta):
+    """Ajusta el contador del panel y avisa a los paneles conectados"""
+    ajustar_panel(contador, delta)
+    publicar_ajuste(contador, delta)
+
+
+def _ajustar_registros(parto, delta):
+    """Ajusta los registros del día de quien creó el parto (solo si es de hoy se avisa)"""
+    ajustar_registros(parto.creado_por_id, parto.fecha_registro, delta)
+    if parto.creado_por_id is None or parto.fecha_registro is None:
+        return
+    if timezone.localdate(parto.fecha_registro) == timezone.localdate():
+        publicar_ajuste('registros_hoy', delta, usuario_id=parto.creado_por_id)
+
+
+def _valores_panel(instance):
+    return (
+        instance.__dict__.get('registros_completos'),
+        instance.__dict__.get('alta_clinica_confirmada'),
+        instance.__dict__.get('alta_administrativa_confirmada'),
+    )
+
+
+@receiver(post_init, sender=Alta)
+def recordar_estado(sender, instance, **kwargs):
+    """Guarda el estado con que se cargó el alta para detectar cambios"""
+    instance._estado_inicial = instance.__dict__.get('estado')
+    instance._panel_inicial = _valores_panel(instance)
+
+
+@receiver(post_save, sender=Alta)
+def alta_guardada(sender, instance, created, **kwargs):
+    """
+    Invalida los contadores por estado si el alta es nueva o cambió de estado,
+    y suma el cambio a los contadores del panel.
+    """
+    estado = instance.__dict__.get('estado')
+    antes = (False, False, False) if created else instance._panel_inicial
+    despues = _valores_panel(instance)
+
+    if None in antes or None in despues:
+        # Campos diferidos: no se sabe qué cambió, se descarta todo
+        invalidar_contadores()
+    else:
+        if created or estado != instance._estado_inicial:
+            invalidar_contadores(panel=False)
+        clinica_antes, admin_antes = _en_paneles(antes)
+        clinica_despues, admin_despues = _en_paneles(despues)
+        _ajustar('pendientes_clinica', clinica_despues - clinica_antes)
+        _ajustar('pendientes_administrativa', admin_despues - admin_antes)
+
+        # La madre sale del censo de hospitalizadas al completarse el alta
+        estado_antes = 'nueva' if created else instance._estado_inicial
+        if estado is None or estado_antes is None:
+            invalidar_contadores()
+        else:
+            ajustar_panel('hospitalizadas', (estado_antes == 'completada') - (estado == 'completada'))
+
+    instance._estado_inicial = estado
+    instance._panel_inicial = despues
+
+
+@receiver(post_delete, sender=Alta)
+def alta_eliminada(sender, instance, **kwargs):
+    valores = _valores_panel(instance)
+    if None in valores:
+        invalidar_contadores()
+        return
+    invalidar_contadores(panel=False)
+    clinica, administrativa = _en_paneles(valores)
+    _ajustar('pendientes_clinica', -clinica)
+    _ajustar('pendientes_administrativa', -administrativa)
+    estado = instance.__dict__.get('estado')
+    if estado is None:
+        invalidar_contadores()
+    elif estado == 'completada':
+        ajustar_panel('hospitalizadas', 1)
+
+
+@receiver(transicion_en_lote, sender=Alta)
+def altas_transicionadas(sender, desde, hacia, filas, **kwargs):
+    """Mismos ajustes que alta_guardada, sumados para todo el lote"""
+    if not filas:
+        return
+    invalidar_contadores(panel=False)
+    clinica = administrativa = 0
+    for _, antes, despues in filas:
+        clinica_antes, admin_antes = _en_paneles(antes)
+        clinica_despues, admin_despues = _en_paneles(despues)
+        clinica += clinica_despues - clinica_antes
+        administrativa += admin_despues - admin_antes
+    _ajustar('pendientes_clinica', clinica)
+    _ajustar('pendientes_administrativa', administrativa)
+    ajustar_panel('hospitalizadas', ((desde == 'completada') - (hacia == 'completada')) * len(filas))
+
+
+@receiver(post_save, sender=Parto)
+def parto_guardado(sender, instance, created, **kwargs):
+    """Suma el parto nuevo a los registros del día de quien lo creó"""
+    if created:
+        _ajustar_registros(instance, 1)
+
+
+@receiver(post_delete, sender=Parto)
+def parto_eliminado(sender, instance, **kwargs):
+    _ajustar_registros(instance, -1)
+
+
+@receiver(post_save, sender=Madre)
+def madre_guardada(sender, instance, created, **kwargs):
+    """Una madre nueva entra al censo de hospitalizadas"""
+    if created:
+        ajustar_panel('hospitalizadas', 1)
+
+
+@receiver(post_delete, sender=Madre)
+def madre_eliminada(sender, instance, **kwargs):
+    # Su alta (si la tenía) se eliminó antes en cascada y ya la devolvió al censo
+    ajustar_panel('hospitalizadas', -1)
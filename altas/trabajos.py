@@ -0,0 +1,273 @@
+# altas/trabajos.py
+"""
+Cola de exportaciones en segundo plano.
+
+Los trabajos se guardan en la tabla TrabajoExportacion. Un trabajador local
+(comando procesar_exportaciones) los toma en orden de llegada, genera el
+archivo en EXPORTACIONES_ROOT e informa el avance en la misma fila,
+así la exportación no ocupa un proceso web.
+
+Los certificados PDF usan la misma idea con el estado guardado en el alta:
+al completarse un alta queda "pendiente" y el comando procesar_certificados
+lo genera fuera de la petición.
+
+Los archivos de exportación se guardan con nombre aleatorio fuera de
+MEDIA_ROOT (altas/almacenamiento.py).
+"""
+import logging
+import secrets
+import tempfile
+import traceback
+from datetime import timedelta
+
+from django.core.files import File
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from .exportacion import filas_exportacion, lineas_csv, lineas_ndjson
+from .forms import BuscarAltaForm
+from .models import Alta, TrabajoExportacion
+from .utils import escribir_excel, obtener_certificado
+
+logger = logging.getLogger(__name__)
+
+# Cada cuántas filas se guarda el avance
+FILAS_POR_AVANCE = 1000
+
+# Sin avance informado por este plazo, un trabajo en proceso se da por
+# abandonado y otro trabajador lo retoma
+PLAZO_LATIDO = timedelta(minutes=10)
+MAXIMO_INTENTOS = 3
+
+# Un certificado en proceso por más de este plazo se da por abandonado (un
+# PDF se genera en segundos) y vuelve a tomarse
+PLAZO_CERTIFICADO = timedelta(minutes=5)
+
+
+def encolar_exportacion(usuario, formato, filtros):
+    """Crea un trabajo de exportación pendiente"""
+    return TrabajoExportacion.objects.create(
+        solicitado_por=usuario,
+        formato=formato,
+        filtros=filtros,
+    )
+
+
+def _tomables(ahora):
+    """Trabajos pendientes o en proceso cuyo trabajador dejó de informar avance"""
+    return Q(estado='pendiente') | Q(estado='en_proceso', fecha_latido__lt=ahora - PLAZO_LATIDO)
+
+
+def tomar_siguiente():
+    """
+    Toma el trabajo pendiente más antiguo y lo marca en proceso.
+    La toma es un UPDATE condicionado al estado, por lo que dos trabajadores
+    nunca procesan el mismo trabajo. Un trabajo en proceso sin avance por
+    PLAZO_LATIDO (su trabajador se cayó) se vuelve a tomar; tras
+    MAXIMO_INTENTOS tomas queda con error. Retorna None si la cola está vacía.
+    """
+    while True:
+        ahora = timezone.now()
+        pk = (
+            TrabajoExportacion.objects.filter(_tomables(ahora))
+            .order_by('fecha_creacion', 'pk')
+            .values_list('pk', flat=True)
+            .first()
+        )
+        if pk is None:
+            return None
+        tomado = TrabajoExportacion.objects.filter(_tomables(ahora), pk=pk).update(
+            estado='en_proceso',
+            fecha_inicio=ahora,
+            fecha_latido=ahora,
+            intentos=F('intentos') + 1,
+        )
+        if not tomado:
+            continue
+        trabajo = TrabajoExportacion.objects.get(pk=pk)
+        if trabajo.intentos <= MAXIMO_INTENTOS:
+            return trabajo
+        TrabajoExportacion.objects.filter(pk=pk, intentos=trabajo.intentos).update(
+            estado='error',
+            error=f"El trabajo se interrumpió {MAXIMO_INTENTOS} veces sin terminar.",
+            fecha_termino=ahora,
+        )
+
+
+def _altas_del_trabajo(trabajo):
+    altas = Alta.objects.all()
+    form_buscar = BuscarAltaForm(trabajo.filtros or None)
+    if form_buscar.is_valid():
+        altas = form_buscar.filtrar(altas)
+    return altas
+
+
+def _con_avance(filas, trabajo):
+    """Reenvía las filas y guarda el avance cada FILAS_POR_AVANCE filas"""
+    procesadas = 0
+    for fila in filas:
+        yield fila
+        procesadas += 1
+        if procesadas % FILAS_POR_AVANCE == 0:
+            TrabajoExportacion.objects.filter(pk=trabajo.pk).update(
+                filas_procesadas=procesadas, fecha_latido=timezone.now()
+            )
+    trabajo.filas_procesadas = procesadas
+
+
+def procesar(trabajo):
+    """Genera el archivo de un trabajo ya tomado y lo deja completado o con error"""
+    try:
+        altas = _altas_del_trabajo(trabajo)
+        trabajo.total_filas = altas.count()
+        TrabajoExportacion.objects.filter(pk=trabajo.pk).update(
+            total_filas=trabajo.total_filas, fecha_latido=timezone.now()
+        )
+        
+        filas = _con_avance(filas_exportacion(altas), trabajo)
+        with tempfile.TemporaryFile() as archivo:
+            if trabajo.formato == 'xlsx':
+                escribir_excel(filas, archivo)
+            else:
+                lineas = lineas_csv(filas) if trabajo.formato == 'csv' else lineas_ndjson(filas)
+                for linea in lineas:
+                    archivo.write(linea.encode('utf-8'))
+            archivo.seek(0)
+            
+            # Nombre aleatorio: no se puede adivinar el archivo de otra exportación
+            nombre = f'{secrets.token_urlsafe(24)}.{trabajo.formato}'
+            trabajo.archivo.save(nombre, File(archivo), save=False)
+        
+        trabajo.estado = 'completado'
+    except Exception:
+        logger.exception("Error procesando la exportación %s", trabajo.pk)
+        trabajo.estado = 'error'
+        trabajo.error = traceback.format_exc()
+    
+    trabajo.fecha_termino = timezone.now()
+    # Solo si la toma sigue siendo nuestra: si el plazo venció y otro
+    # trabajador retomó el trabajo, el resultado es suyo
+    guardado = TrabajoExportacion.objects.filter(
+        pk=trabajo.pk, estado='en_proceso', intentos=trabajo.intentos
+    ).update(
+        estado=trabajo.estado,
+        archivo=trabajo.archivo.name or '',
+        error=trabajo.error,
+        total_filas=trabajo.total_filas,
+        filas_procesadas=trabajo.filas_procesadas,
+        fecha_termino=trabajo.fecha_termino,
+    )
+    if not guardado and trabajo.archivo:
+        trabajo.archivo.delete(save=False)
+    return trabajo
+
+
+def procesar_cola():
+    """Procesa trabajos hasta vaciar la cola; retorna cuántos procesó"""
+    procesados = 0
+    while True:
+        trabajo = tomar_siguiente()
+        if trabajo is None:
+            return procesados
+        procesar(trabajo)
+        procesados += 1
+
+
+# ==========================================
+# COLA DE CERTIFICADOS
+# ==========================================
+
+def encolar_certificado(alta):
+    """
+    Deja el certificado del alta en cola cuando la transacción actual se
+    confirme; si la transacción se revierte, no se encola nada.
+    """
+    def marcar_pendiente():
+        Alta.objects.filter(pk=alta.pk).exclude(estado_certificado='en_proceso').update(
+            estado_certificado='pendiente',
+            fecha_solicitud_certificado=timezone.now(),
+            error_certificado='',
+        )
+    transaction.on_commit(marcar_pendiente)
+
+
+def encolar_certificados(altas_ids):
+    """Como encolar_certificado, para varias altas con un solo UPDATE"""
+    altas_ids = list(altas_ids)
+    if not altas_ids:
+        return
+    def marcar_pendientes():
+        Alta.objects.filter(pk__in=altas_ids).exclude(estado_certificado='en_proceso').update(
+            estado_certificado='pendiente',
+            fecha_solicitud_certificado=timezone.now(),
+            error_certificado='',
+        )
+    transaction.on_commit(marcar_pendientes)
+
+
+def _certificados_tomables(ahora):
+    """Certificados pendientes o en proceso por más de PLAZO_CERTIFICADO"""
+    return Q(estado_certificado='pendiente') | Q(
+        estado_certificado='en_proceso', fecha_toma_certificado__lt=ahora - PLAZO_CERTIFICADO
+    )
+
+
+def tomar_siguiente_certificado():
+    """
+    Toma el alta con certificado pendiente más antiguo y la marca en proceso,
+    con el mismo UPDATE condicionado que tomar_siguiente. Un certificado en
+    proceso por más de PLAZO_CERTIFICADO (su trabajador se cayó) se vuelve a
+    tomar. Retorna None si no hay certificados pendientes.
+    """
+    while True:
+        ahora = timezone.now()
+        pk = (
+            Alta.objects.filter(_certificados_tomables(ahora))
+            .order_by('fecha_solicitud_certificado', 'pk')
+            .values_list('pk', flat=True)
+            .first()
+        )
+        if pk is None:
+            return None
+        tomado = Alta.objects.filter(_certificados_tomables(ahora), pk=pk).update(
+            estado_certificado='en_proceso',
+            fecha_toma_certificado=ahora,
+        )
+        if tomado:
+            return Alta.objects.select_related('madre', 'parto', 'recien_nacido').get(pk=pk)
+
+
+def procesar_certificado(alta):
+    """
+    Genera el PDF de un alta ya tomada y deja el certificado generado o con
+    error, salvo que otro trabajador la haya retomado mientras tanto.
+    """
+    try:
+        obtener_certificado(alta)
+        alta.estado_certificado = 'generado'
+        alta.error_certificado = ''
+    except Exception:
+        logger.exception("Error generando el certificado del alta %s", alta.pk)
+        alta.estado_certificado = 'error'
+        alta.error_certificado = traceback.format_exc()
+    
+    # update() y no save(): el estado del certificado no es un cambio de datos del alta
+    Alta.objects.filter(
+        pk=alta.pk, estado_certificado='en_proceso', fecha_toma_certificado=alta.fecha_toma_certificado
+    ).update(
+        estado_certificado=alta.estado_certificado,
+        error_certificado=alta.error_certificado,
+    )
+    return alta
+
+
+def procesar_certificados():
+    """Genera certificados hasta vaciar la cola; retorna cuántos procesó"""
+    procesados = 0
+    while True:
+        alta = tomar_siguiente_certificado()
+        if alta is None:
+            return procesados
+        procesar_certificado(alta)
+        procesados += 1
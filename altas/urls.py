@@ -14,6 +14,11 @@ urlpatterns = [
     path('registrar/parto/', views.registrar_parto, name='registrar_parto'),
     path('registrar/recien-nacido/', views.registrar_recien_nacido, name='registrar_recien_nacido'),
     
+    # Autocompletado de los selectores de madre, parto y RN
+    path('autocompletar/madres/', views.autocompletar_madres, name='autocompletar_madres'),
+    path('autocompletar/partos/', views.autocompletar_partos, name='autocompletar_partos'),
+    path('autocompletar/recien-nacidos/', views.autocompletar_recien_nacidos, name='autocompletar_recien_nacidos'),
+    
     # Proceso de Alta (CRUD)
     path('crear/', views.crear_alta, name='crear_alta'),
     path('detalle/<int:pk>/', views.detalle_alta, name='detalle_alta'),
@@ -21,11 +26,24 @@ urlpatterns = [
     # Confirmaciones de Alta
     path('confirmar-clinica/<int:pk>/', views.confirmar_alta_clinica, name='confirmar_alta_clinica'),
     path('confirmar-administrativa/<int:pk>/', views.confirmar_alta_administrativa, name='confirmar_alta_administrativa'),
+    path('confirmar-clinica/lote/', views.confirmar_clinica_en_lote, name='confirmar_clinica_lote'),
+    path('confirmar-administrativa/lote/', views.confirmar_administrativa_en_lote, name='confirmar_administrativa_lote'),
     
     # Historial y reportes
     path('historial/', views.historial_altas, name='historial_altas'),
     
     # Exportación y Certificados
     path('exportar-excel/', views.exportar_excel, name='exportar_excel'),
+    path('exportar-csv/', views.exportar_csv, name='exportar_csv'),
+    path('exportar-ndjson/', views.exportar_ndjson, name='exportar_ndjson'),
     path('certificado/<int:pk>/', views.descargar_certificado, name='descargar_certificado'),
+    path('certificados/lote/', views.certificados_lote, name='certificados_lote'),
+    
+    # Exportaciones en segundo plano
+    path('exportaciones/', views.exportaciones, name='exportaciones'),
+    path('exportaciones/<int:pk>/estado/', views.estado_exportacion, name='estado_exportacion'),
+    path('exportaciones/<int:pk>/descargar/', views.descargar_exportacion, name='descargar_exportacion'),
+    
+    # Exportación incremental para integraciones
+    path('cambios/<str:modelo>/', views.cambios_incrementales, name='cambios_incrementales'),
 ]
\ No newline at end of file
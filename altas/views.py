@@ -1,9 +1,16 @@
 # altas/views.py
 from django.shortcuts import render, redirect, get_object_or_404
+from django.urls import reverse
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
-from django.db.models import Q
-from .models import Alta
+from django.db import transaction
+from django.http import StreamingHttpResponse, FileResponse, JsonResponse, Http404
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils import timezone
+from django.utils.cache import get_conditional_response
+from django.utils.http import parse_http_date
+from datetime import datetime
+from .models import Alta, TrabajoExportacion, TransicionConflicto
 from pacientes.models import Madre
 from partos.models import Parto
 from recien_nacidos.models import RecienNacido
@@ -12,11 +19,28 @@ from .forms import (
     ConfirmarAltaClinicaForm,
     ConfirmarAltaAdministrativaForm,
     BuscarAltaForm,
+    LoteCertificadosForm,
     MadreForm,
     PartoForm,
     RecienNacidoForm
 )
 from .utils import generar_certificado_pdf, exportar_altas_excel
+from .paginacion import TAMANO_LOTE, paginar_keyset, codificar_cursor, decodificar_cursor
+from .contadores import contar_por_estado
+from .exportacion import filas_exportacion, lineas_csv, lineas_ndjson
+from .trabajos import encolar_exportacion, encolar_certificado, encolar_certificados
+from .confirmaciones import LIMITE_LOTE, confirmar_clinica_lote, confirmar_administrativa_lote
+from .lotes import certificados_zip
+from .respuestas import por_partes
+from .incremental import MODELOS, cambios_desde, MARGEN_SEGURIDAD
+from .autocompletar import (
+    buscar_madres_autocompletar,
+    buscar_partos_autocompletar,
+    buscar_recien_nacidos_autocompletar,
+    partos_de_madre,
+    recien_nacidos_de_parto,
+    resultados_json,
+)
 from usuarios.decorators import rol_requerido
 
 # ==========================================
@@ -97,6 +121,54 @@ def registrar_recien_nacido(request):
     return render(request, 'recien_nacidos/registrar_recien_nacido.html', context)
 
 
+# ==========================================
+# AUTOCOMPLETADO DE LOS FORMULARIOS
+# ==========================================
+
+def _sin_alta(request, queryset):
+    """Con ?sin_alta=1 se excluyen los registros que ya tienen alta"""
+    if request.GET.get('sin_alta'):
+        return queryset.filter(alta__isnull=True)
+    return queryset
+
+
+@login_required
+def autocompletar_madres(request):
+    """Madres por prefijo de RUT o de nombre (JSON, resultados acotados)"""
+    madres = buscar_madres_autocompletar(
+        request.GET.get('q'), queryset=_sin_alta(request, Madre.objects.all())
+    )
+    return JsonResponse({'resultados': resultados_json(madres)})
+
+
+@login_required
+def autocompletar_partos(request):
+    """
+    Partos por RUT o nombre de la madre (JSON, resultados acotados).
+    Con ?madre=<id> retorna los partos de esa madre (selección encadenada).
+    """
+    partos = _sin_alta(request, Parto.objects.all())
+    if 'madre' in request.GET:
+        partos = partos_de_madre(request.GET['madre'], queryset=partos)
+    else:
+        partos = buscar_partos_autocompletar(request.GET.get('q'), queryset=partos)
+    return JsonResponse({'resultados': resultados_json(partos)})
+
+
+@login_required
+def autocompletar_recien_nacidos(request):
+    """
+    Recién nacidos por código o por RUT/nombre de la madre (JSON, resultados
+    acotados). Con ?parto=<id> retorna los del parto (selección encadenada).
+    """
+    recien_nacidos = _sin_alta(request, RecienNacido.objects.all())
+    if 'parto' in request.GET:
+        recien_nacidos = recien_nacidos_de_parto(request.GET['parto'], queryset=recien_nacidos)
+    else:
+        recien_nacidos = buscar_recien_nacidos_autocompletar(request.GET.get('q'), queryset=recien_nacidos)
+    return JsonResponse({'resultados': resultados_json(recien_nacidos)})
+
+
 # ==========================================
 # GESTIÓN DE ALTAS
 # ==========================================
@@ -105,38 +177,32 @@ def registrar_recien_nacido(request):
 def lista_altas(request):
     """
     Lista de todas las altas con filtros de búsqueda.
+    Paginada por cursor sobre (fecha_creacion, id) para no recorrer con OFFSET.
     """
     altas = Alta.objects.all().select_related('madre', 'parto', 'recien_nacido')
     form_buscar = BuscarAltaForm(request.GET or None)
+    filtros = {}
     
     # Aplicar filtros si el formulario es válido
     if form_buscar.is_valid():
-        buscar = form_buscar.cleaned_data.get('buscar')
-        estado = form_buscar.cleaned_data.get('estado')
-        fecha_desde = form_buscar.cleaned_data.get('fecha_desde')
-        fecha_hasta = form_buscar.cleaned_data.get('fecha_hasta')
-        
-        if buscar:
-            altas = altas.filter(
-                Q(madre__nombre__icontains=buscar) |
-                Q(madre__rut__icontains=buscar)
-            )
-        
-        if estado:
-            altas = altas.filter(estado=estado)
-        
-        if fecha_desde:
-            altas = altas.filter(fecha_creacion__gte=fecha_desde)
-        
-        if fecha_hasta:
-            altas = altas.filter(fecha_creacion__lte=fecha_hasta)
+        filtros = form_buscar.cleaned_data
+        altas = form_buscar.filtrar(altas)
+    
+    pagina = paginar_keyset(
+        altas,
+        cursor=request.GET.get('cursor'),
+        direccion=request.GET.get('dir', 'siguiente'),
+    )
+    
+    contadores = contar_por_estado(altas, filtros)
     
     context = {
-        'altas': altas,
+        'altas': pagina.objetos,
+        'pagina': pagina,
         'form_buscar': form_buscar,
-        'total_altas': altas.count(),
-        'pendientes': altas.filter(estado='pendiente').count(),
-        'completadas': altas.filter(estado='completada').count(),
+        'total_altas': contadores['total'],
+        'pendientes': contadores['pendiente'],
+        'completadas': contadores['completada'],
     }
     
     return render(request, 'altas/lista_altas.html', context)
@@ -221,13 +287,8 @@ def confirmar_alta_clinica(request, pk):
                 medico_nombre = form.cleaned_data['medico_nombre']
                 observaciones = form.cleaned_data.get('observaciones_clinicas', '')
                 
-                # Confirmar alta clínica
-                alta.confirmar_alta_clinica(medico_nombre)
-                
-                # Agregar observaciones si hay
-                if observaciones:
-                    alta.observaciones += f"\n[Alta Clínica] {observaciones}"
-                    alta.save()
+                # Confirmación y observaciones en una sola escritura
+                alta.confirmar_alta_clinica(medico_nombre, observaciones)
                 
                 messages.success(
                     request,
@@ -235,6 +296,9 @@ def confirmar_alta_clinica(request, pk):
                 )
                 return redirect('altas:detalle_alta', pk=pk)
             
+            except TransicionConflicto as e:
+                messages.warning(request, e.message)
+                return redirect('altas:detalle_alta', pk=pk)
             except Exception as e:
                 messages.error(request, f'Error al confirmar alta clínica: {str(e)}')
     else:
@@ -271,29 +335,27 @@ def confirmar_alta_administrativa(request, pk):
                 administrativo_nombre = form.cleaned_data['administrativo_nombre']
                 observaciones = form.cleaned_data.get('observaciones_administrativas', '')
                 
-                # Confirmar alta administrativa
-                alta.confirmar_alta_administrativa(administrativo_nombre)
-                
-                # Agregar observaciones si hay
-                if observaciones:
-                    alta.observaciones += f"\n[Alta Administrativa] {observaciones}"
-                    alta.save()
+                with transaction.atomic():
+                    # Confirmación, observaciones y cierre del alta en una sola escritura
+                    estado = alta.confirmar_alta_administrativa(administrativo_nombre, observaciones)
+                    
+                    # El certificado PDF se genera en segundo plano (procesar_certificados)
+                    if estado == 'completada':
+                        encolar_certificado(alta)
                 
                 messages.success(
                     request,
                     f'Alta administrativa confirmada por {administrativo_nombre}. '
                     f'El proceso de alta está COMPLETADO.'
                 )
-                
-                # Generar certificado PDF automáticamente
-                try:
-                    generar_certificado_pdf(alta)
-                    messages.info(request, 'Certificado PDF generado exitosamente.')
-                except Exception as e:
-                    messages.warning(request, f'Alta completada, pero error al generar PDF: {str(e)}')
+                if estado == 'completada':
+                    messages.info(request, 'El certificado PDF quedó en cola de generación.')
                 
                 return redirect('altas:detalle_alta', pk=pk)
             
+            except TransicionConflicto as e:
+                messages.warning(request, e.message)
+                return redirect('altas:detalle_alta', pk=pk)
             except Exception as e:
                 messages.error(request, f'Error al confirmar alta administrativa: {str(e)}')
     else:
@@ -308,6 +370,86 @@ def confirmar_alta_administrativa(request, pk):
     return render(request, 'altas/confirmar_alta.html', context)
 
 
+# ==========================================
+# CONFIRMACIÓN EN LOTE
+# ==========================================
+
+def _confirmar_en_lote(request, tipo_confirmacion, form_class, pendientes, confirmar, campo_nombre, campo_observaciones):
+    """
+    Lista las altas pendientes de la confirmación y confirma las marcadas
+    con una sola escritura (ver altas/confirmaciones.py). Retorna el
+    contexto de la página y los ids confirmados.
+    """
+    resultados, confirmados = [], []
+    if request.method == 'POST':
+        form = form_class(request.POST)
+        ids = request.POST.getlist('altas')
+        if not ids:
+            messages.warning(request, 'No se seleccionó ninguna alta.')
+        elif form.is_valid():
+            try:
+                resultados, confirmados = confirmar(
+                    ids,
+                    form.cleaned_data[campo_nombre],
+                    form.cleaned_data.get(campo_observaciones, ''),
+                )
+            except TransicionConflicto as e:
+                messages.warning(request, e.message)
+            else:
+                rechazadas = len(resultados) - len(confirmados)
+                messages.success(request, f'{len(confirmados)} alta(s) confirmada(s).')
+                if rechazadas:
+                    messages.warning(request, f'{rechazadas} alta(s) no se pudieron confirmar; revisa el detalle.')
+                form = form_class()
+    else:
+        form = form_class()
+    
+    context = {
+        'form': form,
+        'tipo_confirmacion': tipo_confirmacion,
+        'altas': pendientes.select_related('madre', 'recien_nacido').order_by('fecha_creacion', 'pk')[:LIMITE_LOTE],
+        'resultados': resultados,
+        'limite_lote': LIMITE_LOTE,
+    }
+    return context, confirmados
+
+
+@login_required
+@rol_requerido('medico')
+def confirmar_clinica_en_lote(request):
+    """
+    Confirmación clínica de varias altas a la vez (visita médica).
+    """
+    context, _ = _confirmar_en_lote(
+        request, 'clínica', ConfirmarAltaClinicaForm,
+        Alta.objects.pendientes_clinica().filter(estado='validada'),
+        confirmar_clinica_lote,
+        'medico_nombre', 'observaciones_clinicas',
+    )
+    return render(request, 'altas/confirmar_lote.html', context)
+
+
+@login_required
+@rol_requerido('administrativo')
+def confirmar_administrativa_en_lote(request):
+    """
+    Confirmación administrativa de varias altas a la vez; las altas quedan
+    completadas y sus certificados en cola.
+    """
+    with transaction.atomic():
+        context, confirmados = _confirmar_en_lote(
+            request, 'administrativa', ConfirmarAltaAdministrativaForm,
+            Alta.objects.pendientes_administrativa().filter(estado='alta_clinica'),
+            confirmar_administrativa_lote,
+            'administrativo_nombre', 'observaciones_administrativas',
+        )
+        # El certificado PDF se genera en segundo plano (procesar_certificados)
+        encolar_certificados(confirmados)
+    if confirmados:
+        messages.info(request, 'Los certificados PDF quedaron en cola de generación.')
+    return render(request, 'altas/confirmar_lote.html', context)
+
+
 @login_required
 def historial_altas(request):
     """
@@ -319,41 +461,218 @@ def historial_altas(request):
     
     context = {
         'altas': altas_completadas,
-        'total': altas_completadas.count()
+        'total': contar_por_estado(Alta.objects.all())['completada'],
+        'form_lote': LoteCertificadosForm(),
     }
     
     return render(request, 'altas/historial_altas.html', context)
 
 
+def _altas_a_exportar(request):
+    """Altas filtradas con los mismos filtros de la lista (BuscarAltaForm)"""
+    altas = Alta.objects.all()
+    form_buscar = BuscarAltaForm(request.GET or None)
+    if form_buscar.is_valid():
+        altas = form_buscar.filtrar(altas)
+    return altas
+
+
 @login_required
 def exportar_excel(request):
     """
     Vista para exportar altas a Excel.
     """
     try:
-        # Filtrar por estado si se proporciona
-        estado = request.GET.get('estado', None)
-        
-        if estado:
-            altas = Alta.objects.filter(estado=estado)
-        else:
-            altas = Alta.objects.all()
-        
-        # Generar archivo Excel
-        response = exportar_altas_excel(altas)
-        return response
+        # Generar archivo Excel con los filtros de la lista
+        response = exportar_altas_excel(_altas_a_exportar(request))
+        return por_partes(request, response)
     
     except Exception as e:
         messages.error(request, f'Error al exportar a Excel: {str(e)}')
         return redirect('altas:lista_altas')
 
 
+@login_required
+def exportar_csv(request):
+    """
+    Vista para exportar altas a CSV.
+    El archivo se genera fila a fila mientras se envía.
+    """
+    filename = f'altas_export_{datetime.now().strftime("%Y%m%d_%H%M%S")}.csv'
+    response = StreamingHttpResponse(
+        lineas_csv(filas_exportacion(_altas_a_exportar(request))),
+        content_type='text/csv; charset=utf-8'
+    )
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    # Bajo ASGI, un lote de filas por vez
+    return por_partes(request, response, paso=TAMANO_LOTE)
+
+
+@login_required
+def exportar_ndjson(request):
+    """
+    Vista para exportar altas como NDJSON (un objeto JSON por línea).
+    El archivo se genera fila a fila mientras se envía.
+    """
+    filename = f'altas_export_{datetime.now().strftime("%Y%m%d_%H%M%S")}.ndjson'
+    response = StreamingHttpResponse(
+        lineas_ndjson(filas_exportacion(_altas_a_exportar(request))),
+        content_type='application/x-ndjson; charset=utf-8'
+    )
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return por_partes(request, response, paso=TAMANO_LOTE)
+
+
+# ==========================================
+# EXPORTACIONES EN SEGUNDO PLANO (SUPERVISOR)
+# ==========================================
+
+@login_required
+@rol_requerido('supervisor')
+def exportaciones(request):
+    """
+    Lista las exportaciones del supervisor y permite encolar una nueva.
+    El archivo lo genera el comando procesar_exportaciones.
+    """
+    form_buscar = BuscarAltaForm(request.POST or None)
+    formatos = dict(TrabajoExportacion.FORMATOS)
+    
+    if request.method == 'POST' and form_buscar.is_valid():
+        formato = request.POST.get('formato', 'xlsx')
+        if formato not in formatos:
+            formato = 'xlsx'
+        filtros = {
+            campo: request.POST[campo]
+            for campo in form_buscar.fields
+            if request.POST.get(campo)
+        }
+        trabajo = encolar_exportacion(request.user, formato, filtros)
+        messages.success(
+            request,
+            f'Exportación #{trabajo.pk} en cola. Puedes seguir su avance en esta página.'
+        )
+        return redirect('altas:exportaciones')
+    
+    context = {
+        'form_buscar': form_buscar,
+        'formatos': TrabajoExportacion.FORMATOS,
+        'trabajos': TrabajoExportacion.objects.filter(solicitado_por=request.user)[:20],
+    }
+    return render(request, 'altas/exportaciones.html', context)
+
+
+@login_required
+@rol_requerido('supervisor')
+def estado_exportacion(request, pk):
+    """Avance de una exportación en JSON (para consultar periódicamente)"""
+    trabajo = get_object_or_404(TrabajoExportacion, pk=pk, solicitado_por=request.user)
+    return JsonResponse({
+        'id': trabajo.pk,
+        'estado': trabajo.estado,
+        'estado_display': trabajo.get_estado_display(),
+        'porcentaje': trabajo.porcentaje(),
+        'filas_procesadas': trabajo.filas_procesadas,
+        'total_filas': trabajo.total_filas,
+        'url_descarga': (
+            reverse('altas:descargar_exportacion', args=[trabajo.pk])
+            if trabajo.estado == 'completado' else None
+        ),
+    })
+
+
+@login_required
+@rol_requerido('supervisor')
+def descargar_exportacion(request, pk):
+    """
+    Descarga el archivo de una exportación completada. Es la única forma de
+    obtenerlo: se guarda fuera de MEDIA_ROOT y con nombre aleatorio.
+    """
+    trabajo = get_object_or_404(TrabajoExportacion, pk=pk, solicitado_por=request.user)
+    if trabajo.estado != 'completado' or not trabajo.archivo:
+        raise Http404("La exportación aún no tiene archivo")
+    
+    try:
+        archivo = trabajo.archivo.open('rb')
+    except FileNotFoundError:
+        raise Http404("El archivo de la exportación ya no existe")
+    
+    fecha = timezone.localtime(trabajo.fecha_termino or trabajo.fecha_creacion)
+    response = FileResponse(
+        archivo,
+        as_attachment=True,
+        filename=f'altas_export_{trabajo.pk}_{fecha.strftime("%Y%m%d_%H%M%S")}.{trabajo.formato}'
+    )
+    return por_partes(request, response)
+
+
+@login_required
+@rol_requerido('administrativo', 'supervisor')
+def certificados_lote(request):
+    """
+    Descarga en un ZIP los certificados de las altas completadas en un rango
+    de fechas (por defecto, hoy). Los PDF se dibujan en paralelo y el ZIP se
+    envía a medida que cada certificado está listo.
+    """
+    form = LoteCertificadosForm(request.GET)
+    if not form.is_valid():
+        messages.error(request, 'Rango de fechas no válido.')
+        return redirect('altas:historial_altas')
+    
+    altas = form.filtrar(Alta.objects.all())
+    if not altas.exists():
+        messages.info(request, 'No hay altas completadas en el rango indicado.')
+        return redirect('altas:historial_altas')
+    
+    filename = f'certificados_{datetime.now().strftime("%Y%m%d_%H%M%S")}.zip'
+    response = StreamingHttpResponse(certificados_zip(altas), content_type='application/zip')
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return por_partes(request, response)
+
+
+# ==========================================
+# EXPORTACIÓN INCREMENTAL (INTEGRACIONES)
+# ==========================================
+
+LIMITE_INCREMENTAL = 5000
+
+
+@login_required
+@rol_requerido('supervisor', 'encargado_ti')
+def cambios_incrementales(request, modelo):
+    """
+    Filas de un modelo modificadas después del cursor recibido, en JSON.
+    El cliente guarda el 'cursor' de la respuesta y lo envía en la siguiente
+    consulta; 'hay_mas' indica si conviene pedir otro lote de inmediato.
+    """
+    if modelo not in MODELOS:
+        raise Http404("Modelo no disponible para exportación incremental")
+    
+    try:
+        limite = min(int(request.GET.get('limite', 1000)), LIMITE_INCREMENTAL)
+    except ValueError:
+        limite = 1000
+    limite = max(limite, 1)
+    
+    posicion = decodificar_cursor(request.GET.get('cursor'))
+    hasta = timezone.now() - MARGEN_SEGURIDAD
+    filas, posicion = cambios_desde(MODELOS[modelo], posicion, limite, hasta)
+    
+    return JsonResponse({
+        'modelo': modelo,
+        'filas': filas,
+        'cursor': codificar_cursor(*posicion) if posicion else request.GET.get('cursor'),
+        'hay_mas': len(filas) == limite,
+    }, encoder=DjangoJSONEncoder)
+
+
 @login_required
 def descargar_certificado(request, pk):
     """
     Vista para descargar/visualizar el certificado PDF de un alta.
     """
-    alta = get_object_or_404(Alta, pk=pk)
+    alta = get_object_or_404(
+        Alta.objects.select_related('madre', 'parto', 'recien_nacido'), pk=pk
+    )
     
     if not alta.esta_completada():
         messages.error(request, 'El alta debe estar completada para generar el certificado.')
@@ -361,7 +680,20 @@ def descargar_certificado(request, pk):
     
     try:
         response = generar_certificado_pdf(alta)
-        return response
+        if alta.estado_certificado != 'generado':
+            # El PDF ya quedó en disco: la cola no necesita generarlo
+            Alta.objects.filter(pk=alta.pk).update(estado_certificado='generado', error_certificado='')
+        # Si la copia del navegador sigue vigente, basta con un 304
+        no_modificado = get_conditional_response(
+            request,
+            etag=response['ETag'],
+            last_modified=parse_http_date(response['Last-Modified']),
+            response=response,
+        )
+        if no_modificado is not response:
+            response.close()
+            return no_modificado
+        return por_partes(request, response)
     except Exception as e:
         messages.error(request, f'Error al generar certificado: {str(e)}')
         return redirect('altas:detalle_alta', pk=pk)
\ No newline at end of file
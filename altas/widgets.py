@@ -0,0 +1,71 @@
+# altas/widgets.py
+from django import forms
+from django.urls import reverse
+
+
+class SelectAutocompletar(forms.Select):
+    """
+    Select de un ModelChoiceField que no lista la tabla completa: solo
+    renderiza la opción seleccionada (si la hay) y el script de
+    componentes/autocompletar.html llena las opciones desde 'url' a medida
+    que se escribe (ver altas/autocompletar.py).
+
+    'parametros' se agregan a la URL (por ejemplo {'sin_alta': 1}).
+    """
+
+    def __init__(self, url, parametros=None, placeholder='Buscar por RUT o nombre...', attrs=None):
+        attrs = {'class': 'form-select', **(attrs or {})}
+        super().__init__(attrs)
+        self.url = url
+        self.parametros = parametros or {}
+        self.placeholder = placeholder
+
+    def get_context(self, name, value, attrs):
+        context = super().get_context(name, value, attrs)
+        widget_attrs = context['widget']['attrs']
+        widget_attrs['data-autocompletar'] = reverse(self.url)
+        widget_attrs['data-placeholder'] = self.placeholder
+        for nombre, valor in self.parametros.items():
+            widget_attrs[f'data-param-{nombre}'] = valor
+        return context
+
+    def optgroups(self, name, value, attrs=None):
+        """Solo la opción vacía y las seleccionadas, con una consulta por pk"""
+        seleccionados = [v for v in value if v not in ('', None)]
+        opciones = [('', '---------')]
+        if seleccionados:
+            iterador = self.choices
+            try:
+                objetos = list(iterador.queryset.filter(pk__in=seleccionados))
+            except (ValueError, TypeError):
+                # Valor enviado no válido: el campo ya informa el error
+                objetos = []
+            opciones += [(objeto.pk, iterador.field.label_from_instance(objeto)) for objeto in objetos]
+
+        valores = {str(v) for v in seleccionados}
+        return [
+            (None, [self.create_option(name, pk, etiqueta, str(pk) in valores or (pk == '' and not valores), indice, attrs=attrs)], indice)
+            for indice, (pk, etiqueta) in enumerate(opciones)
+        ]
+
+
+class SelectDependiente(SelectAutocompletar):
+    """
+    Select cuyas opciones dependen de otro campo del formulario ('padre'):
+    al cambiar el padre se piden a 'url' con ?<padre>=<valor> y se reemplazan.
+    No tiene buscador; las listas son cortas (los partos de una madre, los
+    recién nacidos de un parto).
+    """
+
+    def __init__(self, url, padre, parametros=None, attrs=None):
+        super().__init__(url, parametros=parametros, placeholder='', attrs=attrs)
+        self.padre = padre
+
+    def get_context(self, name, value, attrs):
+        context = super().get_context(name, value, attrs)
+        widget_attrs = context['widget']['attrs']
+        # Nombre del campo padre con el mismo prefijo de formulario ('madre', 'form-0-madre'...)
+        prefijo = name.rpartition('-')[0]
+        widget_attrs['data-padre'] = f'{prefijo}-{self.padre}' if prefijo else self.padre
+        widget_attrs['data-clave-padre'] = self.padre
+        return context
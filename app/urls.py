@@ -6,4 +6,5 @@ app_name = 'app'  # <--- NAMESPACE AHORA ES 'app'
 
 urlpatterns = [
     path('', views.home, name='home'),
+    path('eventos/panel/', views.eventos_panel, name='eventos_panel'),
 ]
\ No newline at end of file
@@ -1,38 +1,117 @@
 # app/views.py
+import asyncio
+import json
+
+from asgiref.sync import sync_to_async
 from django.shortcuts import render
 from django.contrib.auth.decorators import login_required
-from django.utils import timezone
-from altas.models import Alta
-from partos.models import Parto
+from django.core.handlers.asgi import ASGIRequest
+from django.http import HttpResponse, StreamingHttpResponse, HttpResponseForbidden
+from altas import contadores
+from altas.eventos import CONTADOR_POR_ROL, difusor
+
+# Segundos entre comentarios de latido del flujo SSE (mantienen viva la
+# conexión a través de proxies)
+LATIDO_SSE = 20
 
 @login_required
 def home(request):
     """
     Dashboard principal del sistema.
+    Los contadores se leen de ContadorPanel (altas/contadores.py), sin COUNT por carga.
     """
     user = request.user
-    context = {}
+    context = {
+        # El flujo SSE solo se abre si el sitio corre bajo ASGI (ver eventos_panel)
+        'eventos_en_vivo': en_asgi(request),
+    }
 
     # Lógica para MÉDICOS
     if user.rol == 'medico':
-        context['pendientes_clinica'] = Alta.objects.filter(
-            registros_completos=True, 
-            alta_clinica_confirmada=False
-        ).count()
+        context['pendientes_clinica'] = contadores.pendientes_clinica()
 
     # Lógica para ADMINISTRATIVOS
     if user.rol == 'administrativo':
-        context['pendientes_administrativa'] = Alta.objects.filter(
-            alta_clinica_confirmada=True, 
-            alta_administrativa_confirmada=False
-        ).count()
+        context['pendientes_administrativa'] = contadores.pendientes_administrativa()
     
     # Lógica para MATRONAS
     if user.rol == 'matrona':
-        hoy = timezone.now().date()
-        context['registros_hoy'] = Parto.objects.filter(
-            fecha_registro__date=hoy,
-            creado_por=user  
-        ).count()
+        context['registros_hoy'] = contadores.registros_hoy(user)
+
+    return render(request, 'home.html', context)
+
+
+# ==========================================
+# EVENTOS EN VIVO DEL PANEL (SSE)
+# ==========================================
+
+def en_asgi(request):
+    """
+    True si la petición llegó por trazabilidad/asgi.py. Bajo WSGI un flujo
+    asíncrono sin fin no se envía: el manejador lo consume completo antes de
+    responder y deja el worker ocupado para siempre.
+    """
+    return isinstance(request, ASGIRequest)
+
+
+def _valor_contador(contador, usuario):
+    if contador == 'registros_hoy':
+        return contadores.registros_hoy(usuario)
+    return getattr(contadores, contador)()
+
+
+def _evento_sse(nombre, datos):
+    return f"event: {nombre}\ndata: {json.dumps(datos)}\n\n"
+
+
+async def _flujo_panel(usuario, contador):
+    """
+    Envía el valor actual del contador y luego cada ajuste publicado.
+    Si el cliente se atrasó o se pidió recalcular, reenvía el valor completo.
+    """
+    suscripcion = difusor().suscribir(
+        contador, usuario.pk if contador == 'registros_hoy' else None
+    )
+    valor = sync_to_async(_valor_contador)
+    try:
+        yield "retry: 5000\n\n"
+        yield _evento_sse('valor', {'contador': contador, 'valor': await valor(contador, usuario)})
+        while True:
+            try:
+                evento = await suscripcion.siguiente(LATIDO_SSE)
+            except asyncio.TimeoutError:
+                yield ": latido\n\n"
+                continue
+            if evento.get('recalcular') or suscripcion.desfasada:
+                suscripcion.desfasada = False
+                yield _evento_sse('valor', {'contador': contador, 'valor': await valor(contador, usuario)})
+            else:
+                yield _evento_sse('delta', {'contador': contador, 'delta': evento['delta']})
+    finally:
+        difusor().cancelar(suscripcion)
+
+
+@login_required
+async def eventos_panel(request):
+    """
+    Flujo Server-Sent Events con los ajustes del contador del panel del rol.
+    Es una vista asíncrona: bajo ASGI (trazabilidad/asgi.py) cada conexión
+    abierta es una corrutina en espera y no ocupa un hilo. Bajo WSGI responde
+    204 sin abrir el flujo.
+    """
+    usuario = await request.auser()
+    contador = CONTADOR_POR_ROL.get(usuario.rol)
+    if contador is None:
+        return HttpResponseForbidden("Tu rol no tiene contadores en vivo.")
+    if not en_asgi(request):
+        # 204: el navegador no reintenta la conexión; el panel muestra los
+        # valores con que se cargó la página
+        return HttpResponse(status=204)
 
-    return render(request, 'home.html', context)
\ No newline at end of file
+    response = StreamingHttpResponse(
+        _flujo_panel(usuario, contador),
+        content_type='text/event-stream'
+    )
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response
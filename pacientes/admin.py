@@ -1,6 +1,8 @@
 # pacientes/admin.py
 from django.contrib import admin
 from .models import Madre
+from usuarios.validador import filtro_rut
+from .busqueda import filtro_nombre
 
 @admin.register(Madre)
 class MadreAdmin(admin.ModelAdmin):
@@ -20,4 +22,17 @@ class MadreAdmin(admin.ModelAdmin):
             'fields': ('fecha_ingreso', 'fecha_actualizacion'),
             'classes': ('collapse',)
         }),
-    )
\ No newline at end of file
+    )
+
+    def get_search_results(self, request, queryset, search_term):
+        """
+        Las búsquedas por RUT usan la clave numérica indexada y las de nombre
+        el índice de palabras; solo los correos usan la búsqueda estándar.
+        """
+        por_rut = filtro_rut(search_term, campo='rut_numero')
+        if por_rut is not None:
+            return queryset.filter(por_rut), False
+        por_nombre = filtro_nombre(search_term)
+        if por_nombre is not None and '@' not in search_term:
+            return queryset.filter(por_nombre), False
+        return super().get_search_results(request, queryset, search_term)
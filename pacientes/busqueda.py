@@ -0,0 +1,102 @@
+# pacientes/busqueda.py
+"""
+Búsqueda de madres por nombre sobre el índice de tokens (TokenNombreMadre).
+
+El nombre se separa en palabras sin acentos y en minúsculas; cada término de
+la búsqueda se compara como prefijo (LIKE 'termino%'), lo que permite usar el
+índice en lugar de recorrer la tabla con LIKE '%...%'.
+Así "gonzalez mar" encuentra a "María González".
+
+Los prefijos usan istartswith: en MySQL startswith se traduce a LIKE BINARY,
+que no usa el índice de la columna; los tokens ya están en minúsculas, así
+que no cambia el resultado.
+"""
+import re
+import unicodedata
+from functools import reduce
+from operator import add, or_
+
+from django.db.models import Case, F, IntegerField, Max, Q, Value, When
+
+from .models import Madre, TokenNombreMadre
+
+LARGO_MAXIMO_TOKEN = 100
+LIMITE_RESULTADOS = 20
+
+
+def plegar(texto):
+    """Quita acentos y pasa a minúsculas ('Núñez' -> 'nunez')"""
+    descompuesto = unicodedata.normalize('NFKD', texto or '')
+    return ''.join(c for c in descompuesto if not unicodedata.combining(c)).lower()
+
+
+def tokenizar(texto):
+    """Retorna las palabras normalizadas del texto, sin repetir y en orden"""
+    tokens = []
+    for palabra in re.findall(r'\w+', plegar(texto)):
+        palabra = palabra[:LARGO_MAXIMO_TOKEN]
+        if palabra not in tokens:
+            tokens.append(palabra)
+    return tokens
+
+
+def indexar_madre(madre):
+    """Reconstruye los tokens de nombre de una madre"""
+    TokenNombreMadre.objects.filter(madre=madre).delete()
+    TokenNombreMadre.objects.bulk_create([
+        TokenNombreMadre(madre=madre, token=token)
+        for token in tokenizar(madre.nombre)
+    ])
+
+
+def filtro_nombre(texto, campo='pk'):
+    """
+    Construye un filtro Q que exige que cada término del texto coincida como
+    prefijo con alguna palabra del nombre. 'campo' es la ruta hacia la madre
+    desde el modelo filtrado (ej: 'madre' para Alta).
+    Retorna None si el texto no tiene términos.
+    """
+    terminos = tokenizar(texto)
+    if not terminos:
+        return None
+    return reduce(lambda a, b: a & b, (
+        Q(**{f'{campo}__in': TokenNombreMadre.objects.filter(token__istartswith=termino).values('madre_id')})
+        for termino in terminos
+    ))
+
+
+def buscar_madres(texto, limite=LIMITE_RESULTADOS, queryset=None):
+    """
+    Busca madres por nombre y las retorna ordenadas por relevancia:
+    una palabra idéntica al término vale 2 puntos y un prefijo vale 1.
+    Todas las palabras buscadas deben coincidir.
+    """
+    terminos = tokenizar(texto)
+    if not terminos:
+        return []
+    
+    puntajes = {
+        f'termino_{i}': Max(Case(
+            When(token=termino, then=Value(2)),
+            When(token__istartswith=termino, then=Value(1)),
+            default=Value(0),
+            output_field=IntegerField(),
+        ))
+        for i, termino in enumerate(terminos)
+    }
+    coincidencias = TokenNombreMadre.objects.filter(
+        reduce(or_, (Q(token__istartswith=termino) for termino in terminos))
+    )
+    if queryset is not None:
+        coincidencias = coincidencias.filter(madre__in=queryset.values('pk'))
+    filas = (
+        coincidencias.values('madre_id')
+        .annotate(**puntajes)
+        .filter(**{f'{nombre}__gt': 0 for nombre in puntajes})
+        .annotate(puntaje=reduce(add, (F(nombre) for nombre in puntajes)))
+        .order_by('-puntaje', 'madre_id')
+        .values_list('madre_id', flat=True)[:limite]
+    )
+    ids = list(filas)
+    madres = Madre.objects.in_bulk(ids)
+    return [madres[pk] for pk in ids if pk in madres]
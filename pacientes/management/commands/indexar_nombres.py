@@ -0,0 +1,42 @@
+# pacientes/management/commands/indexar_nombres.py
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from pacientes.models import Madre, TokenNombreMadre
+from pacientes.busqueda import tokenizar
+
+
+class Command(BaseCommand):
+    help = "Reconstruye el índice de búsqueda por nombre de las madres"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--lote',
+            type=int,
+            default=1000,
+            help='Cantidad de madres procesadas por transacción (por defecto 1000)'
+        )
+
+    def handle(self, *args, **options):
+        lote = options['lote']
+        madres = Madre.objects.only('pk', 'nombre').order_by('pk')
+        pendientes = []
+        total = 0
+        for madre in madres.iterator(chunk_size=lote):
+            pendientes.append(madre)
+            if len(pendientes) >= lote:
+                total += self._indexar(pendientes)
+                pendientes = []
+        if pendientes:
+            total += self._indexar(pendientes)
+        self.stdout.write(self.style.SUCCESS(f"{total} madre(s) indexada(s)"))
+
+    @transaction.atomic
+    def _indexar(self, madres):
+        TokenNombreMadre.objects.filter(madre__in=[m.pk for m in madres]).delete()
+        TokenNombreMadre.objects.bulk_create([
+            TokenNombreMadre(madre_id=madre.pk, token=token)
+            for madre in madres
+            for token in tokenizar(madre.nombre)
+        ])
+        return len(madres)
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.6 on 2026-10-18 04:28
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pacientes', '0002_madre_creado_por'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='madre',
+            name='rut_dv',
+            field=models.CharField(blank=True, editable=False, max_length=1, verbose_name='RUT (dígito verificador)'),
+        ),
+        migrations.AddField(
+            model_name='madre',
+            name='rut_numero',
+            field=models.PositiveIntegerField(blank=True, db_index=True, editable=False, null=True, verbose_name='RUT (cuerpo numérico)'),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.6 on 2026-10-18 04:29
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pacientes', '0003_madre_rut_dv_madre_rut_numero'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TokenNombreMadre',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('token', models.CharField(max_length=100, verbose_name='Palabra normalizada')),
+                ('madre', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='tokens_nombre', to='pacientes.madre', verbose_name='Madre')),
+            ],
+            options={
+                'verbose_name': 'Token de nombre',
+                'verbose_name_plural': 'Tokens de nombre',
+                'indexes': [models.Index(fields=['token', 'madre'], name='token_nombre_idx')],
+                'constraints': [models.UniqueConstraint(fields=('madre', 'token'), name='token_madre_unico')],
+            },
+        ),
+    ]
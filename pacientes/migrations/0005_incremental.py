@@ -0,0 +1,19 @@
+# Generated by Django 5.2.6 on 2026-10-18 04:36
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pacientes', '0004_tokennombremadre'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='madre',
+            index=models.Index(fields=['fecha_actualizacion', 'id'], name='madre_actualizacion_idx'),
+        ),
+    ]
@@ -1,7 +1,26 @@
 # pacientes/models.py
-from django.db import models
+from django.db import models, router, transaction
+from django.db.models.functions import Length
+from django.db.models.lookups import GreaterThan
 from django.core.validators import MinValueValidator, MaxValueValidator
 from django.conf import settings
+from usuarios.validador import separar_rut
+
+
+def con_texto(campo):
+    """
+    Condición SQL equivalente a que el texto de 'campo' sea verdadero en
+    Python: no nulo y no vacío. Usa el largo y no "campo <> ''" porque MySQL
+    compara ignorando los espacios finales.
+    """
+    return models.Q(GreaterThan(Length(campo), 0))
+
+
+def distinto_de_cero(campo):
+    """Condición SQL equivalente a que el número de 'campo' sea verdadero en Python"""
+    return models.Q(**{f'{campo}__gt': 0}) | models.Q(**{f'{campo}__lt': 0})
+
+
 class Madre(models.Model):
     """
     Modelo de Madre (Paciente) - Módulo 1 simplificado
@@ -14,6 +33,20 @@ class Madre(models.Model):
         verbose_name="RUT",
         help_text="RUT de la madre (ej: 12345678-9)"
     )
+    # Clave numérica del RUT, derivada al guardar (ver save)
+    rut_numero = models.PositiveIntegerField(
+        null=True,
+        blank=True,
+        editable=False,
+        db_index=True,
+        verbose_name="RUT (cuerpo numérico)"
+    )
+    rut_dv = models.CharField(
+        max_length=1,
+        blank=True,
+        editable=False,
+        verbose_name="RUT (dígito verificador)"
+    )
     nombre = models.CharField(
         max_length=200,
         verbose_name="Nombre completo"
@@ -65,6 +98,10 @@ class Madre(models.Model):
         verbose_name = "Madre"
         verbose_name_plural = "Madres"
         ordering = ['-fecha_ingreso']
+        indexes = [
+            # Exportación incremental por marca de agua (altas/incremental.py)
+            models.Index(fields=['fecha_actualizacion', 'id'], name='madre_actualizacion_idx'),
+        ]
     
     creado_por = models.ForeignKey(
         settings.AUTH_USER_MODEL,
@@ -77,6 +114,19 @@ class Madre(models.Model):
     def __str__(self):
         return f"{self.nombre} ({self.rut})"
     
+    def save(self, *args, **kwargs):
+        """
+        Normaliza el RUT en su cuerpo numérico y dígito verificador. Guarda en
+        una transacción, junto con el ajuste del censo del panel (post_save).
+        """
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None or 'rut' in update_fields:
+            self.rut_numero, self.rut_dv = separar_rut(self.rut)
+            if update_fields is not None:
+                kwargs['update_fields'] = set(update_fields) | {'rut_numero', 'rut_dv'}
+        with transaction.atomic(using=kwargs.get('using') or router.db_for_write(Madre, instance=self)):
+            super().save(*args, **kwargs)
+    
     def tiene_registros_completos(self):
         """Valida si la madre tiene todos los datos básicos necesarios"""
         return all([
@@ -86,4 +136,51 @@ class Madre(models.Model):
             self.direccion,
             self.telefono,
             self.controles_prenatales > 0
-        ])
\ No newline at end of file
+        ])
+    
+    @staticmethod
+    def filtro_registros_completos(prefijo=''):
+        """
+        Equivalente SQL de tiene_registros_completos(), para validar en lote.
+        'prefijo' es el camino desde el modelo consultado (ej: 'madre__').
+        """
+        return (
+            con_texto(f'{prefijo}nombre')
+            & con_texto(f'{prefijo}rut')
+            & distinto_de_cero(f'{prefijo}edad')
+            & con_texto(f'{prefijo}direccion')
+            & con_texto(f'{prefijo}telefono')
+            & models.Q(**{f'{prefijo}controles_prenatales__gt': 0})
+        )
+
+class TokenNombreMadre(models.Model):
+    """
+    Índice de búsqueda por nombre.
+    Un registro por cada palabra del nombre de la madre, sin acentos y en
+    minúsculas, para resolver búsquedas por prefijo con el índice de la tabla.
+    Se mantiene desde pacientes/signals.py.
+    """
+    
+    madre = models.ForeignKey(
+        Madre,
+        on_delete=models.CASCADE,
+        related_name='tokens_nombre',
+        verbose_name="Madre"
+    )
+    token = models.CharField(
+        max_length=100,
+        verbose_name="Palabra normalizada"
+    )
+    
+    class Meta:
+        verbose_name = "Token de nombre"
+        verbose_name_plural = "Tokens de nombre"
+        constraints = [
+            models.UniqueConstraint(fields=['madre', 'token'], name='token_madre_unico'),
+        ]
+        indexes = [
+            models.Index(fields=['token', 'madre'], name='token_nombre_idx'),
+        ]
+    
+    def __str__(self):
+        return self.token
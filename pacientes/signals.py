@@ -0,0 +1,21 @@
+# pacientes/signals.py
+from django.db.models.signals import post_init, post_save
+from django.dispatch import receiver
+
+from .models import Madre
+from .busqueda import indexar_madre
+
+
+@receiver(post_init, sender=Madre)
+def recordar_nombre(sender, instance, **kwargs):
+    """Guarda el nombre con que se cargó la madre para detectar cambios"""
+    instance._nombre_inicial = instance.__dict__.get('nombre')
+
+
+@receiver(post_save, sender=Madre)
+def madre_guardada(sender, instance, created, **kwargs):
+    """Mantiene al día el índice de tokens cuando cambia el nombre"""
+    nombre = instance.__dict__.get('nombre')
+    if created or nombre != instance._nombre_inicial:
+        indexar_madre(instance)
+    instance._nombre_inicial = nombre
@@ -0,0 +1,20 @@
+# Generated by Django 5.2.6 on 2026-10-18 04:30
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pacientes', '0004_tokennombremadre'),
+        ('partos', '0002_parto_creado_por'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='parto',
+            index=models.Index(fields=['creado_por', 'fecha_registro'], name='parto_creador_registro_idx'),
+        ),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 5.2.6 on 2026-10-18 04:36
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pacientes', '0005_incremental'),
+        ('partos', '0003_indices_paneles'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='parto',
+            index=models.Index(fields=['fecha_actualizacion', 'id'], name='parto_actualizacion_idx'),
+        ),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 5.2.6 on 2026-10-18 05:01
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pacientes', '0005_incremental'),
+        ('partos', '0004_incremental'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='parto',
+            index=models.Index(fields=['madre', 'fecha_hora_inicio'], name='parto_madre_inicio_idx'),
+        ),
+    ]
@@ -1,6 +1,6 @@
 # partos/models.py
-from django.db import models
-from pacientes.models import Madre
+from django.db import models, router, transaction
+from pacientes.models import Madre, con_texto
 from django.conf import settings
 
 class Parto(models.Model):
@@ -89,10 +89,23 @@ class Parto(models.Model):
         verbose_name = "Parto"
         verbose_name_plural = "Partos"
         ordering = ['-fecha_hora_inicio']
+        indexes = [
+            # Registros del día por matrona (panel de la matrona)
+            models.Index(fields=['creado_por', 'fecha_registro'], name='parto_creador_registro_idx'),
+            # Exportación incremental por marca de agua (altas/incremental.py)
+            models.Index(fields=['fecha_actualizacion', 'id'], name='parto_actualizacion_idx'),
+            # Partos de una madre, recientes primero (selección encadenada del alta)
+            models.Index(fields=['madre', 'fecha_hora_inicio'], name='parto_madre_inicio_idx'),
+        ]
     
     def __str__(self):
         return f"Parto {self.get_tipo_display()} - {self.madre.nombre} ({self.fecha_hora_inicio.strftime('%d/%m/%Y %H:%M')})"
     
+    def save(self, *args, **kwargs):
+        """Guarda en una transacción, junto con el ajuste de los registros del panel (post_save)"""
+        with transaction.atomic(using=kwargs.get('using') or router.db_for_write(Parto, instance=self)):
+            super().save(*args, **kwargs)
+    
     def tiene_registros_completos(self):
         """Valida si el parto tiene todos los datos necesarios"""
         return all([
@@ -103,6 +116,17 @@ class Parto(models.Model):
             self.matrona_responsable
         ])
     
+    @staticmethod
+    def filtro_registros_completos(prefijo=''):
+        """Equivalente SQL de tiene_registros_completos() (ver Madre.filtro_registros_completos)"""
+        return (
+            con_texto(f'{prefijo}tipo')
+            & models.Q(**{f'{prefijo}fecha_hora_inicio__isnull': False})
+            & models.Q(**{f'{prefijo}fecha_hora_termino__isnull': False})
+            & con_texto(f'{prefijo}medico_responsable')
+            & con_texto(f'{prefijo}matrona_responsable')
+        )
+    
     def duracion_horas(self):
         """Calcula la duración del parto en horas"""
         if self.fecha_hora_inicio and self.fecha_hora_termino:
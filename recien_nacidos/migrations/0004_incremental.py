@@ -0,0 +1,20 @@
+# Generated by Django 5.2.6 on 2026-10-18 04:36
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('partos', '0004_incremental'),
+        ('recien_nacidos', '0003_reciennacido_creado_por'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='reciennacido',
+            index=models.Index(fields=['fecha_actualizacion', 'id'], name='rn_actualizacion_idx'),
+        ),
+    ]
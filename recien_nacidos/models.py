@@ -1,7 +1,8 @@
 # recien_nacidos/models.py
-from django.db import models
+from django.db import models, router, transaction
 from django.core.validators import MinValueValidator, MaxValueValidator
 from partos.models import Parto
+from pacientes.models import con_texto, distinto_de_cero
 import uuid
 from django.conf import settings
 class RecienNacido(models.Model):
@@ -141,12 +142,20 @@ class RecienNacido(models.Model):
         verbose_name = "Recién Nacido"
         verbose_name_plural = "Recién Nacidos"
         ordering = ['-fecha_registro']
+        indexes = [
+            # Exportación incremental por marca de agua (altas/incremental.py)
+            models.Index(fields=['fecha_actualizacion', 'id'], name='rn_actualizacion_idx'),
+        ]
     
     def save(self, *args, **kwargs):
-        """Genera código único automáticamente si no existe"""
+        """
+        Genera código único automáticamente si no existe. Guarda en una
+        transacción, junto con el ajuste de los resúmenes diarios (post_save).
+        """
         if not self.codigo_unico:
             self.codigo_unico = f"RN-{uuid.uuid4().hex[:8].upper()}"
-        super().save(*args, **kwargs)
+        with transaction.atomic(using=kwargs.get('using') or router.db_for_write(RecienNacido, instance=self)):
+            super().save(*args, **kwargs)
     
     def __str__(self):
         nombre = self.nombre if self.nombre else "Sin nombre"
@@ -164,6 +173,19 @@ class RecienNacido(models.Model):
             self.condicion_nacimiento
         ])
     
+    @staticmethod
+    def filtro_registros_completos(prefijo=''):
+        """Equivalente SQL de tiene_registros_completos() (ver Madre.filtro_registros_completos)"""
+        return (
+            con_texto(f'{prefijo}codigo_unico')
+            & con_texto(f'{prefijo}sexo')
+            & distinto_de_cero(f'{prefijo}peso')
+            & distinto_de_cero(f'{prefijo}talla')
+            & models.Q(**{f'{prefijo}apgar_1_min__isnull': False})
+            & models.Q(**{f'{prefijo}apgar_5_min__isnull': False})
+            & con_texto(f'{prefijo}condicion_nacimiento')
+        )
+    
     def tiene_apgar_critico(self):
         """Detecta si el APGAR es crítico (menor a 7)"""
         return self.apgar_1_min < 7 or self.apgar_5_min < 7
@@ -1,3 +1,11 @@
+# reportes/admin.py
 from django.contrib import admin
+from .models import ResumenDiario
 
-# Register your models here.
+
+@admin.register(ResumenDiario)
+class ResumenDiarioAdmin(admin.ModelAdmin):
+    list_display = ('fecha', 'metrica', 'valor', 'cantidad')
+    list_filter = ('metrica',)
+    date_hierarchy = 'fecha'
+    ordering = ('-fecha', 'metrica', 'valor')
@@ -0,0 +1,143 @@
+# reportes/estadia.py
+"""
+Días de estadía: desde el ingreso de la madre (Madre.fecha_ingreso) hasta el
+alta completada (Alta.fecha_alta).
+
+La resta de fechas y el agrupamiento se hacen en la base: una sola consulta
+devuelve cuántas altas hubo por (tipo de parto, complicaciones, horas de
+estadía), unas decenas de filas aunque el periodo tenga miles de altas. Las
+medianas y percentiles se leen de esos conteos acumulados, con resolución de
+una hora (horas completas de estadía).
+
+Cada periodo se guarda en la caché compartida; las señales de reportes
+invalidan todos los periodos, al confirmarse la transacción, cuando un alta
+entra o sale del estado completada o cambia el tipo o las complicaciones de
+un parto.
+"""
+import math
+import time
+from collections import Counter
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import BigIntegerField, Count, DurationField, ExpressionWrapper, F, Value
+from django.db.models.functions import Cast, Floor
+
+from altas.models import Alta
+from .periodos import filtro_fechas
+
+TTL_ESTADIA = 60 * 60  # segundos
+CLAVE_VERSION_ESTADIA = 'reportes:estadia:version'
+
+PERCENTILES = {'mediana': 50, 'p90': 90, 'p99': 99}
+
+MICROSEGUNDOS_POR_HORA = 3600 * 10**6
+
+# Horas completas entre el ingreso y el alta
+HORAS_ESTADIA = Floor(
+    ExpressionWrapper(
+        Cast(
+            ExpressionWrapper(F('fecha_alta') - F('madre__fecha_ingreso'), output_field=DurationField()),
+            BigIntegerField(),
+        ) / Value(MICROSEGUNDOS_POR_HORA),
+        output_field=BigIntegerField(),
+    )
+)
+
+
+# ==========================================
+# CÁLCULO
+# ==========================================
+
+def conteos_estadia(desde=None, hasta=None):
+    """
+    Filas (tipo, tuvo_complicaciones, horas, cantidad) de las altas
+    completadas entre las fechas locales 'desde' y 'hasta' (incluidas).
+    """
+    altas = Alta.objects.filter(
+        estado='completada',
+        fecha_alta__isnull=False,
+        **filtro_fechas('fecha_alta', desde, hasta)
+    )
+    return list(
+        altas.annotate(horas=HORAS_ESTADIA)
+        .values_list('parto__tipo', 'parto__tuvo_complicaciones', 'horas')
+        .annotate(cantidad=Count('pk'))
+        .order_by()
+    )
+
+
+def resumir(conteo):
+    """Total y percentiles (en horas y días) de un Counter {horas: cantidad}"""
+    total = sum(conteo.values())
+    resumen = {'total': total}
+    if not total:
+        return resumen
+
+    horas = sorted(conteo)
+    for nombre, percentil in PERCENTILES.items():
+        # Rango más cercano: primera hora cuyo acumulado alcanza el percentil
+        objetivo = max(1, math.ceil(total * percentil / 100))
+        acumulado = 0
+        for hora in horas:
+            acumulado += conteo[hora]
+            if acumulado >= objetivo:
+                break
+        resumen[nombre] = hora
+        resumen[f'{nombre}_dias'] = round(hora / 24, 1)
+    return resumen
+
+
+def calcular_estadia(desde=None, hasta=None):
+    """Estadía total, por tipo de parto, por complicaciones y por ambos"""
+    total = Counter()
+    por_tipo, por_complicaciones, por_tipo_y_complicaciones = {}, {}, {}
+    for tipo, complicaciones, horas, cantidad in conteos_estadia(desde, hasta):
+        complicaciones = 'si' if complicaciones else 'no'
+        total[horas] += cantidad
+        por_tipo.setdefault(tipo, Counter())[horas] += cantidad
+        por_complicaciones.setdefault(complicaciones, Counter())[horas] += cantidad
+        por_tipo_y_complicaciones.setdefault(f'{tipo}:{complicaciones}', Counter())[horas] += cantidad
+
+    return {
+        'desde': desde,
+        'hasta': hasta,
+        'general': resumir(total),
+        'por_tipo_parto': {clave: resumir(c) for clave, c in sorted(por_tipo.items())},
+        'por_complicaciones': {clave: resumir(c) for clave, c in sorted(por_complicaciones.items())},
+        'por_tipo_y_complicaciones': {clave: resumir(c) for clave, c in sorted(por_tipo_y_complicaciones.items())},
+    }
+
+
+# ==========================================
+# CACHÉ POR PERIODO
+# ==========================================
+
+def _version():
+    version = cache.get(CLAVE_VERSION_ESTADIA)
+    if version is None:
+        cache.add(CLAVE_VERSION_ESTADIA, time.time_ns(), None)
+        version = cache.get(CLAVE_VERSION_ESTADIA)
+    return version
+
+
+def _subir_version():
+    try:
+        cache.incr(CLAVE_VERSION_ESTADIA)
+    except ValueError:
+        cache.set(CLAVE_VERSION_ESTADIA, time.time_ns(), None)
+
+
+def invalidar_estadia():
+    """Descarta las estadías cacheadas de todos los periodos al confirmarse la transacción en curso"""
+    transaction.on_commit(_subir_version)
+
+
+def estadia(desde=None, hasta=None):
+    """calcular_estadia() del periodo, desde la caché si está"""
+    clave = f'reportes:estadia:{_version()}:{desde}:{hasta}'
+    resultado = cache.get(clave)
+    if resultado is None:
+        resultado = calcular_estadia(desde, hasta)
+        cache.set(clave, resultado, TTL_ESTADIA)
+    return resultado
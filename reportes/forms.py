@@ -0,0 +1,43 @@
+# reportes/forms.py
+from django import forms
+from django.utils import timezone
+
+
+class PeriodoReporteForm(forms.Form):
+    """
+    Rango de días del reporte. Sin fechas se toma el mes en curso.
+    """
+    
+    fecha_desde = forms.DateField(
+        required=False,
+        label="Desde",
+        widget=forms.DateInput(attrs={
+            'class': 'form-control form-control-sm',
+            'type': 'date'
+        })
+    )
+    
+    fecha_hasta = forms.DateField(
+        required=False,
+        label="Hasta",
+        widget=forms.DateInput(attrs={
+            'class': 'form-control form-control-sm',
+            'type': 'date'
+        })
+    )
+    
+    def clean(self):
+        cleaned_data = super().clean()
+        fecha_desde = cleaned_data.get('fecha_desde')
+        fecha_hasta = cleaned_data.get('fecha_hasta')
+        if fecha_desde and fecha_hasta and fecha_desde > fecha_hasta:
+            raise forms.ValidationError('La fecha "desde" no puede ser posterior a la fecha "hasta".')
+        return cleaned_data
+    
+    def periodo(self):
+        """(desde, hasta) del formulario (ya validado), ambos incluidos"""
+        hoy = timezone.localdate()
+        datos = self.cleaned_data if self.is_valid() else {}
+        fecha_desde = datos.get('fecha_desde') or hoy.replace(day=1)
+        fecha_hasta = datos.get('fecha_hasta') or max(hoy, fecha_desde)
+        return fecha_desde, fecha_hasta
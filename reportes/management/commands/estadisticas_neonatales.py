@@ -0,0 +1,61 @@
+# reportes/management/commands/estadisticas_neonatales.py
+import json
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+from django.core.serializers.json import DjangoJSONEncoder
+
+from reportes.neonatal import ETIQUETAS, estadisticas_neonatales
+
+
+def _porcentaje(tasa):
+    return '-' if tasa is None else f'{tasa * 100:.1f}%'
+
+
+class Command(BaseCommand):
+    help = "Muestra peso, talla y tasas de APGAR bajo de los recién nacidos de un periodo"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--desde',
+            type=date.fromisoformat,
+            help='Fecha de parto inicial (AAAA-MM-DD, por defecto sin límite)'
+        )
+        parser.add_argument(
+            '--hasta',
+            type=date.fromisoformat,
+            help='Fecha de parto final (AAAA-MM-DD, por defecto sin límite)'
+        )
+        parser.add_argument(
+            '--json',
+            action='store_true',
+            help='Escribe el resultado completo en JSON'
+        )
+
+    def handle(self, *args, **options):
+        desde, hasta = options['desde'], options['hasta']
+        if desde and hasta and desde > hasta:
+            raise CommandError("--desde no puede ser posterior a --hasta")
+
+        estadisticas = estadisticas_neonatales(desde, hasta)
+        if options['json']:
+            self.stdout.write(json.dumps(estadisticas, cls=DjangoJSONEncoder, ensure_ascii=False, indent=2))
+            return
+
+        filas = [('Total', estadisticas['general'])]
+        for grupo, columna in (('por_sexo', 'sexo'), ('por_tipo_parto', 'tipo')):
+            for valor, resumen in estadisticas[grupo].items():
+                filas.append((ETIQUETAS[columna].get(valor, valor), resumen))
+
+        self.stdout.write(
+            f"{'Grupo':<15}{'RN':>8}{'P50 peso':>10}{'P50 talla':>11}"
+            f"{'APGAR<7':>9}{'Peso no adec.':>15}"
+        )
+        for etiqueta, resumen in filas:
+            self.stdout.write(
+                f"{etiqueta:<15}{resumen['total']:>8}"
+                f"{resumen['percentiles_peso'].get(50, '-'):>10}"
+                f"{resumen['percentiles_talla'].get(50, '-'):>11}"
+                f"{_porcentaje(resumen['tasa_apgar_critico']):>9}"
+                f"{_porcentaje(resumen['tasa_peso_inadecuado']):>15}"
+            )
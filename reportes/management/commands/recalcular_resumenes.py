@@ -0,0 +1,57 @@
+# reportes/management/commands/recalcular_resumenes.py
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Max, Min
+from django.utils import timezone
+
+from altas.models import Alta
+from partos.models import Parto
+from reportes.models import ResumenDiario
+from reportes.periodos import fecha_local
+from reportes.resumenes import recalcular
+
+
+def _rango_de_datos():
+    """Primer y último día con partos, altas o resúmenes ya guardados"""
+    fechas = []
+    for modelo, campo in ((Parto, 'fecha_hora_inicio'), (Alta, 'fecha_creacion')):
+        extremos = modelo.objects.aggregate(primero=Min(campo), ultimo=Max(campo))
+        fechas += [fecha_local(valor) for valor in extremos.values() if valor]
+    extremos = ResumenDiario.objects.aggregate(primero=Min('fecha'), ultimo=Max('fecha'))
+    fechas += [valor for valor in extremos.values() if valor]
+    if not fechas:
+        return None, None
+    return min(fechas), max(fechas)
+
+
+class Command(BaseCommand):
+    help = (
+        "Reconstruye los resúmenes diarios de reportes desde los registros. "
+        "Sirve para cargarlos por primera vez o repararlos tras cambios masivos "
+        "hechos sin señales (update(), SQL directo)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--desde',
+            type=date.fromisoformat,
+            help='Primer día a recalcular (AAAA-MM-DD, por defecto el primer día con datos)'
+        )
+        parser.add_argument(
+            '--hasta',
+            type=date.fromisoformat,
+            help='Último día a recalcular (AAAA-MM-DD, por defecto el último día con datos)'
+        )
+
+    def handle(self, *args, **options):
+        primero, ultimo = _rango_de_datos()
+        desde = options['desde'] or primero or timezone.localdate()
+        hasta = options['hasta'] or ultimo or timezone.localdate()
+        if desde > hasta:
+            raise CommandError("--desde no puede ser posterior a --hasta")
+
+        filas = recalcular(desde, hasta)
+        self.stdout.write(self.style.SUCCESS(
+            f"Resúmenes del {desde:%d/%m/%Y} al {hasta:%d/%m/%Y} recalculados: {filas} fila(s)"
+        ))
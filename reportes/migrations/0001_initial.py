@@ -0,0 +1,30 @@
+# Generated by Django 5.2.6 on 2026-10-18 04:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ResumenDiario',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('fecha', models.DateField(verbose_name='Fecha')),
+                ('metrica', models.CharField(choices=[('partos_tipo', 'Partos por tipo'), ('partos_complicaciones', 'Partos con complicaciones'), ('rn_sexo', 'Recién nacidos por sexo'), ('rn_condicion', 'Recién nacidos por condición al nacer'), ('rn_derivacion', 'Derivaciones por servicio'), ('altas_estado', 'Altas por estado')], max_length=30, verbose_name='Métrica')),
+                ('valor', models.CharField(max_length=200, verbose_name='Valor')),
+                ('cantidad', models.IntegerField(default=0, verbose_name='Cantidad')),
+            ],
+            options={
+                'verbose_name': 'Resumen diario',
+                'verbose_name_plural': 'Resúmenes diarios',
+                'ordering': ['fecha', 'metrica', 'valor'],
+                'constraints': [models.UniqueConstraint(fields=('fecha', 'metrica', 'valor'), name='resumen_diario_unico')],
+            },
+        ),
+    ]
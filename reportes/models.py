@@ -1,3 +1,49 @@
+# reportes/models.py
 from django.db import models
 
-# Create your models here.
+
+class ResumenDiario(models.Model):
+    """
+    Conteos diarios precalculados para los reportes.
+    Una fila por (día local, métrica, valor). Se mantiene al guardar o
+    eliminar partos, recién nacidos y altas (reportes/signals.py) y se puede
+    reconstruir desde los registros con el comando recalcular_resumenes.
+    """
+    
+    METRICAS = [
+        ('partos_tipo', 'Partos por tipo'),
+        ('partos_complicaciones', 'Partos con complicaciones'),
+        ('rn_sexo', 'Recién nacidos por sexo'),
+        ('rn_condicion', 'Recién nacidos por condición al nacer'),
+        ('rn_derivacion', 'Derivaciones por servicio'),
+        ('altas_estado', 'Altas por estado'),
+    ]
+    
+    fecha = models.DateField(
+        verbose_name="Fecha"
+    )
+    metrica = models.CharField(
+        max_length=30,
+        choices=METRICAS,
+        verbose_name="Métrica"
+    )
+    valor = models.CharField(
+        max_length=200,
+        verbose_name="Valor"
+    )
+    cantidad = models.IntegerField(
+        default=0,
+        verbose_name="Cantidad"
+    )
+    
+    class Meta:
+        verbose_name = "Resumen diario"
+        verbose_name_plural = "Resúmenes diarios"
+        ordering = ['fecha', 'metrica', 'valor']
+        constraints = [
+            # También es el índice de las consultas por rango de fechas
+            models.UniqueConstraint(fields=['fecha', 'metrica', 'valor'], name='resumen_diario_unico'),
+        ]
+    
+    def __str__(self):
+        return f"{self.fecha} {self.metrica}={self.valor}: {self.cantidad}"
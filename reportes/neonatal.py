@@ -0,0 +1,135 @@
+# reportes/neonatal.py
+"""
+Estadísticas neonatales (peso, talla y APGAR) calculadas con NumPy.
+
+Las columnas necesarias se leen por lotes (una consulta por cada TAMANO_LOTE
+recién nacidos, sin crear instancias del modelo) a un arreglo estructurado, y
+los percentiles, histogramas y tasas se calculan sobre el arreglo completo en
+vez de llamar a tiene_apgar_critico() / peso_adecuado() fila por fila.
+Los criterios son los mismos que esos métodos de RecienNacido.
+"""
+from operator import itemgetter
+
+import numpy as np
+
+from altas.paginacion import recorrer_por_lotes
+from partos.models import Parto
+from recien_nacidos.models import RecienNacido
+from .periodos import filtro_fechas
+
+# Mismos límites que RecienNacido.peso_adecuado() y tiene_apgar_critico()
+PESO_MINIMO = 2.5
+PESO_MAXIMO = 4.0
+APGAR_CRITICO = 7
+
+PERCENTILES = (5, 10, 25, 50, 75, 90, 95, 99)
+
+# Bordes de los histogramas; los valores fuera de rango caen en el primer o
+# último tramo
+BORDES_PESO = np.round(np.arange(1.0, 5.51, 0.25), 2)
+BORDES_TALLA = np.arange(35.0, 60.1, 2.5)
+
+COLUMNAS = (
+    ('id', 'i8'),
+    ('sexo', 'U1'),
+    ('tipo', 'U20'),
+    ('peso', 'f8'),
+    ('talla', 'f8'),
+    ('apgar_1', 'i2'),
+    ('apgar_5', 'i2'),
+)
+DTYPE = np.dtype(list(COLUMNAS))
+
+# Etiquetas de los valores de las columnas por las que se agrupa
+ETIQUETAS = {
+    'sexo': dict(RecienNacido.SEXO),
+    'tipo': dict(Parto.TIPO_PARTO),
+}
+
+
+# ==========================================
+# CARGA
+# ==========================================
+
+def cargar(desde=None, hasta=None):
+    """
+    Arreglo estructurado (DTYPE) con los recién nacidos cuyo parto empezó
+    entre las fechas locales 'desde' y 'hasta' (ambas incluidas, opcionales).
+    """
+    recien_nacidos = RecienNacido.objects.filter(
+        **filtro_fechas('parto__fecha_hora_inicio', desde, hasta)
+    ).values_list('pk', 'sexo', 'parto__tipo', 'peso', 'talla', 'apgar_1_min', 'apgar_5_min')
+    return np.fromiter(
+        recorrer_por_lotes(recien_nacidos, clave=itemgetter(0)),
+        dtype=DTYPE,
+    )
+
+
+# ==========================================
+# CÁLCULO
+# ==========================================
+
+def _tasa(mascara):
+    """Proporción (0 a 1) de valores verdaderos; None si no hay datos"""
+    return float(mascara.mean()) if mascara.size else None
+
+
+def _percentiles(valores):
+    if not valores.size:
+        return {}
+    return dict(zip(PERCENTILES, np.percentile(valores, PERCENTILES).round(2).tolist()))
+
+
+def _histograma(valores, bordes):
+    """Tramos [(desde, hasta, cantidad)] con los extremos acumulados en los bordes"""
+    cantidades, _ = np.histogram(np.clip(valores, bordes[0], bordes[-1]), bins=bordes)
+    return list(zip(bordes[:-1].tolist(), bordes[1:].tolist(), cantidades.tolist()))
+
+
+def resumir(datos):
+    """Estadísticas de un arreglo de cargar() (o de un subconjunto)"""
+    peso = datos['peso']
+    apgar_1_bajo = datos['apgar_1'] < APGAR_CRITICO
+    apgar_5_bajo = datos['apgar_5'] < APGAR_CRITICO
+    bajo_peso = peso < PESO_MINIMO
+    sobre_peso = peso > PESO_MAXIMO
+    return {
+        'total': int(datos.size),
+        'peso_promedio': round(float(peso.mean()), 2) if datos.size else None,
+        'talla_promedio': round(float(datos['talla'].mean()), 1) if datos.size else None,
+        'percentiles_peso': _percentiles(peso),
+        'percentiles_talla': _percentiles(datos['talla']),
+        'histograma_peso': _histograma(peso, BORDES_PESO),
+        'histograma_talla': _histograma(datos['talla'], BORDES_TALLA),
+        'tasa_apgar_1_bajo': _tasa(apgar_1_bajo),
+        'tasa_apgar_5_bajo': _tasa(apgar_5_bajo),
+        'tasa_apgar_critico': _tasa(apgar_1_bajo | apgar_5_bajo),
+        'tasa_bajo_peso': _tasa(bajo_peso),
+        'tasa_sobre_peso': _tasa(sobre_peso),
+        'tasa_peso_inadecuado': _tasa(bajo_peso | sobre_peso),
+    }
+
+
+def resumir_por(datos, columna):
+    """{valor de la columna: resumir(filas con ese valor)}"""
+    if not datos.size:
+        return {}
+    # Un solo ordenamiento y cortes contiguos por grupo
+    orden = np.argsort(datos[columna], kind='stable')
+    ordenados = datos[orden]
+    valores, inicios = np.unique(ordenados[columna], return_index=True)
+    grupos = np.split(ordenados, inicios[1:])
+    return {str(valor): resumir(grupo) for valor, grupo in zip(valores, grupos)}
+
+
+def estadisticas_neonatales(desde=None, hasta=None):
+    """Resumen general y por sexo y tipo de parto del periodo"""
+    datos = cargar(desde, hasta)
+    return {
+        'desde': desde,
+        'hasta': hasta,
+        'general': resumir(datos),
+        'por_sexo': resumir_por(datos, 'sexo'),
+        'por_tipo_parto': resumir_por(datos, 'tipo'),
+    }
+
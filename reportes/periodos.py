@@ -0,0 +1,69 @@
+# reportes/periodos.py
+"""
+Periodos locales (día, semana, mes) como rangos semiabiertos en UTC.
+
+Filtrar con campo__date=fecha obliga al motor a convertir la columna a la
+zona local en cada fila (CONVERT_TZ en MySQL), y ese cálculo no puede usar
+índices. Aquí se hace al revés: se calculan una vez los instantes UTC en que
+empieza y termina el periodo local (America/Santiago, con sus cambios de
+horario) y se filtra con campo >= inicio AND campo < fin.
+"""
+from datetime import date, datetime, time, timedelta, timezone as tz
+
+from django.utils import timezone
+
+
+def inicio_del_dia(fecha):
+    """Instante (UTC) en que empieza el día local 'fecha'"""
+    local = datetime.combine(fecha, time.min, tzinfo=timezone.get_current_timezone())
+    return local.astimezone(tz.utc)
+
+
+def rango_dia(fecha=None):
+    """(inicio, fin) del día local; por defecto hoy"""
+    fecha = fecha or timezone.localdate()
+    return inicio_del_dia(fecha), inicio_del_dia(fecha + timedelta(days=1))
+
+
+def rango_semana(fecha=None):
+    """(inicio, fin) de la semana local (lunes a domingo) que contiene 'fecha'"""
+    fecha = fecha or timezone.localdate()
+    lunes = fecha - timedelta(days=fecha.weekday())
+    return inicio_del_dia(lunes), inicio_del_dia(lunes + timedelta(days=7))
+
+
+def rango_mes(fecha=None):
+    """(inicio, fin) del mes local que contiene 'fecha'"""
+    fecha = fecha or timezone.localdate()
+    primero = fecha.replace(day=1)
+    siguiente = date(primero.year + primero.month // 12, primero.month % 12 + 1, 1)
+    return inicio_del_dia(primero), inicio_del_dia(siguiente)
+
+
+def filtro_fechas(campo, desde=None, hasta=None):
+    """
+    Lookups para filtrar un DateTimeField entre dos fechas locales, ambas
+    incluidas completas: {campo__gte: inicio de 'desde', campo__lt: inicio
+    del día siguiente a 'hasta'}. Las fechas ausentes no se filtran.
+    """
+    filtros = {}
+    if desde:
+        filtros[f'{campo}__gte'] = inicio_del_dia(desde)
+    if hasta:
+        filtros[f'{campo}__lt'] = inicio_del_dia(hasta + timedelta(days=1))
+    return filtros
+
+
+def filtro_rango(campo, rango):
+    """Lookups para un rango (inicio, fin) de rango_dia/rango_semana/rango_mes"""
+    inicio, fin = rango
+    return {f'{campo}__gte': inicio, f'{campo}__lt': fin}
+
+
+def fecha_local(instante):
+    """Día local de un instante (los datetime sin zona se toman en la zona del sitio)"""
+    if instante is None:
+        return None
+    if timezone.is_naive(instante):
+        instante = timezone.make_aware(instante)
+    return timezone.localdate(instante)
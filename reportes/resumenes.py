@@ -0,0 +1,144 @@
+# reportes/resumenes.py
+"""
+Mantención de los resúmenes diarios (ResumenDiario).
+
+Cada registro aporta +1 a un conjunto de claves (fecha, métrica, valor):
+- Parto: su tipo y si tuvo complicaciones, en el día local de fecha_hora_inicio.
+- Recién nacido: sexo, condición al nacer y servicio de derivación, en el
+  día de su parto.
+- Alta: su estado, en el día local de fecha_creacion.
+
+Al guardar un registro se restan sus aportes anteriores y se suman los
+nuevos, tocando solo las filas que cambian (ver reportes/signals.py), en la
+misma transacción que guarda el registro. Los
+reportes leen solo estas filas: su costo depende de los días consultados y
+no de la cantidad de nacimientos.
+"""
+from collections import Counter
+from operator import itemgetter
+
+from django.db import IntegrityError, transaction
+from django.db.models import F
+
+from altas.models import Alta
+from altas.paginacion import recorrer_por_lotes
+from partos.models import Parto
+from recien_nacidos.models import RecienNacido
+from .models import ResumenDiario
+from .periodos import fecha_local, filtro_fechas
+
+SIN_SERVICIO = 'Sin especificar'
+
+
+# ==========================================
+# APORTES DE CADA REGISTRO
+# ==========================================
+
+def aportes_parto(fecha, tipo, tuvo_complicaciones):
+    if fecha is None:
+        return []
+    return [
+        (fecha, 'partos_tipo', tipo),
+        (fecha, 'partos_complicaciones', 'si' if tuvo_complicaciones else 'no'),
+    ]
+
+
+def aportes_recien_nacido(fecha, sexo, condicion, requiere_derivacion, servicio):
+    if fecha is None:
+        return []
+    aportes = [
+        (fecha, 'rn_sexo', sexo),
+        (fecha, 'rn_condicion', condicion),
+    ]
+    if requiere_derivacion:
+        aportes.append((fecha, 'rn_derivacion', (servicio or '').strip() or SIN_SERVICIO))
+    return aportes
+
+
+def aportes_alta(fecha, estado):
+    if fecha is None:
+        return []
+    return [(fecha, 'altas_estado', estado)]
+
+
+# ==========================================
+# ACTUALIZACIÓN INCREMENTAL
+# ==========================================
+
+def _sumar(fecha, metrica, valor, delta):
+    filtro = {'fecha': fecha, 'metrica': metrica, 'valor': valor}
+    if ResumenDiario.objects.filter(**filtro).update(cantidad=F('cantidad') + delta):
+        return
+    try:
+        with transaction.atomic():
+            ResumenDiario.objects.create(cantidad=delta, **filtro)
+    except IntegrityError:
+        # Otro proceso creó la fila entre la actualización y el insert
+        ResumenDiario.objects.filter(**filtro).update(cantidad=F('cantidad') + delta)
+
+
+def aplicar(antes, despues):
+    """Resta los aportes 'antes' y suma los 'despues'; omite las claves sin cambio"""
+    diferencia = Counter(despues)
+    diferencia.subtract(Counter(antes))
+    for (fecha, metrica, valor), delta in diferencia.items():
+        if delta:
+            _sumar(fecha, metrica, valor, delta)
+
+
+# ==========================================
+# RECONSTRUCCIÓN DESDE LOS REGISTROS
+# ==========================================
+
+def calcular(desde, hasta):
+    """
+    Cuenta desde los registros los aportes de los días [desde, hasta].
+    Usa las mismas funciones de aportes que la actualización incremental.
+    """
+    conteo = Counter()
+
+    partos = Parto.objects.filter(**filtro_fechas('fecha_hora_inicio', desde, hasta))
+    for _, inicio, tipo, complicaciones in recorrer_por_lotes(
+        partos.values_list('pk', 'fecha_hora_inicio', 'tipo', 'tuvo_complicaciones'),
+        clave=itemgetter(0),
+    ):
+        conteo.update(aportes_parto(fecha_local(inicio), tipo, complicaciones))
+
+    recien_nacidos = RecienNacido.objects.filter(**filtro_fechas('parto__fecha_hora_inicio', desde, hasta))
+    for _, inicio, *datos in recorrer_por_lotes(
+        recien_nacidos.values_list(
+            'pk', 'parto__fecha_hora_inicio', 'sexo', 'condicion_nacimiento',
+            'requiere_derivacion', 'servicio_derivacion',
+        ),
+        clave=itemgetter(0),
+    ):
+        conteo.update(aportes_recien_nacido(fecha_local(inicio), *datos))
+
+    altas = Alta.objects.filter(**filtro_fechas('fecha_creacion', desde, hasta))
+    for _, creacion, estado in recorrer_por_lotes(
+        altas.values_list('pk', 'fecha_creacion', 'estado'),
+        clave=itemgetter(0),
+    ):
+        conteo.update(aportes_alta(fecha_local(creacion), estado))
+
+    return conteo
+
+
+def recalcular(desde, hasta):
+    """
+    Reemplaza los resúmenes de los días [desde, hasta]; retorna cuántas filas quedaron.
+    Las filas del rango se bloquean (FOR UPDATE) antes de contar: un cambio
+    confirmado antes ya está en el conteo, y uno en curso espera el bloqueo
+    y suma su ajuste sobre las filas nuevas, en vez de perderse al borrarlas.
+    """
+    with transaction.atomic():
+        rango = ResumenDiario.objects.filter(fecha__gte=desde, fecha__lte=hasta)
+        list(rango.select_for_update().values_list('pk', flat=True))
+        conteo = calcular(desde, hasta)
+        rango.delete()
+        ResumenDiario.objects.bulk_create(
+            ResumenDiario(fecha=fecha, metrica=metrica, valor=valor, cantidad=cantidad)
+            for (fecha, metrica, valor), cantidad in conteo.items()
+            if cantidad
+        )
+    return sum(1 for cantidad in conteo.values() if cantidad)
@@ -0,0 +1,198 @@
+# reportes/signals.py
+"""
+Mantiene ResumenDiario al guardar o eliminar partos, recién nacidos y altas.
+Los valores con que se cargó cada registro se guardan en post_init; si venían
+diferidos (only/defer), se leen de la base antes de guardar. Las altas
+confirmadas en lote (transicion_en_lote) se ajustan con un solo aplicar().
+
+También invalida las estadías cacheadas (reportes/estadia.py) cuando cambia
+lo que las agrupa: el tipo o las complicaciones de un parto, o si un alta
+está completada.
+"""
+from django.db.models.signals import post_init, pre_save, post_save, post_delete
+from django.dispatch import receiver
+
+from altas.models import Alta, transicion_en_lote
+from partos.models import Parto
+from recien_nacidos.models import RecienNacido
+from .estadia import invalidar_estadia
+from .periodos import fecha_local
+from .resumenes import aplicar, aportes_parto, aportes_recien_nacido, aportes_alta
+
+CAMPOS_PARTO = ('fecha_hora_inicio', 'tipo', 'tuvo_complicaciones')
+CAMPOS_RN = ('parto_id', 'sexo', 'condicion_nacimiento', 'requiere_derivacion', 'servicio_derivacion')
+CAMPOS_ALTA = ('fecha_creacion', 'estado')
+
+
+def _valores(instance, campos):
+    """Valores actuales de los campos, o None si alguno está diferido"""
+    if any(campo not in instance.__dict__ for campo in campos):
+        return None
+    return tuple(instance.__dict__[campo] for campo in campos)
+
+
+def _recordar(instance, campos):
+    instance._resumen_inicial = _valores(instance, campos)
+
+
+def _completar_inicial(sender, instance, campos):
+    """Si los valores iniciales venían diferidos, se leen antes de guardar"""
+    if instance._state.adding or instance._resumen_inicial is not None:
+        return
+    instance._resumen_inicial = (
+        sender.objects.filter(pk=instance.pk).values_list(*campos).first()
+    )
+
+
+def _valores_guardados(sender, instance, campos):
+    """Valores recién guardados; si quedó alguno diferido, se leen de la base"""
+    valores = _valores(instance, campos)
+    if valores is None:
+        valores = sender.objects.filter(pk=instance.pk).values_list(*campos).first()
+    return valores
+
+
+def _fecha_del_parto(instance, parto_id):
+    """Día local del parto de un recién nacido (usa el parto cargado si lo hay)"""
+    if parto_id is None:
+        return None
+    parto = instance._state.fields_cache.get('parto')
+    if parto is not None and parto.pk == parto_id:
+        return fecha_local(parto.fecha_hora_inicio)
+    inicio = Parto.objects.filter(pk=parto_id).values_list('fecha_hora_inicio', flat=True).first()
+    return fecha_local(inicio)
+
+
+def _aportes_parto(valores):
+    if valores is None:
+        return []
+    inicio, tipo, complicaciones = valores
+    return aportes_parto(fecha_local(inicio), tipo, complicaciones)
+
+
+def _aportes_rn(instance, valores):
+    if valores is None:
+        return []
+    parto_id, *datos = valores
+    return aportes_recien_nacido(_fecha_del_parto(instance, parto_id), *datos)
+
+
+def _completada(valores):
+    return valores is not None and valores[1] == 'completada'
+
+
+def _aportes_alta(valores):
+    if valores is None:
+        return []
+    creacion, estado = valores
+    return aportes_alta(fecha_local(creacion), estado)
+
+
+# ==========================================
+# PARTOS
+# ==========================================
+
+@receiver(post_init, sender=Parto)
+def parto_cargado(sender, instance, **kwargs):
+    _recordar(instance, CAMPOS_PARTO)
+
+
+@receiver(pre_save, sender=Parto)
+def parto_por_guardar(sender, instance, **kwargs):
+    _completar_inicial(sender, instance, CAMPOS_PARTO)
+
+
+@receiver(post_save, sender=Parto)
+def parto_guardado(sender, instance, created, **kwargs):
+    antes = None if created else instance._resumen_inicial
+    despues = _valores_guardados(sender, instance, CAMPOS_PARTO)
+    aplicar(_aportes_parto(antes), _aportes_parto(despues))
+    if antes is not None and antes[1:] != despues[1:]:
+        invalidar_estadia()
+
+    # Los recién nacidos se cuentan en el día de su parto: si el día cambió,
+    # sus aportes se mueven al nuevo día
+    if antes is not None and fecha_local(antes[0]) != fecha_local(despues[0]):
+        for datos in instance.recien_nacidos.values_list(*CAMPOS_RN[1:]):
+            aplicar(
+                aportes_recien_nacido(fecha_local(antes[0]), *datos),
+                aportes_recien_nacido(fecha_local(despues[0]), *datos),
+            )
+    instance._resumen_inicial = despues
+
+
+@receiver(post_delete, sender=Parto)
+def parto_eliminado(sender, instance, **kwargs):
+    aplicar(_aportes_parto(_valores(instance, CAMPOS_PARTO)), [])
+
+
+# ==========================================
+# RECIÉN NACIDOS
+# ==========================================
+
+@receiver(post_init, sender=RecienNacido)
+def rn_cargado(sender, instance, **kwargs):
+    _recordar(instance, CAMPOS_RN)
+
+
+@receiver(pre_save, sender=RecienNacido)
+def rn_por_guardar(sender, instance, **kwargs):
+    _completar_inicial(sender, instance, CAMPOS_RN)
+
+
+@receiver(post_save, sender=RecienNacido)
+def rn_guardado(sender, instance, created, **kwargs):
+    antes = None if created else instance._resumen_inicial
+    despues = _valores_guardados(sender, instance, CAMPOS_RN)
+    if antes != despues:
+        aplicar(_aportes_rn(instance, antes), _aportes_rn(instance, despues))
+    instance._resumen_inicial = despues
+
+
+@receiver(post_delete, sender=RecienNacido)
+def rn_eliminado(sender, instance, **kwargs):
+    aplicar(_aportes_rn(instance, _valores(instance, CAMPOS_RN)), [])
+
+
+# ==========================================
+# ALTAS
+# ==========================================
+
+@receiver(post_init, sender=Alta)
+def alta_cargada(sender, instance, **kwargs):
+    _recordar(instance, CAMPOS_ALTA)
+
+
+@receiver(pre_save, sender=Alta)
+def alta_por_guardar(sender, instance, **kwargs):
+    _completar_inicial(sender, instance, CAMPOS_ALTA)
+
+
+@receiver(post_save, sender=Alta)
+def alta_guardada(sender, instance, created, **kwargs):
+    antes = None if created else instance._resumen_inicial
+    despues = _valores_guardados(sender, instance, CAMPOS_ALTA)
+    aplicar(_aportes_alta(antes), _aportes_alta(despues))
+    if _completada(antes) != _completada(despues):
+        invalidar_estadia()
+    instance._resumen_inicial = despues
+
+
+@receiver(transicion_en_lote, sender=Alta)
+def altas_transicionadas(sender, desde, hacia, filas, **kwargs):
+    """Un solo ajuste de los resúmenes para todo el lote"""
+    antes, despues = [], []
+    for fecha_creacion, _, _ in filas:
+        antes += _aportes_alta((fecha_creacion, desde))
+        despues += _aportes_alta((fecha_creacion, hacia))
+    aplicar(antes, despues)
+    if filas and (desde == 'completada') != (hacia == 'completada'):
+        invalidar_estadia()
+
+
+@receiver(post_delete, sender=Alta)
+def alta_eliminada(sender, instance, **kwargs):
+    valores = _valores(instance, CAMPOS_ALTA)
+    aplicar(_aportes_alta(valores), [])
+    if valores is None or _completada(valores):
+        invalidar_estadia()
@@ -1,5 +1,12 @@
 # reportes/urls.py
 from django.urls import path
+from . import views
 
 app_name = 'reportes'
-urlpatterns = []
\ No newline at end of file
+urlpatterns = [
+    path('', views.panel_reportes, name='panel'),
+    path('neonatal/', views.estadisticas_neonatales, name='neonatal'),
+    path('neonatal/json/', views.estadisticas_neonatales_json, name='neonatal_json'),
+    path('estadia/', views.estadia_hospitalaria, name='estadia'),
+    path('estadia/json/', views.estadia_hospitalaria_json, name='estadia_json'),
+]
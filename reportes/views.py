@@ -1,3 +1,232 @@
+# reportes/views.py
 from django.shortcuts import render
+from django.contrib.auth.decorators import login_required
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import JsonResponse
+from django.db.models import F, Sum
+from django.db.models.functions import TruncMonth
 
-# Create your views here.
+from altas.models import Alta
+from partos.models import Parto
+from recien_nacidos.models import RecienNacido
+from altas.contadores import madres_hospitalizadas
+from usuarios.decorators import rol_requerido
+from .forms import PeriodoReporteForm
+from .models import ResumenDiario
+from . import neonatal
+from .estadia import estadia
+
+# Desde este número de días la serie de partos se agrupa por mes
+DIAS_SERIE_DIARIA = 62
+
+# Secciones del reporte: (métrica, título, etiquetas de sus valores)
+SECCIONES = [
+    ('partos_tipo', 'Partos por tipo', dict(Parto.TIPO_PARTO)),
+    ('partos_complicaciones', 'Partos con complicaciones', {'si': 'Con complicaciones', 'no': 'Sin complicaciones'}),
+    ('rn_sexo', 'Recién nacidos por sexo', dict(RecienNacido.SEXO)),
+    ('rn_condicion', 'Condición al nacer', dict(RecienNacido.CONDICION_NACIMIENTO)),
+    ('rn_derivacion', 'Derivaciones por servicio', {}),
+    ('altas_estado', 'Altas por estado', dict(Alta.ESTADO_ALTA)),
+]
+
+
+def _serie_partos(resumenes, por_mes):
+    """Filas (periodo, {tipo: cantidad}) de partos por tipo, por día o por mes"""
+    periodo = TruncMonth('fecha') if por_mes else F('fecha')
+    filas = (
+        resumenes.filter(metrica='partos_tipo')
+        .annotate(periodo=periodo)
+        .values('periodo', 'valor')
+        .annotate(total=Sum('cantidad'))
+        .order_by('periodo', 'valor')
+    )
+    serie = {}
+    for fila in filas:
+        serie.setdefault(fila['periodo'], {})[fila['valor']] = fila['total']
+    return list(serie.items())
+
+
+# ==========================================
+# PANEL DE REPORTES (SUPERVISOR)
+# ==========================================
+
+@login_required
+@rol_requerido('supervisor')
+def panel_reportes(request):
+    """
+    Totales del periodo por métrica y serie de partos por tipo.
+    Lee solo de ResumenDiario (una fila por día, métrica y valor): un
+    reporte mensual o anual no recorre los partos ni los nacimientos.
+    """
+    form = PeriodoReporteForm(request.GET or None)
+    desde, hasta = form.periodo()
+    resumenes = ResumenDiario.objects.filter(fecha__range=(desde, hasta))
+
+    totales = {}
+    filas = (
+        resumenes.values('metrica', 'valor')
+        .annotate(total=Sum('cantidad'))
+        .order_by('metrica', '-total', 'valor')
+    )
+    for fila in filas:
+        if fila['total']:
+            totales.setdefault(fila['metrica'], []).append((fila['valor'], fila['total']))
+
+    secciones = []
+    for metrica, titulo, etiquetas in SECCIONES:
+        filas_seccion = [(etiquetas.get(valor, valor), total) for valor, total in totales.get(metrica, [])]
+        secciones.append({
+            'titulo': titulo,
+            'filas': filas_seccion,
+            'total': sum(total for _, total in filas_seccion),
+        })
+
+    por_mes = (hasta - desde).days >= DIAS_SERIE_DIARIA
+    tipos = Parto.TIPO_PARTO
+    serie = [
+        (periodo, [cantidades.get(tipo, 0) for tipo, _ in tipos])
+        for periodo, cantidades in _serie_partos(resumenes, por_mes)
+    ]
+
+    context = {
+        'form': form,
+        'desde': desde,
+        'hasta': hasta,
+        'secciones': secciones,
+        'tipos': [nombre for _, nombre in tipos],
+        'serie': serie,
+        'por_mes': por_mes,
+    }
+
+    return render(request, 'reportes/panel.html', context)
+
+
+# ==========================================
+# ESTADÍSTICAS NEONATALES (SUPERVISOR)
+# ==========================================
+
+TASAS_NEONATALES = [
+    ('tasa_apgar_1_bajo', 'APGAR 1 min < 7'),
+    ('tasa_apgar_5_bajo', 'APGAR 5 min < 7'),
+    ('tasa_apgar_critico', 'APGAR crítico'),
+    ('tasa_bajo_peso', 'Peso < 2,5 kg'),
+    ('tasa_sobre_peso', 'Peso > 4,0 kg'),
+    ('tasa_peso_inadecuado', 'Peso no adecuado'),
+]
+
+
+def _fila_neonatal(etiqueta, resumen):
+    """Resumen con las tasas en porcentaje, para la plantilla"""
+    return {
+        'etiqueta': etiqueta,
+        'resumen': resumen,
+        'tasas': [
+            None if resumen[clave] is None else round(resumen[clave] * 100, 1)
+            for clave, _ in TASAS_NEONATALES
+        ],
+    }
+
+
+def _barras(histograma):
+    """Tramos del histograma con el ancho relativo de cada barra (0 a 100)"""
+    maximo = max((cantidad for _, _, cantidad in histograma), default=0) or 1
+    return [(desde, hasta, cantidad, round(cantidad * 100 / maximo)) for desde, hasta, cantidad in histograma]
+
+
+@login_required
+@rol_requerido('supervisor')
+def estadisticas_neonatales(request):
+    """
+    Distribución de peso y talla, tasas de APGAR bajo y de peso fuera de
+    rango, en total, por sexo y por tipo de parto.
+    """
+    form = PeriodoReporteForm(request.GET or None)
+    desde, hasta = form.periodo()
+    estadisticas = neonatal.estadisticas_neonatales(desde, hasta)
+    general = estadisticas['general']
+
+    filas = [_fila_neonatal('Total', general)]
+    for grupo, columna in (('por_sexo', 'sexo'), ('por_tipo_parto', 'tipo')):
+        for valor, resumen in estadisticas[grupo].items():
+            filas.append(_fila_neonatal(neonatal.ETIQUETAS[columna].get(valor, valor), resumen))
+
+    context = {
+        'form': form,
+        'desde': desde,
+        'hasta': hasta,
+        'general': general,
+        'filas': filas,
+        'tasas': [titulo for _, titulo in TASAS_NEONATALES],
+        'histograma_peso': _barras(general['histograma_peso']),
+        'histograma_talla': _barras(general['histograma_talla']),
+    }
+
+    return render(request, 'reportes/neonatal.html', context)
+
+
+@login_required
+@rol_requerido('supervisor')
+def estadisticas_neonatales_json(request):
+    """Las mismas estadísticas en JSON (tasas entre 0 y 1)"""
+    form = PeriodoReporteForm(request.GET or None)
+    desde, hasta = form.periodo()
+    return JsonResponse(neonatal.estadisticas_neonatales(desde, hasta), encoder=DjangoJSONEncoder)
+
+
+# ==========================================
+# DÍAS DE ESTADÍA Y CENSO (SUPERVISOR)
+# ==========================================
+
+COMPLICACIONES = {'si': 'Con complicaciones', 'no': 'Sin complicaciones'}
+
+
+def _etiqueta_estadia(clave):
+    """'cesarea:si' -> 'Cesárea, con complicaciones'"""
+    tipo, _, complicaciones = clave.partition(':')
+    etiqueta = dict(Parto.TIPO_PARTO).get(tipo, tipo)
+    if complicaciones:
+        etiqueta = f'{etiqueta}, {COMPLICACIONES[complicaciones].lower()}'
+    return etiqueta
+
+
+@login_required
+@rol_requerido('supervisor')
+def estadia_hospitalaria(request):
+    """
+    Mediana, p90 y p99 de la estadía (ingreso a alta completada) por tipo de
+    parto y complicaciones, y censo actual de madres hospitalizadas.
+    """
+    form = PeriodoReporteForm(request.GET or None)
+    desde, hasta = form.periodo()
+    resultado = estadia(desde, hasta)
+
+    grupos = [('Total', [('Todas las altas', resultado['general'])])]
+    grupos.append(('Por tipo de parto', [
+        (_etiqueta_estadia(clave), resumen) for clave, resumen in resultado['por_tipo_parto'].items()
+    ]))
+    grupos.append(('Por complicaciones', [
+        (COMPLICACIONES[clave], resumen) for clave, resumen in resultado['por_complicaciones'].items()
+    ]))
+    grupos.append(('Por tipo de parto y complicaciones', [
+        (_etiqueta_estadia(clave), resumen) for clave, resumen in resultado['por_tipo_y_complicaciones'].items()
+    ]))
+
+    context = {
+        'form': form,
+        'desde': desde,
+        'hasta': hasta,
+        'grupos': grupos,
+        'hospitalizadas': madres_hospitalizadas(),
+    }
+
+    return render(request, 'reportes/estadia.html', context)
+
+
+@login_required
+@rol_requerido('supervisor')
+def estadia_hospitalaria_json(request):
+    """Las mismas estadías (en horas) y el censo en JSON"""
+    form = PeriodoReporteForm(request.GET or None)
+    desde, hasta = form.periodo()
+    datos = dict(estadia(desde, hasta), hospitalizadas=madres_hospitalizadas())
+    return JsonResponse(datos, encoder=DjangoJSONEncoder)
@@ -0,0 +1,127 @@
+"""
+Pruebas del autocompletado de madres, partos y recién nacidos.
+"""
+import pytest
+from django.utils import timezone
+from pacientes.models import Madre
+from partos.models import Parto
+from recien_nacidos.models import RecienNacido
+from altas.models import Alta
+from altas.autocompletar import LIMITE_AUTOCOMPLETAR
+from altas.forms import CrearAltaForm, RecienNacidoForm
+from usuarios.validador import calcular_dv
+
+
+def _crear(i, nombre):
+    cuerpo = 10000000 + i
+    madre = Madre.objects.create(rut=f'{cuerpo}-{calcular_dv(cuerpo)}', nombre=nombre, edad=25, direccion='...', telefono='...', controles_prenatales=3)
+    parto = Parto.objects.create(madre=madre, tipo='natural', fecha_hora_inicio=timezone.now(), medico_responsable='...', matrona_responsable='...')
+    rn = RecienNacido.objects.create(parto=parto, sexo='F', peso=3.1, talla=49, apgar_1_min=8, apgar_5_min=9)
+    return madre, parto, rn
+
+
+@pytest.fixture
+def registros():
+    return [_crear(i, f'Madre Soto {i}') for i in range(LIMITE_AUTOCOMPLETAR + 5)]
+
+
+@pytest.fixture
+def usuario(client):
+    from usuarios.models import Usuario
+    usuario = Usuario.objects.create_user(username='administrativo1', rut='5126663-3', password='clave', rol='administrativo')
+    client.force_login(usuario)
+    return usuario
+
+
+@pytest.mark.django_db
+def test_formularios_no_listan_la_tabla(registros, django_assert_max_num_queries):
+    """El select solo trae la opción elegida, sin importar cuántos registros haya."""
+    with django_assert_max_num_queries(0):
+        html = CrearAltaForm().as_p()
+    assert html.count('<option') == 3
+    assert 'data-autocompletar="/altas/autocompletar/partos/"' in html
+
+    _, parto, _ = registros[3]
+    with django_assert_max_num_queries(1):
+        html = str(RecienNacidoForm(initial={'parto': parto.pk})['parto'])
+    assert html.count('<option') == 2
+    assert 'Madre Soto 3' in html
+
+
+@pytest.mark.django_db
+def test_busqueda_por_nombre_rut_y_codigo(client, usuario, registros, django_assert_max_num_queries):
+    madre, parto, rn = registros[7]
+
+    with django_assert_max_num_queries(6):
+        datos = client.get('/altas/autocompletar/madres/', {'q': 'soto'}).json()
+    assert len(datos['resultados']) == LIMITE_AUTOCOMPLETAR
+
+    datos = client.get('/altas/autocompletar/madres/', {'q': madre.rut}).json()
+    assert datos['resultados'] == [{'id': madre.pk, 'texto': str(madre)}]
+
+    with django_assert_max_num_queries(6):
+        datos = client.get('/altas/autocompletar/partos/', {'q': 'soto 7'}).json()
+    assert [r['id'] for r in datos['resultados']] == [parto.pk]
+
+    with django_assert_max_num_queries(6):
+        datos = client.get('/altas/autocompletar/recien-nacidos/', {'q': rn.codigo_unico.lower()}).json()
+    assert datos['resultados'] == [{'id': rn.pk, 'texto': str(rn)}]
+
+    # Textos muy cortos no consultan
+    assert client.get('/altas/autocompletar/madres/', {'q': 's'}).json()['resultados'] == []
+
+
+@pytest.mark.django_db
+def test_sin_alta(client, usuario, registros):
+    madre, parto, rn = registros[0]
+    Alta.objects.create(madre=madre, parto=parto, recien_nacido=rn)
+
+    datos = client.get('/altas/autocompletar/partos/', {'q': madre.rut, 'sin_alta': 1}).json()
+    assert datos['resultados'] == []
+    datos = client.get('/altas/autocompletar/partos/', {'q': madre.rut}).json()
+    assert [r['id'] for r in datos['resultados']] == [parto.pk]
+
+
+@pytest.mark.django_db
+def test_seleccion_encadenada(client, usuario, registros, django_assert_num_queries):
+    """Al elegir la madre llegan solo sus partos sin alta, y al elegir el parto solo sus RN."""
+    madre, parto, rn = registros[2]
+    segundo = Parto.objects.create(madre=madre, tipo='cesarea', fecha_hora_inicio=timezone.now(), medico_responsable='...', matrona_responsable='...')
+    Alta.objects.create(madre=registros[3][0], parto=registros[3][1], recien_nacido=registros[3][2])
+
+    with django_assert_num_queries(3):  # sesión, usuario y partos
+        datos = client.get('/altas/autocompletar/partos/', {'madre': madre.pk, 'sin_alta': 1}).json()
+    assert [r['id'] for r in datos['resultados']] == [segundo.pk, parto.pk]
+
+    datos = client.get('/altas/autocompletar/recien-nacidos/', {'parto': parto.pk, 'sin_alta': 1}).json()
+    assert [r['id'] for r in datos['resultados']] == [rn.pk]
+    assert client.get('/altas/autocompletar/partos/', {'madre': 'x'}).json()['resultados'] == []
+
+    html = CrearAltaForm().as_p()
+    assert 'data-padre="madre"' in html and 'data-padre="parto"' in html
+
+
+@pytest.mark.django_db
+def test_validacion_sin_cargas_perezosas(registros, django_assert_num_queries):
+    madre, parto, rn = registros[4]
+    otra_madre, otro_parto, otro_rn = registros[5]
+
+    form = CrearAltaForm({'madre': madre.pk, 'parto': otro_parto.pk, 'recien_nacido': otro_rn.pk})
+    assert not form.is_valid()
+    assert 'no corresponde a la madre' in str(form.non_field_errors())
+
+    form = CrearAltaForm({'madre': madre.pk, 'parto': parto.pk, 'recien_nacido': otro_rn.pk})
+    assert not form.is_valid()
+    assert 'no corresponde al parto' in str(form.non_field_errors())
+
+    # Una consulta por campo y ninguna más de validación
+    form = CrearAltaForm({'madre': madre.pk, 'parto': parto.pk, 'recien_nacido': rn.pk})
+    with django_assert_num_queries(3):
+        assert form.is_valid()
+
+    # Los registros que ya tienen alta no pasan los querysets de los campos
+    madre, parto, rn = registros[3]
+    Alta.objects.create(madre=madre, parto=parto, recien_nacido=rn)
+    form = CrearAltaForm({'madre': madre.pk, 'parto': parto.pk, 'recien_nacido': rn.pk})
+    assert not form.is_valid()
+    assert set(form.errors) == {'madre', 'parto', 'recien_nacido'}
@@ -0,0 +1,55 @@
+"""
+Pruebas del índice de búsqueda por nombre de madres.
+"""
+import pytest
+from django.core.management import call_command
+from pacientes.models import Madre, TokenNombreMadre
+from pacientes.busqueda import plegar, tokenizar, filtro_nombre, buscar_madres
+
+
+def crear_madre(rut, nombre):
+    return Madre.objects.create(rut=rut, nombre=nombre, edad=30, direccion='...', telefono='...', controles_prenatales=2)
+
+
+def test_plegar_y_tokenizar():
+    """Los acentos y mayúsculas se normalizan."""
+    assert plegar('María Núñez') == 'maria nunez'
+    assert tokenizar('María  González, María') == ['maria', 'gonzalez']
+
+
+@pytest.mark.django_db
+def test_busqueda_por_prefijos():
+    """'gonzalez mar' encuentra a 'María González' y no a otras."""
+    maria = crear_madre('11111111-1', 'María González')
+    crear_madre('22222222-2', 'Marta Pérez')
+    crear_madre('33333333-3', 'Ana González')
+
+    assert list(Madre.objects.filter(filtro_nombre('gonzalez mar'))) == [maria]
+    assert buscar_madres('gonzalez mar') == [maria]
+
+
+@pytest.mark.django_db
+def test_orden_por_relevancia():
+    """Una palabra exacta puntúa más que un prefijo."""
+    mariana = crear_madre('11111111-1', 'Mariana Rojas')
+    mar = crear_madre('22222222-2', 'Mar Rojas')
+    assert buscar_madres('mar rojas') == [mar, mariana]
+
+
+@pytest.mark.django_db
+def test_cambio_de_nombre_reindexa():
+    """Al cambiar el nombre se actualizan los tokens."""
+    madre = crear_madre('11111111-1', 'Ana Soto')
+    madre.nombre = 'Ana Muñoz'
+    madre.save()
+    assert set(madre.tokens_nombre.values_list('token', flat=True)) == {'ana', 'munoz'}
+    assert buscar_madres('soto') == []
+
+
+@pytest.mark.django_db
+def test_comando_indexar():
+    """El comando reconstruye el índice de las madres existentes."""
+    madre = crear_madre('11111111-1', 'Josefa Díaz')
+    TokenNombreMadre.objects.all().delete()
+    call_command('indexar_nombres')
+    assert buscar_madres('diaz') == [madre]
@@ -0,0 +1,223 @@
+"""
+Pruebas del caché de certificados PDF en disco.
+"""
+import io
+import os
+import zipfile
+from datetime import timedelta
+
+import pytest
+from django.core.management import call_command
+from django.utils import timezone
+from pacientes.models import Madre
+from partos.models import Parto
+from recien_nacidos.models import RecienNacido
+from altas import pdf
+from altas.models import Alta
+from altas.trabajos import (
+    PLAZO_CERTIFICADO,
+    procesar_certificado,
+    procesar_certificados,
+    tomar_siguiente_certificado,
+)
+from usuarios.models import Usuario
+
+
+@pytest.fixture
+def alta_completada(client, settings, tmp_path):
+    """Alta completada, con un usuario con sesión iniciada y MEDIA_ROOT y EXPORTACIONES_ROOT temporales."""
+    settings.MEDIA_ROOT = str(tmp_path / 'media')
+    settings.EXPORTACIONES_ROOT = str(tmp_path / 'privado')
+    usuario = Usuario.objects.create_user(username='admin1', rut='5126663-3', password='clave', rol='administrativo')
+    client.force_login(usuario)
+    madre = Madre.objects.create(rut='8000000-4', nombre='Madre Certificado', edad=30, direccion='...', telefono='...', controles_prenatales=5)
+    parto = Parto.objects.create(madre=madre, tipo='natural', fecha_hora_inicio=timezone.now(), medico_responsable='...', matrona_responsable='...')
+    rn = RecienNacido.objects.create(parto=parto, sexo='M', peso=3.4, talla=50, apgar_1_min=8, apgar_5_min=9)
+    alta = Alta.objects.create(madre=madre, parto=parto, recien_nacido=rn, estado='completada', fecha_alta=timezone.now())
+    return alta
+
+
+@pytest.fixture
+def dibujos(monkeypatch):
+    """Cuenta cuántas veces se dibuja un PDF."""
+    llamadas = []
+    original = pdf.dibujar_certificado
+
+    def contar(datos, destino):
+        llamadas.append(datos)
+        original(datos, destino)
+
+    monkeypatch.setattr(pdf, 'dibujar_certificado', contar)
+    return llamadas
+
+
+@pytest.mark.django_db
+def test_segunda_descarga_lee_el_archivo(client, alta_completada, dibujos, settings):
+    """El PDF se dibuja una vez; las descargas siguientes leen el archivo guardado."""
+    url = f'/altas/certificado/{alta_completada.pk}/'
+    primera = client.get(url)
+    segunda = client.get(url)
+    assert b''.join(primera.streaming_content).startswith(b'%PDF')
+    assert len(dibujos) == 1
+    assert primera['ETag'] == segunda['ETag']
+
+    alta_completada.refresh_from_db()
+    assert alta_completada.certificado_generado
+    # Fuera de MEDIA_ROOT: el PDF solo se obtiene desde la vista, que revisa permisos
+    assert os.path.exists(os.path.join(settings.EXPORTACIONES_ROOT, alta_completada.ruta_certificado))
+    assert not os.path.exists(settings.MEDIA_ROOT)
+
+
+@pytest.mark.django_db
+def test_revalidacion_responde_304(client, alta_completada, dibujos):
+    """Con la ETag vigente se responde 304 sin cuerpo."""
+    url = f'/altas/certificado/{alta_completada.pk}/'
+    etag = client.get(url)['ETag']
+    respuesta = client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert respuesta.status_code == 304
+    assert len(dibujos) == 1
+
+
+@pytest.mark.django_db
+def test_cambio_de_datos_regenera(client, alta_completada, dibujos, settings):
+    """Si cambia un dato impreso, se dibuja un PDF nuevo y se borra el anterior."""
+    url = f'/altas/certificado/{alta_completada.pk}/'
+    etag = client.get(url)['ETag']
+    alta_completada.refresh_from_db()
+    anterior = os.path.join(settings.EXPORTACIONES_ROOT, alta_completada.ruta_certificado)
+
+    madre = alta_completada.madre
+    madre.telefono = '+56 9 8765 4321'
+    madre.save()
+    respuesta = client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+    assert respuesta.status_code == 200
+    assert respuesta['ETag'] != etag
+    assert len(dibujos) == 2
+    assert not os.path.exists(anterior)
+
+
+@pytest.mark.django_db
+def test_confirmacion_encola_el_certificado(client, alta_completada, dibujos, django_capture_on_commit_callbacks):
+    """Confirmar el alta administrativa no dibuja el PDF; lo hace el trabajador."""
+    Alta.objects.filter(pk=alta_completada.pk).update(
+        estado='alta_clinica', alta_clinica_confirmada=True, registros_completos=True
+    )
+    with django_capture_on_commit_callbacks(execute=True):
+        respuesta = client.post(
+            f'/altas/confirmar-administrativa/{alta_completada.pk}/',
+            {'confirmar_alta_administrativa': 'on', 'administrativo_nombre': 'Ana Pérez'},
+        )
+    assert respuesta.status_code == 302
+    alta_completada.refresh_from_db()
+    assert alta_completada.esta_completada()
+    assert alta_completada.estado_certificado == 'pendiente'
+    assert dibujos == []
+
+    call_command('procesar_certificados', '--una-vez')
+    alta_completada.refresh_from_db()
+    assert alta_completada.estado_certificado == 'generado'
+    assert alta_completada.certificado_generado
+    assert len(dibujos) == 1
+
+
+@pytest.mark.django_db
+def test_descarga_marca_el_certificado_generado(client, alta_completada):
+    """El PDF generado al descargar deja de estar pendiente en la cola."""
+    Alta.objects.filter(pk=alta_completada.pk).update(estado_certificado='pendiente')
+    client.get(f'/altas/certificado/{alta_completada.pk}/')
+    alta_completada.refresh_from_db()
+    assert alta_completada.estado_certificado == 'generado'
+    assert procesar_certificados() == 0
+
+
+@pytest.mark.django_db
+def test_certificado_abandonado_se_retoma(alta_completada, dibujos):
+    """Un certificado tomado por un trabajador que se cayó vuelve a tomarse tras el plazo."""
+    Alta.objects.filter(pk=alta_completada.pk).update(
+        estado_certificado='pendiente', fecha_solicitud_certificado=timezone.now()
+    )
+    abandonada = tomar_siguiente_certificado()
+    assert abandonada.pk == alta_completada.pk
+    assert tomar_siguiente_certificado() is None
+
+    Alta.objects.filter(pk=alta_completada.pk).update(
+        fecha_toma_certificado=timezone.now() - PLAZO_CERTIFICADO - timedelta(seconds=1)
+    )
+    retomada = tomar_siguiente_certificado()
+    assert retomada.pk == alta_completada.pk
+    procesar_certificado(retomada)
+
+    # El trabajador caído ya no puede cambiar el resultado
+    Alta.objects.filter(pk=alta_completada.pk).update(estado_certificado='en_proceso')
+    procesar_certificado(abandonada)
+    alta_completada.refresh_from_db()
+    assert alta_completada.estado_certificado == 'en_proceso'
+    assert len(dibujos) == 1
+
+
+@pytest.fixture
+def altas_del_dia(alta_completada):
+    """Tres altas completadas hoy (incluida la del fixture alta_completada)."""
+    altas = [alta_completada]
+    for i in range(1, 3):
+        madre = Madre.objects.create(rut=f'800000{i}-{i}', nombre=f'Madre Lote {i}', edad=28, direccion='...', telefono='...', controles_prenatales=4)
+        parto = Parto.objects.create(madre=madre, tipo='cesarea', fecha_hora_inicio=timezone.now(), medico_responsable='...', matrona_responsable='...')
+        rn = RecienNacido.objects.create(parto=parto, sexo='F', peso=3.0, talla=48, apgar_1_min=8, apgar_5_min=9)
+        altas.append(Alta.objects.create(madre=madre, parto=parto, recien_nacido=rn, estado='completada', fecha_alta=timezone.now()))
+    return altas
+
+
+@pytest.mark.django_db
+def test_lote_en_zip(client, altas_del_dia):
+    """El ZIP del día trae un PDF por alta, incluidos los que ya estaban en disco."""
+    client.get(f'/altas/certificado/{altas_del_dia[0].pk}/')
+
+    respuesta = client.get('/altas/certificados/lote/')
+    assert respuesta['Content-Type'] == 'application/zip'
+    with zipfile.ZipFile(io.BytesIO(b''.join(respuesta.streaming_content))) as archivo_zip:
+        nombres = archivo_zip.namelist()
+        assert all(archivo_zip.read(nombre).startswith(b'%PDF') for nombre in nombres)
+    assert sorted(nombres) == sorted(f'certificado_alta_{a.madre.rut}_{a.pk}.pdf' for a in altas_del_dia)
+    assert Alta.objects.filter(certificado_generado=True).count() == 3
+
+
+@pytest.mark.django_db
+def test_lote_con_certificado_fallido(client, altas_del_dia, monkeypatch):
+    """Si un PDF no se puede dibujar, el ZIP trae un archivo de error y sigue con el resto."""
+    original = pdf.dibujar_certificado
+
+    def dibujar(datos, destino):
+        if 'Madre Lote 1' in str(datos):
+            raise ValueError('fuente no disponible')
+        original(datos, destino)
+
+    monkeypatch.setattr(pdf, 'dibujar_certificado', dibujar)
+    respuesta = client.get('/altas/certificados/lote/')
+    with zipfile.ZipFile(io.BytesIO(b''.join(respuesta.streaming_content))) as archivo_zip:
+        nombres = archivo_zip.namelist()
+        fallida = altas_del_dia[1]
+        error = f'ERROR_certificado_alta_{fallida.madre.rut}_{fallida.pk}.txt'
+        assert 'fuente no disponible' in archivo_zip.read(error).decode()
+    assert len(nombres) == 3
+    assert not Alta.objects.get(pk=fallida.pk).certificado_generado
+
+
+@pytest.mark.django_db
+def test_comando_lote(altas_del_dia, tmp_path):
+    """El comando escribe el mismo ZIP en disco."""
+    salida = tmp_path / 'lote.zip'
+    hoy = timezone.localdate().isoformat()
+    call_command('generar_certificados', str(salida), '--desde', hoy, '--procesos', '2')
+    with zipfile.ZipFile(salida) as archivo_zip:
+        assert len(archivo_zip.namelist()) == 3
+
+
+def test_plantilla_compartida():
+    """La plantilla se arma una vez por proceso y sirve para dibujos sucesivos."""
+    from altas.management.commands.medir_certificados import DATOS_EJEMPLO
+    assert pdf.plantilla() is pdf.plantilla()
+    for _ in range(2):
+        destino = io.BytesIO()
+        pdf.dibujar_certificado(DATOS_EJEMPLO, destino)
+        assert destino.getvalue().startswith(b'%PDF')
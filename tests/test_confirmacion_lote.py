@@ -0,0 +1,118 @@
+"""
+Pruebas de la confirmación en lote de altas clínicas y administrativas.
+"""
+from collections import Counter
+from datetime import date
+
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from pacientes.models import Madre
+from partos.models import Parto
+from recien_nacidos.models import RecienNacido
+from altas.models import Alta, ContadorPanel
+from altas.confirmaciones import confirmar_clinica_lote, confirmar_administrativa_lote
+from altas.contadores import madres_hospitalizadas, pendientes_administrativa, pendientes_clinica
+from reportes.models import ResumenDiario
+from reportes.resumenes import calcular
+
+DESDE, HASTA = date(2000, 1, 1), date(2100, 1, 1)
+
+
+def _crear_alta(i, completa=True):
+    madre = Madre.objects.create(rut=f'8000000{i}-{i}', nombre=f'Madre {i}', edad=25, direccion='...', telefono='...', controles_prenatales=3)
+    parto = Parto.objects.create(
+        madre=madre, tipo='natural', fecha_hora_inicio=timezone.now(),
+        fecha_hora_termino=timezone.now() if completa else None,
+        medico_responsable='...', matrona_responsable='...',
+    )
+    rn = RecienNacido.objects.create(parto=parto, sexo='F', peso=3.1, talla=49, apgar_1_min=8, apgar_5_min=9)
+    alta = Alta.objects.create(madre=madre, parto=parto, recien_nacido=rn)
+    alta.validar_registros()
+    return alta
+
+
+@pytest.fixture
+def altas():
+    cache.clear()
+    return [_crear_alta(i) for i in range(4)] + [_crear_alta(4, completa=False)]
+
+
+def _sobre_alta(consultas):
+    return [c['sql'].split()[0] for c in consultas if '"altas_alta"' in c['sql']]
+
+
+@pytest.mark.django_db
+def test_resultados_por_alta_en_una_lectura_y_una_escritura(altas, django_capture_on_commit_callbacks):
+    ids = [alta.pk for alta in altas] + [999999]
+    assert (pendientes_clinica(), madres_hospitalizadas()) == (4, 5)
+
+    with CaptureQueriesContext(connection) as consultas, django_capture_on_commit_callbacks(execute=True):
+        resultados, confirmados = confirmar_clinica_lote(ids + [str(altas[0].pk), 'x'], 'Dr. Soto', 'Ronda')
+    assert _sobre_alta(consultas) == ['SELECT', 'UPDATE']
+
+    assert confirmados == ids[:4]
+    assert [r['id'] for r in resultados] == ids
+    assert [r['confirmada'] for r in resultados] == [True] * 4 + [False, False]
+    assert resultados[4]['mensaje'] == 'Registros incompletos'
+    assert resultados[5]['mensaje'] == 'El alta no existe'
+
+    # Una segunda confirmación ya no las admite
+    resultados, confirmados = confirmar_clinica_lote(ids[:2], 'Dra. Rojas')
+    assert confirmados == []
+    assert resultados[0]['mensaje'] == 'El alta clínica ya estaba confirmada'
+
+    alta = Alta.objects.get(pk=altas[0].pk)
+    assert (alta.estado, alta.medico_confirma) == ('alta_clinica', 'Dr. Soto')
+    assert alta.observaciones.endswith('[Alta Clínica] Ronda')
+
+    with django_capture_on_commit_callbacks(execute=True):
+        resultados, confirmados = confirmar_administrativa_lote(ids, 'Sra. Pérez')
+    assert confirmados == ids[:4]
+    assert resultados[4]['mensaje'] == 'Debe confirmarse primero el alta clínica'
+    assert Alta.objects.filter(estado='completada', fecha_alta__isnull=False).count() == 4
+
+    # Contadores del panel y resúmenes diarios quedan como al recontar
+    assert (pendientes_clinica(), pendientes_administrativa(), madres_hospitalizadas()) == (0, 0, 1)
+    ContadorPanel.objects.update(valor=None)
+    assert (pendientes_clinica(), pendientes_administrativa(), madres_hospitalizadas()) == (0, 0, 1)
+    guardados = Counter({
+        (r.fecha, r.metrica, r.valor): r.cantidad for r in ResumenDiario.objects.all() if r.cantidad
+    })
+    assert guardados == calcular(DESDE, HASTA)
+
+
+@pytest.mark.django_db
+def test_vistas_de_lote(client, altas, django_capture_on_commit_callbacks):
+    from usuarios.models import Usuario
+    medico = Usuario.objects.create_user(username='medico1', rut='5126663-3', password='clave', rol='medico')
+    client.force_login(medico)
+
+    respuesta = client.get('/altas/confirmar-clinica/lote/')
+    assert respuesta.status_code == 200
+    assert len(respuesta.context['altas']) == 4
+
+    respuesta = client.post('/altas/confirmar-clinica/lote/', {
+        'altas': [altas[0].pk, altas[1].pk, altas[4].pk],
+        'confirmar_alta_clinica': 'on',
+        'medico_nombre': 'Dr. Soto',
+    })
+    assert [r['confirmada'] for r in respuesta.context['resultados']] == [True, True, False]
+    assert len(respuesta.context['altas']) == 2
+
+    # Solo el rol administrativo confirma el cierre
+    assert client.get('/altas/confirmar-administrativa/lote/').status_code == 302
+
+    administrativo = Usuario.objects.create_user(username='admin1', rut='11111111-1', password='clave', rol='administrativo')
+    client.force_login(administrativo)
+    with django_capture_on_commit_callbacks(execute=True):
+        respuesta = client.post('/altas/confirmar-administrativa/lote/', {
+            'altas': [altas[0].pk, altas[1].pk],
+            'confirmar_alta_administrativa': 'on',
+            'administrativo_nombre': 'Sra. Pérez',
+        })
+    assert all(r['confirmada'] for r in respuesta.context['resultados'])
+    # Los certificados de las altas completadas quedan en cola
+    assert Alta.objects.filter(estado_certificado='pendiente').count() == 2
@@ -0,0 +1,182 @@
+"""
+Pruebas de los contadores de altas y del panel principal.
+"""
+import pytest
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from pacientes.models import Madre
+from partos.models import Parto
+from recien_nacidos.models import RecienNacido
+from altas.models import Alta, ContadorPanel
+from altas import contadores
+from altas.confirmaciones import confirmar_clinica_lote
+from altas.contadores import contar_por_estado
+
+
+@pytest.fixture
+def altas_creadas():
+    """Crea tres altas pendientes y vacía la caché."""
+    cache.clear()
+    altas = []
+    for i in range(3):
+        madre = Madre.objects.create(rut=f'3000000{i}-{i}', nombre=f'Madre {i}', edad=25, direccion='...', telefono='...', controles_prenatales=3)
+        parto = Parto.objects.create(madre=madre, tipo='natural', fecha_hora_inicio=timezone.now(), medico_responsable='...', matrona_responsable='...')
+        rn = RecienNacido.objects.create(parto=parto, sexo='F', peso=3.1, talla=49, apgar_1_min=8, apgar_5_min=9)
+        altas.append(Alta.objects.create(madre=madre, parto=parto, recien_nacido=rn))
+    return altas
+
+
+def _sobre_altas(capturadas):
+    return [q['sql'] for q in capturadas.captured_queries if '"altas_alta"' in q['sql']]
+
+
+@pytest.mark.django_db
+def test_conteo_en_una_consulta_y_cacheado(altas_creadas):
+    """Todos los estados se cuentan con un solo agregado y luego se leen de caché."""
+    with CaptureQueriesContext(connection) as capturadas:
+        contadores = contar_por_estado(Alta.objects.all())
+    assert len(_sobre_altas(capturadas)) == 1
+    assert contadores['total'] == 3
+    assert contadores['pendiente'] == 3
+    assert contadores['completada'] == 0
+
+    with CaptureQueriesContext(connection) as capturadas:
+        contar_por_estado(Alta.objects.all())
+    assert _sobre_altas(capturadas) == []
+
+
+@pytest.mark.django_db
+def test_cambio_de_estado_invalida(altas_creadas, django_capture_on_commit_callbacks):
+    """Cambiar el estado de un alta descarta los contadores cacheados al confirmarse."""
+    contar_por_estado(Alta.objects.all())
+    alta = altas_creadas[0]
+    alta.estado = 'completada'
+    with django_capture_on_commit_callbacks(execute=True):
+        alta.save()
+
+    contadores = contar_por_estado(Alta.objects.all())
+    assert contadores['pendiente'] == 2
+    assert contadores['completada'] == 1
+
+
+@pytest.mark.django_db
+def test_clave_por_filtros(altas_creadas):
+    """Cada combinación de filtros tiene su propia entrada en caché."""
+    todas = contar_por_estado(Alta.objects.all(), {})
+    una = contar_por_estado(Alta.objects.filter(pk=altas_creadas[0].pk), {'buscar': 'Madre 0'})
+    assert todas['total'] == 3
+    assert una['total'] == 1
+
+
+def _validar(altas):
+    """Completa los partos y valida las altas (quedan pendientes de alta clínica)."""
+    for alta in altas:
+        alta.parto.fecha_hora_termino = timezone.now()
+        alta.parto.save()
+        alta.validar_registros()
+
+
+@pytest.fixture
+def medico(client):
+    from usuarios.models import Usuario
+    usuario = Usuario.objects.create_user(username='medico1', rut='5126663-3', password='clave', rol='medico')
+    client.force_login(usuario)
+    return usuario
+
+
+@pytest.mark.django_db
+def test_panel_sin_agregados(client, medico, altas_creadas, django_assert_max_num_queries):
+    """Tras la primera carga, el panel se arma sin ningún COUNT."""
+    _validar(altas_creadas)
+    assert client.get('/').context['pendientes_clinica'] == 3
+
+    with django_assert_max_num_queries(10) as capturadas:
+        respuesta = client.get('/')
+    assert respuesta.context['pendientes_clinica'] == 3
+    assert not any('COUNT(' in q['sql'].upper() for q in capturadas.captured_queries)
+
+
+@pytest.mark.django_db
+def test_panel_se_ajusta_con_senales(altas_creadas, django_capture_on_commit_callbacks):
+    """Confirmar un alta clínica mueve el contador de un panel al otro sin recalcular."""
+    _validar(altas_creadas)
+    assert contadores.pendientes_clinica() == 3
+    assert contadores.pendientes_administrativa() == 0
+
+    with django_capture_on_commit_callbacks(execute=True):
+        altas_creadas[0].confirmar_alta_clinica('Dr. Soto')
+        altas_creadas[1].delete()
+    with CaptureQueriesContext(connection) as capturadas:
+        assert contadores.pendientes_clinica() == 1
+        assert contadores.pendientes_administrativa() == 1
+    assert len(capturadas) == 2
+    assert not any('COUNT(' in q['sql'].upper() for q in capturadas.captured_queries)
+    assert Alta.objects.pendientes_clinica().count() == 1
+
+
+@pytest.mark.django_db
+def test_panel_no_cambia_si_la_transaccion_se_revierte(altas_creadas, django_capture_on_commit_callbacks):
+    """Si la transacción se revierte, sus ajustes se revierten con ella."""
+    _validar(altas_creadas)
+    assert contadores.pendientes_clinica() == 3
+
+    with django_capture_on_commit_callbacks(execute=True):
+        with transaction.atomic():
+            confirmar_clinica_lote([alta.pk for alta in altas_creadas], 'Dr. Soto')
+            transaction.set_rollback(True)
+    assert contadores.pendientes_clinica() == 3
+    assert Alta.objects.pendientes_clinica().count() == 3
+
+
+@pytest.mark.django_db
+def test_ajuste_en_la_transaccion_del_cambio(altas_creadas):
+    """
+    El ajuste queda hecho antes de confirmarse el cambio: un recuento que ya
+    ve el cambio confirmado no recibe después su ajuste (no cuenta dos veces).
+    """
+    _validar(altas_creadas)
+    assert contadores.pendientes_clinica() == 3
+
+    with transaction.atomic():
+        altas_creadas[0].confirmar_alta_clinica('Dr. Soto')
+        assert ContadorPanel.objects.get(nombre='pendientes_clinica').valor == 2
+    assert contadores._recontar('pendientes_clinica', Alta.objects.pendientes_clinica().count) == 2
+    assert ContadorPanel.objects.get(nombre='pendientes_clinica').valor == 2
+
+    # Un guardado suelto (fuera de atomic) también ajusta dentro de su transacción
+    madre = Madre.objects.create(rut='3000008-8', nombre='Madre 8', edad=25, direccion='...', telefono='...', controles_prenatales=3)
+    assert contadores.madres_hospitalizadas() == Madre.objects.exclude(alta__estado='completada').count()
+    with transaction.atomic():
+        madre.delete()
+        transaction.set_rollback(True)
+    assert contadores.madres_hospitalizadas() == Madre.objects.exclude(alta__estado='completada').count()
+
+
+@pytest.mark.django_db
+def test_contador_sin_recontar_no_se_ajusta(altas_creadas):
+    """Un contador marcado para recontar (valor=None) no recibe ajustes."""
+    _validar(altas_creadas)
+    assert contadores.pendientes_clinica() == 3
+    ContadorPanel.objects.update(valor=None)
+
+    altas_creadas[0].confirmar_alta_clinica('Dr. Soto')
+    assert ContadorPanel.objects.get(nombre='pendientes_clinica').valor is None
+    assert contadores.pendientes_clinica() == 2
+
+
+@pytest.mark.django_db
+def test_registros_hoy_por_matrona(altas_creadas, django_capture_on_commit_callbacks):
+    """Cada parto nuevo suma a los registros del día de quien lo creó."""
+    from usuarios.models import Usuario
+    matrona = Usuario.objects.create_user(username='matrona1', rut='5126663-3', password='clave', rol='matrona')
+    assert contadores.registros_hoy(matrona) == 0
+
+    madre = Madre.objects.create(rut='3000009-9', nombre='Madre 9', edad=25, direccion='...', telefono='...', controles_prenatales=3)
+    with django_capture_on_commit_callbacks(execute=True):
+        parto = Parto.objects.create(madre=madre, tipo='natural', fecha_hora_inicio=timezone.now(), medico_responsable='...', matrona_responsable='...', creado_por=matrona)
+    assert contadores.registros_hoy(matrona) == 1
+    with django_capture_on_commit_callbacks(execute=True):
+        parto.delete()
+    assert contadores.registros_hoy(matrona) == 0
@@ -0,0 +1,145 @@
+"""
+Pruebas de las descargas por partes bajo ASGI (altas/respuestas.py).
+"""
+import asyncio
+import io
+import warnings
+import zipfile
+
+import openpyxl
+import pytest
+from asgiref.sync import async_to_sync
+from django.conf import settings
+from django.core.handlers.asgi import ASGIHandler
+from django.core.management import call_command
+from django.core.signals import request_started
+from django.db import close_old_connections
+from django.utils import timezone
+from pacientes.models import Madre
+from partos.models import Parto
+from recien_nacidos.models import RecienNacido
+from altas.models import Alta, TrabajoExportacion
+from altas.trabajos import encolar_exportacion
+from usuarios.models import Usuario
+
+
+def _get_asgi(client, ruta):
+    """GET a 'ruta' a través de ASGIHandler, como un servidor ASGI; retorna los mensajes enviados"""
+    cookie = f'{settings.SESSION_COOKIE_NAME}={client.cookies[settings.SESSION_COOKIE_NAME].value}'
+    scope = {
+        'type': 'http', 'asgi': {'version': '3.0'}, 'http_version': '1.1',
+        'method': 'GET', 'scheme': 'http', 'path': ruta, 'raw_path': ruta.encode(),
+        'query_string': b'', 'root_path': '',
+        'headers': [(b'host', b'testserver'), (b'cookie', cookie.encode())],
+        'client': ('127.0.0.1', 50000), 'server': ('testserver', 80),
+    }
+    recibidos = []
+    enviados = []
+
+    async def receive():
+        if not recibidos:
+            recibidos.append(True)
+            return {'type': 'http.request', 'body': b'', 'more_body': False}
+        # Sin desconexión del cliente: se espera hasta que la respuesta termine
+        await asyncio.Event().wait()
+
+    async def send(mensaje):
+        enviados.append(mensaje)
+
+    # Como el cliente de pruebas: no cerrar conexiones al iniciar la petición
+    request_started.disconnect(close_old_connections)
+    try:
+        async_to_sync(ASGIHandler())(scope, receive, send)
+    finally:
+        request_started.connect(close_old_connections)
+    return enviados
+
+
+def _sin_aviso_de_memoria(avisos):
+    return not [a for a in avisos if 'synchronous iterators' in str(a.message)]
+
+
+def _cuerpo(enviados):
+    return b''.join(m.get('body', b'') for m in enviados[1:])
+
+
+@pytest.fixture
+def cliente_supervisor(client, settings, tmp_path):
+    """Supervisor con sesión iniciada, tres altas completadas y MEDIA_ROOT y EXPORTACIONES_ROOT temporales."""
+    settings.MEDIA_ROOT = str(tmp_path / 'media')
+    settings.EXPORTACIONES_ROOT = str(tmp_path / 'privado')
+    usuario = Usuario.objects.create_user(username='supervisor', rut='5126663-3', password='clave', rol='supervisor')
+    client.force_login(usuario)
+    for i in range(3):
+        madre = Madre.objects.create(rut=f'4100000{i}-{i}', nombre=f'Madre {i}', edad=25, direccion='...', telefono='...', controles_prenatales=3)
+        parto = Parto.objects.create(madre=madre, tipo='natural', fecha_hora_inicio=timezone.now(), medico_responsable='...', matrona_responsable='...')
+        rn = RecienNacido.objects.create(parto=parto, sexo='F', peso=3.1, talla=49, apgar_1_min=8, apgar_5_min=9)
+        Alta.objects.create(madre=madre, parto=parto, recien_nacido=rn, estado='completada', fecha_alta=timezone.now())
+    return client
+
+
+@pytest.mark.django_db(transaction=True)
+def test_certificado_sin_armar_en_memoria(cliente_supervisor):
+    """Bajo ASGI el PDF se envía por bloques, sin leer el archivo completo antes."""
+    alta = Alta.objects.first()
+    with warnings.catch_warnings(record=True) as avisos:
+        warnings.simplefilter('always')
+        enviados = _get_asgi(cliente_supervisor, f'/altas/certificado/{alta.pk}/')
+
+    assert _sin_aviso_de_memoria(avisos)
+    assert enviados[0]['status'] == 200
+    assert _cuerpo(enviados).startswith(b'%PDF')
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.parametrize('ruta, lineas', [('/altas/exportar-csv/', 4), ('/altas/exportar-ndjson/', 3)])
+def test_exportacion_texto_sin_armar_en_memoria(cliente_supervisor, ruta, lineas):
+    """Bajo ASGI el CSV y el NDJSON se envían de a un lote de filas."""
+    with warnings.catch_warnings(record=True) as avisos:
+        warnings.simplefilter('always')
+        enviados = _get_asgi(cliente_supervisor, ruta)
+
+    assert _sin_aviso_de_memoria(avisos)
+    assert enviados[0]['status'] == 200
+    assert len(_cuerpo(enviados).decode().splitlines()) == lineas
+
+
+@pytest.mark.django_db(transaction=True)
+def test_excel_sin_armar_en_memoria(cliente_supervisor):
+    """Bajo ASGI el libro se lee del archivo temporal de a un bloque."""
+    with warnings.catch_warnings(record=True) as avisos:
+        warnings.simplefilter('always')
+        enviados = _get_asgi(cliente_supervisor, '/altas/exportar-excel/')
+
+    assert _sin_aviso_de_memoria(avisos)
+    libro = openpyxl.load_workbook(io.BytesIO(_cuerpo(enviados))).active
+    assert len(list(libro.iter_rows())) == 4
+
+
+@pytest.mark.django_db(transaction=True)
+def test_exportacion_en_segundo_plano_sin_armar_en_memoria(cliente_supervisor):
+    """El archivo de una exportación terminada se descarga por bloques también bajo ASGI."""
+    trabajo = encolar_exportacion(Usuario.objects.get(username='supervisor'), 'csv', {})
+    call_command('procesar_exportaciones', '--una-vez')
+    assert TrabajoExportacion.objects.get(pk=trabajo.pk).estado == 'completado'
+
+    with warnings.catch_warnings(record=True) as avisos:
+        warnings.simplefilter('always')
+        enviados = _get_asgi(cliente_supervisor, f'/altas/exportaciones/{trabajo.pk}/descargar/')
+
+    assert _sin_aviso_de_memoria(avisos)
+    assert enviados[0]['status'] == 200
+    assert len(_cuerpo(enviados).decode().splitlines()) == 4
+
+
+@pytest.mark.django_db(transaction=True)
+def test_lote_de_certificados_sin_armar_en_memoria(cliente_supervisor):
+    """Bajo ASGI el ZIP se envía a medida que cada certificado está listo."""
+    with warnings.catch_warnings(record=True) as avisos:
+        warnings.simplefilter('always')
+        enviados = _get_asgi(cliente_supervisor, '/altas/certificados/lote/')
+
+    assert _sin_aviso_de_memoria(avisos)
+    assert enviados[0]['status'] == 200
+    with zipfile.ZipFile(io.BytesIO(_cuerpo(enviados))) as archivo_zip:
+        assert len(archivo_zip.namelist()) == 3
@@ -0,0 +1,116 @@
+"""
+Pruebas de los días de estadía y del censo de madres hospitalizadas.
+"""
+from datetime import timedelta
+
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from pacientes.models import Madre
+from partos.models import Parto
+from recien_nacidos.models import RecienNacido
+from altas.models import Alta
+from altas.contadores import madres_hospitalizadas
+from reportes.estadia import estadia
+
+# (tipo de parto, complicaciones, horas de estadía)
+CASOS = [
+    ('natural', False, 30),
+    ('natural', False, 48),
+    ('natural', True, 50),
+    ('cesarea', False, 72),
+    ('cesarea', True, 100),
+]
+
+
+def _crear_alta(i, tipo, complicaciones):
+    madre = Madre.objects.create(rut=f'6000000{i}-{i}', nombre=f'Madre {i}', edad=25, direccion='...', telefono='...', controles_prenatales=3)
+    parto = Parto.objects.create(madre=madre, tipo=tipo, tuvo_complicaciones=complicaciones, fecha_hora_inicio=timezone.now(), medico_responsable='...', matrona_responsable='...')
+    rn = RecienNacido.objects.create(parto=parto, sexo='F', peso=3.1, talla=49, apgar_1_min=8, apgar_5_min=9)
+    return Alta.objects.create(madre=madre, parto=parto, recien_nacido=rn)
+
+
+def _completar(alta, horas):
+    alta.estado = 'completada'
+    alta.fecha_alta = alta.madre.fecha_ingreso + timedelta(hours=horas, minutes=20)
+    alta.save()
+
+
+@pytest.fixture
+def altas_completadas():
+    cache.clear()
+    altas = []
+    for i, (tipo, complicaciones, horas) in enumerate(CASOS):
+        alta = _crear_alta(i, tipo, complicaciones)
+        _completar(alta, horas)
+        altas.append(alta)
+    return altas
+
+
+@pytest.mark.django_db
+def test_percentiles_por_grupo(altas_completadas):
+    resultado = estadia()
+    assert resultado['general']['total'] == 5
+    assert resultado['general']['mediana'] == 50
+    assert resultado['general']['p90'] == 100
+    assert resultado['por_tipo_parto']['natural']['mediana'] == 48
+    assert resultado['por_complicaciones']['si']['total'] == 2
+    assert resultado['por_tipo_y_complicaciones']['cesarea:no']['p99'] == 72
+    assert resultado['por_tipo_y_complicaciones']['cesarea:no']['p99_dias'] == 3.0
+
+
+def _sobre_altas(capturadas):
+    return [q['sql'] for q in capturadas.captured_queries if '"altas_alta"' in q['sql']]
+
+
+@pytest.mark.django_db
+def test_una_consulta_y_cache_por_periodo(altas_completadas, django_capture_on_commit_callbacks):
+    with CaptureQueriesContext(connection) as capturadas:
+        estadia()
+    assert len(_sobre_altas(capturadas)) == 1
+    with CaptureQueriesContext(connection) as capturadas:
+        estadia()
+    assert _sobre_altas(capturadas) == []
+
+    # Un alta que se completa invalida los periodos cacheados al confirmarse
+    alta = _crear_alta(9, 'natural', False)
+    with django_capture_on_commit_callbacks(execute=True):
+        _completar(alta, 10)
+    assert estadia()['general']['total'] == 6
+
+
+@pytest.mark.django_db
+def test_censo_se_mantiene_con_las_senales(django_capture_on_commit_callbacks):
+    cache.clear()
+    alta = _crear_alta(0, 'natural', False)
+    otra = _crear_alta(1, 'natural', False)
+    assert madres_hospitalizadas() == 2
+
+    with django_capture_on_commit_callbacks(execute=True):
+        _crear_alta(2, 'cesarea', False)
+        _completar(alta, 40)
+    with CaptureQueriesContext(connection) as capturadas:
+        assert madres_hospitalizadas() == 2
+    assert not any('COUNT(' in q['sql'].upper() for q in capturadas.captured_queries)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        alta.madre.delete()
+        otra.delete()
+    with CaptureQueriesContext(connection) as capturadas:
+        assert madres_hospitalizadas() == 2
+    assert not any('COUNT(' in q['sql'].upper() for q in capturadas.captured_queries)
+    assert madres_hospitalizadas() == Madre.objects.exclude(alta__estado='completada').count()
+
+
+@pytest.mark.django_db
+def test_vista_estadia(client, altas_completadas):
+    from usuarios.models import Usuario
+    usuario = Usuario.objects.create_user(username='supervisor1', rut='5126663-3', password='clave', rol='supervisor')
+    client.force_login(usuario)
+
+    respuesta = client.get('/reportes/estadia/')
+    assert respuesta.status_code == 200
+    assert respuesta.context['hospitalizadas'] == 0
+    assert client.get('/reportes/estadia/json/').json()['hospitalizadas'] == 0
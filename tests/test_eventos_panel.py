@@ -0,0 +1,85 @@
+"""
+Pruebas de los contadores en vivo del panel (Server-Sent Events).
+"""
+import pytest
+from asgiref.sync import async_to_sync
+from django.test import AsyncClient
+from django.utils import timezone
+from pacientes.models import Madre
+from partos.models import Parto
+from altas import eventos
+from usuarios.models import Usuario
+
+
+@pytest.fixture
+def difusor_limpio(monkeypatch):
+    """Un difusor nuevo por prueba."""
+    monkeypatch.setattr(eventos, '_difusor', eventos.DifusorLocal())
+    return eventos.difusor()
+
+
+@pytest.mark.django_db(transaction=True)
+def test_flujo_sse_del_medico(difusor_limpio):
+    """El médico recibe el valor inicial y luego solo los ajustes de su contador."""
+    medico = Usuario.objects.create_user(username='medico1', rut='5126663-3', password='clave', rol='medico')
+
+    async def leer():
+        cliente = AsyncClient()
+        await cliente.aforce_login(medico)
+        respuesta = await cliente.get('/eventos/panel/')
+        assert respuesta['Content-Type'] == 'text/event-stream'
+        flujo = respuesta.streaming_content
+        bloques = [await anext(flujo), await anext(flujo)]
+
+        difusor_limpio.publicar({'contador': 'pendientes_administrativa', 'delta': 1})
+        difusor_limpio.publicar({'contador': 'pendientes_clinica', 'delta': 1})
+        bloques.append(await anext(flujo))
+        await flujo.aclose()
+        return [bloque.decode() for bloque in bloques]
+
+    retry, valor, delta = async_to_sync(leer)()
+    assert retry.startswith('retry:')
+    assert 'event: valor' in valor and '"valor": 0' in valor
+    assert 'event: delta' in delta and '"delta": 1' in delta
+    assert difusor_limpio._suscripciones == {}
+
+
+@pytest.mark.django_db
+def test_parto_publica_al_confirmar(difusor_limpio, monkeypatch, django_capture_on_commit_callbacks):
+    """Registrar un parto publica +1 para su matrona recién al confirmarse la transacción."""
+    publicados = []
+    monkeypatch.setattr(difusor_limpio, 'publicar', publicados.append)
+    matrona = Usuario.objects.create_user(username='matrona1', rut='5126663-3', password='clave', rol='matrona')
+    madre = Madre.objects.create(rut='9000000-7', nombre='Madre SSE', edad=25, direccion='...', telefono='...', controles_prenatales=3)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        Parto.objects.create(madre=madre, tipo='natural', fecha_hora_inicio=timezone.now(), medico_responsable='...', matrona_responsable='...', creado_por=matrona)
+        assert publicados == []
+    assert publicados == [{'contador': 'registros_hoy', 'delta': 1, 'usuario_id': matrona.pk}]
+
+
+def test_rol_sin_contador(client, db):
+    """Los roles sin contadores en vivo reciben 403."""
+    supervisor = Usuario.objects.create_user(username='sup', rut='5126663-3', password='clave', rol='supervisor')
+    client.force_login(supervisor)
+    assert client.get('/eventos/panel/').status_code == 403
+
+
+def test_sin_flujo_bajo_wsgi(client, db):
+    """Bajo WSGI no se abre el flujo: la vista responde 204 y el panel no incluye EventSource."""
+    medico = Usuario.objects.create_user(username='medico1', rut='5126663-3', password='clave', rol='medico')
+    client.force_login(medico)
+    assert client.get('/eventos/panel/').status_code == 204
+    assert 'EventSource' not in client.get('/').content.decode()
+
+
+@pytest.mark.django_db(transaction=True)
+def test_panel_abre_el_flujo_bajo_asgi():
+    medico = Usuario.objects.create_user(username='medico1', rut='5126663-3', password='clave', rol='medico')
+
+    async def cargar():
+        cliente = AsyncClient()
+        await cliente.aforce_login(medico)
+        return (await cliente.get('/')).content.decode()
+
+    assert 'EventSource' in async_to_sync(cargar)()
@@ -0,0 +1,114 @@
+"""
+Pruebas de la exportación de altas a Excel.
+"""
+import io
+import json
+import openpyxl
+import pytest
+from django.utils import timezone
+from pacientes.models import Madre
+from partos.models import Parto
+from recien_nacidos.models import RecienNacido
+from altas.models import Alta
+from usuarios.models import Usuario
+from altas.utils import exportar_altas_excel
+from altas import exportacion
+from altas.paginacion import TAMANO_LOTE
+
+
+@pytest.fixture
+def altas_creadas():
+    """Crea tres altas para exportar."""
+    altas = []
+    for i in range(3):
+        madre = Madre.objects.create(rut=f'4000000{i}-{i}', nombre=f'Madre Número {i}', edad=25, direccion='...', telefono='...', controles_prenatales=3)
+        parto = Parto.objects.create(madre=madre, tipo='cesarea', fecha_hora_inicio=timezone.now(), medico_responsable='...', matrona_responsable='...')
+        rn = RecienNacido.objects.create(parto=parto, sexo='F', peso=3.1, talla=49, apgar_1_min=8, apgar_5_min=9)
+        altas.append(Alta.objects.create(madre=madre, parto=parto, recien_nacido=rn))
+    return altas
+
+
+def leer_libro(response):
+    contenido = b''.join(response.streaming_content)
+    return openpyxl.load_workbook(io.BytesIO(contenido)).active
+
+
+@pytest.mark.django_db
+def test_exportacion_excel(altas_creadas):
+    """El archivo se envía por bloques con encabezados, filas y anchos."""
+    response = exportar_altas_excel(Alta.objects.all())
+    assert response.streaming
+    assert 'attachment' in response['Content-Disposition']
+
+    ws = leer_libro(response)
+    filas = list(ws.iter_rows(values_only=True))
+    assert filas[0][0] == 'ID'
+    assert len(filas) == 4
+    assert {fila[2] for fila in filas[1:]} == {a.madre.nombre for a in altas_creadas}
+    assert filas[1][3] == 'Cesárea'
+    assert ws.column_dimensions['C'].width >= len('Madre Número 0')
+
+
+def crear_altas_en_bloque(cantidad):
+    """Crea 'cantidad' altas con bulk_create (sin señales ni save por fila)."""
+    ahora = timezone.now()
+    madres = Madre.objects.bulk_create([
+        Madre(rut=f'{i}-0', nombre=f'Madre {i}', edad=25, direccion='...', telefono='...', controles_prenatales=3)
+        for i in range(cantidad)
+    ])
+    partos = Parto.objects.bulk_create([
+        Parto(madre=madre, tipo='natural', fecha_hora_inicio=ahora, medico_responsable='...', matrona_responsable='...')
+        for madre in madres
+    ])
+    rns = RecienNacido.objects.bulk_create([
+        RecienNacido(parto=parto, codigo_unico=f'RN-{i:08d}', sexo='M', peso=3.3, talla=50, apgar_1_min=9, apgar_5_min=9)
+        for i, parto in enumerate(partos)
+    ])
+    Alta.objects.bulk_create([
+        Alta(madre=madre, parto=parto, recien_nacido=rn)
+        for madre, parto, rn in zip(madres, partos, rns)
+    ])
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('cantidad', [10, 10000])
+def test_consultas_constantes(cantidad, django_assert_num_queries):
+    """
+    La exportación no hace consultas por fila: una consulta por lote de
+    TAMANO_LOTE altas, más la que confirma que no quedan filas.
+    """
+    crear_altas_en_bloque(cantidad)
+
+    with django_assert_num_queries(cantidad // TAMANO_LOTE + 1):
+        response = exportar_altas_excel(Alta.objects.all())
+    assert len(list(leer_libro(response).iter_rows())) == cantidad + 1
+
+
+@pytest.fixture
+def cliente_logueado(client):
+    """Cliente con sesión iniciada como supervisor."""
+    usuario = Usuario.objects.create_user(username='supervisor', rut='5126663-3', password='clave', rol='supervisor')
+    client.force_login(usuario)
+    return client
+
+
+@pytest.mark.django_db
+def test_exportar_csv_filtrado(altas_creadas, cliente_logueado):
+    """El CSV se envía por streaming y respeta el filtro de estado."""
+    Alta.objects.filter(pk=altas_creadas[0].pk).update(estado='completada')
+    response = cliente_logueado.get('/altas/exportar-csv/?estado=completada')
+    assert response.streaming
+    lineas = b''.join(response.streaming_content).decode().splitlines()
+    assert lineas[0].startswith('ID,RUT Madre')
+    assert len(lineas) == 2
+    assert lineas[1].startswith(f'{altas_creadas[0].pk},')
+
+
+@pytest.mark.django_db
+def test_exportar_ndjson(altas_creadas, cliente_logueado):
+    """Cada línea del NDJSON es un objeto con las mismas columnas."""
+    response = cliente_logueado.get('/altas/exportar-ndjson/')
+    objetos = [json.loads(linea) for linea in b''.join(response.streaming_content).decode().splitlines()]
+    assert len(objetos) == 3
+    assert objetos[0]['tipo_parto'] == 'Cesárea'
+    assert set(objetos[0]) == set(exportacion.CLAVES)
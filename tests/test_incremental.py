@@ -0,0 +1,95 @@
+"""
+Pruebas de la exportación incremental por marca de agua.
+"""
+import json
+from datetime import timedelta
+
+import pytest
+from django.core.management import call_command
+from django.utils import timezone
+from pacientes.models import Madre
+from partos.models import Parto
+from recien_nacidos.models import RecienNacido
+from altas import views
+from altas.models import Alta, MarcaIncremental
+from altas.incremental import cambios_desde
+from usuarios.models import Usuario
+
+
+@pytest.fixture
+def altas_creadas():
+    """Crea cuatro altas; las tres primeras comparten fecha_actualizacion."""
+    altas = []
+    for i in range(4):
+        madre = Madre.objects.create(rut=f'7000000{i}-{i}', nombre=f'Madre {i}', edad=25, direccion='...', telefono='...', controles_prenatales=3)
+        parto = Parto.objects.create(madre=madre, tipo='natural', fecha_hora_inicio=timezone.now(), medico_responsable='...', matrona_responsable='...')
+        rn = RecienNacido.objects.create(parto=parto, sexo='F', peso=3.1, talla=49, apgar_1_min=8, apgar_5_min=9)
+        altas.append(Alta.objects.create(madre=madre, parto=parto, recien_nacido=rn))
+    empate = timezone.now() - timedelta(hours=1)
+    Alta.objects.filter(pk__in=[a.pk for a in altas[:3]]).update(fecha_actualizacion=empate)
+    return altas
+
+
+def _leer_ndjson(directorio, modelo):
+    filas = []
+    for ruta in directorio.glob(f'{modelo}_*.ndjson'):
+        filas.extend(json.loads(linea) for linea in ruta.read_text(encoding='utf-8').splitlines())
+        ruta.unlink()
+    return filas
+
+
+@pytest.mark.django_db
+def test_reanudar_desde_cursor(altas_creadas):
+    """Avanzar por lotes entrega cada alta una vez, aun con fechas empatadas."""
+    vistos = []
+    posicion = None
+    while True:
+        filas, posicion = cambios_desde(Alta, posicion, lote=2)
+        if not filas:
+            break
+        vistos.extend(fila['id'] for fila in filas)
+    assert sorted(vistos) == sorted(a.pk for a in altas_creadas)
+    assert len(vistos) == len(set(vistos))
+
+
+@pytest.mark.django_db
+def test_fila_actualizada_vuelve_a_aparecer(altas_creadas):
+    """Un alta modificada después de la marca aparece en el siguiente lote."""
+    _, posicion = cambios_desde(Alta, None, lote=100)
+    assert cambios_desde(Alta, posicion)[0] == []
+
+    alta = altas_creadas[0]
+    alta.observaciones = 'Corrección'
+    alta.save()
+    filas, _ = cambios_desde(Alta, posicion)
+    assert [fila['id'] for fila in filas] == [alta.pk]
+
+
+@pytest.mark.django_db
+def test_comando_exporta_solo_cambios(altas_creadas, tmp_path):
+    """La segunda ejecución del comando solo escribe lo modificado desde la primera."""
+    call_command('exportar_incremental', '--directorio', str(tmp_path), '--margen', '0', '--lote', '2')
+    assert len(_leer_ndjson(tmp_path, 'altas')) == 4
+    assert len(_leer_ndjson(tmp_path, 'madres')) == 4
+    assert MarcaIncremental.objects.filter(consumidor='bodega_datos').count() == 4
+
+    madre = Madre.objects.get(pk=altas_creadas[1].madre_id)
+    madre.telefono = '+56 9 1234 5678'
+    madre.save()
+    call_command('exportar_incremental', '--directorio', str(tmp_path), '--margen', '0')
+    assert [fila['id'] for fila in _leer_ndjson(tmp_path, 'madres')] == [madre.pk]
+    assert _leer_ndjson(tmp_path, 'altas') == []
+
+
+@pytest.mark.django_db
+def test_api_con_cursor(client, altas_creadas, monkeypatch):
+    """La API entrega lotes encadenados por el cursor de la respuesta."""
+    monkeypatch.setattr(views, 'MARGEN_SEGURIDAD', timedelta(0))
+    usuario = Usuario.objects.create_user(username='ti', rut='5126663-3', password='clave', rol='encargado_ti')
+    client.force_login(usuario)
+
+    primera = client.get('/altas/cambios/altas/', {'limite': 3}).json()
+    assert len(primera['filas']) == 3 and primera['hay_mas']
+    segunda = client.get('/altas/cambios/altas/', {'limite': 3, 'cursor': primera['cursor']}).json()
+    assert len(segunda['filas']) == 1 and not segunda['hay_mas']
+    assert client.get('/altas/cambios/desconocido/').status_code == 404
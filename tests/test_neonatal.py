@@ -0,0 +1,85 @@
+"""
+Pruebas de las estadísticas neonatales vectorizadas.
+"""
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.utils import timezone
+from pacientes.models import Madre
+from partos.models import Parto
+from recien_nacidos.models import RecienNacido
+from reportes.neonatal import cargar, estadisticas_neonatales
+
+# (tipo de parto, sexo, peso, talla, apgar 1, apgar 5)
+CASOS = [
+    ('natural', 'F', '3.10', '49.0', 8, 9),
+    ('natural', 'M', '2.40', '45.5', 6, 8),
+    ('cesarea', 'M', '4.20', '53.0', 9, 9),
+    ('cesarea', 'F', '2.50', '47.0', 7, 6),
+    ('instrumental', 'M', '4.00', '51.5', 9, 10),
+]
+
+
+@pytest.fixture
+def recien_nacidos():
+    creados = []
+    for i, (tipo, sexo, peso, talla, apgar_1, apgar_5) in enumerate(CASOS):
+        madre = Madre.objects.create(rut=f'5000000{i}-{i}', nombre=f'Madre {i}', edad=25, direccion='...', telefono='...', controles_prenatales=3)
+        parto = Parto.objects.create(madre=madre, tipo=tipo, fecha_hora_inicio=timezone.now(), medico_responsable='...', matrona_responsable='...')
+        creados.append(RecienNacido.objects.create(
+            parto=parto, sexo=sexo, peso=peso, talla=talla, apgar_1_min=apgar_1, apgar_5_min=apgar_5
+        ))
+    return creados
+
+
+@pytest.mark.django_db
+def test_tasas_iguales_a_los_metodos_del_modelo(recien_nacidos):
+    """Las tasas vectorizadas coinciden con tiene_apgar_critico() y peso_adecuado()."""
+    hoy = timezone.localdate()
+    estadisticas = estadisticas_neonatales(hoy, hoy)
+    general = estadisticas['general']
+
+    total = len(recien_nacidos)
+    assert general['total'] == total
+    assert general['tasa_apgar_critico'] == sum(rn.tiene_apgar_critico() for rn in recien_nacidos) / total
+    assert general['tasa_peso_inadecuado'] == sum(not rn.peso_adecuado() for rn in recien_nacidos) / total
+    assert general['percentiles_peso'][50] == 3.1
+    assert sum(cantidad for _, _, cantidad in general['histograma_peso']) == total
+
+    por_tipo = estadisticas['por_tipo_parto']
+    assert set(por_tipo) == {'natural', 'cesarea', 'instrumental'}
+    assert por_tipo['cesarea']['total'] == 2
+    assert por_tipo['cesarea']['tasa_apgar_critico'] == 0.5
+    assert estadisticas['por_sexo']['M']['tasa_sobre_peso'] == pytest.approx(1 / 3)
+
+
+@pytest.mark.django_db
+def test_carga_en_pocas_consultas(recien_nacidos, django_assert_max_num_queries):
+    """La carga no crea instancias ni consulta por fila."""
+    with django_assert_max_num_queries(1):
+        datos = cargar()
+    assert datos.size == len(recien_nacidos)
+
+
+@pytest.mark.django_db
+def test_periodo_sin_datos():
+    estadisticas = estadisticas_neonatales()
+    assert estadisticas['general']['total'] == 0
+    assert estadisticas['general']['tasa_apgar_critico'] is None
+    assert estadisticas['por_sexo'] == {}
+
+
+@pytest.mark.django_db
+def test_vista_json_y_comando(client, recien_nacidos):
+    from usuarios.models import Usuario
+    usuario = Usuario.objects.create_user(username='supervisor1', rut='5126663-3', password='clave', rol='supervisor')
+    client.force_login(usuario)
+
+    datos = client.get('/reportes/neonatal/json/').json()
+    assert datos['general']['total'] == len(recien_nacidos)
+    assert client.get('/reportes/neonatal/').status_code == 200
+
+    salida = StringIO()
+    call_command('estadisticas_neonatales', stdout=salida)
+    assert 'Cesárea' in salida.getvalue()
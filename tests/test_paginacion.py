@@ -0,0 +1,87 @@
+"""
+Pruebas de la paginación por cursor de altas.
+"""
+import pytest
+from django.utils import timezone
+from pacientes.models import Madre
+from partos.models import Parto
+from recien_nacidos.models import RecienNacido
+from altas.models import Alta
+from altas.paginacion import paginar_keyset, codificar_cursor, decodificar_cursor, recorrer_por_lotes
+
+
+@pytest.fixture
+def altas_creadas():
+    """Crea 7 altas; las primeras 4 comparten fecha_creacion para forzar empates."""
+    altas = []
+    for i in range(7):
+        madre = Madre.objects.create(rut=f'1000000{i}-{i}', nombre=f'Madre {i}', edad=25, direccion='...', telefono='...', controles_prenatales=3)
+        parto = Parto.objects.create(madre=madre, tipo='natural', fecha_hora_inicio=timezone.now(), medico_responsable='...', matrona_responsable='...')
+        rn = RecienNacido.objects.create(parto=parto, sexo='F', peso=3.1, talla=49, apgar_1_min=8, apgar_5_min=9)
+        altas.append(Alta.objects.create(madre=madre, parto=parto, recien_nacido=rn))
+    empate = timezone.now()
+    Alta.objects.filter(pk__in=[a.pk for a in altas[:4]]).update(fecha_creacion=empate)
+    return altas
+
+
+def test_cursor_ida_y_vuelta():
+    """El cursor codificado se decodifica a la misma posición."""
+    fecha = timezone.now()
+    assert decodificar_cursor(codificar_cursor(fecha, 42)) == (fecha, 42)
+    assert decodificar_cursor('no-es-un-cursor') is None
+
+
+@pytest.mark.django_db
+def test_recorrido_completo_sin_duplicados(altas_creadas):
+    """Avanzar página a página entrega todas las altas una sola vez."""
+    vistos = []
+    cursor = None
+    while True:
+        pagina = paginar_keyset(Alta.objects.all(), cursor=cursor, por_pagina=3)
+        vistos.extend(alta.pk for alta in pagina)
+        if not pagina.tiene_siguiente:
+            break
+        cursor = pagina.cursor_siguiente
+    assert sorted(vistos) == sorted(a.pk for a in altas_creadas)
+    assert len(vistos) == len(set(vistos))
+
+
+@pytest.mark.django_db
+def test_pagina_anterior(altas_creadas):
+    """Retroceder desde la segunda página devuelve la primera."""
+    primera = paginar_keyset(Alta.objects.all(), por_pagina=3)
+    segunda = paginar_keyset(Alta.objects.all(), cursor=primera.cursor_siguiente, por_pagina=3)
+    assert segunda.tiene_anterior
+
+    vuelta = paginar_keyset(Alta.objects.all(), cursor=segunda.cursor_anterior, direccion='anterior', por_pagina=3)
+    assert [a.pk for a in vuelta] == [a.pk for a in primera]
+    assert not vuelta.tiene_anterior
+
+
+@pytest.mark.django_db
+def test_pagina_anterior_vacia_muestra_la_primera(altas_creadas):
+    """Si no queda nada más reciente que el cursor, 'anterior' entrega la primera página."""
+    primera = paginar_keyset(Alta.objects.all(), por_pagina=3)
+    segunda = paginar_keyset(Alta.objects.all(), cursor=primera.cursor_siguiente, por_pagina=3)
+    Alta.objects.filter(pk__in=[a.pk for a in primera]).delete()
+
+    vuelta = paginar_keyset(Alta.objects.all(), cursor=segunda.cursor_anterior, direccion='anterior', por_pagina=3)
+    assert [a.pk for a in vuelta] == [a.pk for a in segunda]
+    assert not vuelta.tiene_anterior
+    assert vuelta.tiene_siguiente
+
+
+@pytest.mark.django_db
+def test_pagina_en_una_consulta(altas_creadas, django_assert_num_queries):
+    """Cada página cuesta una única consulta, sin COUNT ni OFFSET."""
+    with django_assert_num_queries(1) as capturadas:
+        paginar_keyset(Alta.objects.all(), cursor=codificar_cursor(timezone.now(), 10**9), por_pagina=3)
+    assert 'OFFSET' not in capturadas.captured_queries[0]['sql'].upper()
+
+
+@pytest.mark.django_db
+def test_recorrer_por_lotes(altas_creadas, django_assert_num_queries):
+    """El recorrido por lotes entrega todas las filas con una consulta por lote."""
+    with django_assert_num_queries(4):
+        vistos = [alta.pk for alta in recorrer_por_lotes(Alta.objects.all(), tamano=2)]
+    assert vistos == sorted((a.pk for a in altas_creadas), reverse=True)
@@ -0,0 +1,60 @@
+"""
+Pruebas de los periodos locales como rangos UTC.
+"""
+from datetime import date, datetime, timedelta, timezone as tz
+
+import pytest
+from django.utils import timezone
+from pacientes.models import Madre
+from partos.models import Parto
+from recien_nacidos.models import RecienNacido
+from altas.forms import BuscarAltaForm
+from altas.models import Alta
+from reportes.periodos import rango_dia, rango_semana, rango_mes, filtro_fechas
+
+
+def test_rangos_en_utc():
+    """Los límites son la medianoche de Santiago expresada en UTC."""
+    # Invierno: UTC-4
+    assert rango_dia(date(2025, 7, 10)) == (
+        datetime(2025, 7, 10, 4, tzinfo=tz.utc), datetime(2025, 7, 11, 4, tzinfo=tz.utc)
+    )
+    # Verano: UTC-3
+    inicio, fin = rango_mes(date(2025, 1, 20))
+    assert inicio == datetime(2025, 1, 1, 3, tzinfo=tz.utc)
+    assert fin == datetime(2025, 2, 1, 3, tzinfo=tz.utc)
+    # Diciembre pasa al año siguiente
+    assert rango_mes(date(2024, 12, 5))[1] == datetime(2025, 1, 1, 3, tzinfo=tz.utc)
+    # La semana parte el lunes
+    assert rango_semana(date(2025, 7, 10))[0] == datetime(2025, 7, 7, 4, tzinfo=tz.utc)
+
+
+def test_dia_con_cambio_de_horario():
+    """El día en que se adelanta la hora dura 23 horas."""
+    inicio, fin = rango_dia(date(2025, 9, 7))
+    assert fin - inicio == timedelta(hours=23)
+
+
+def test_filtro_sin_funciones_sobre_la_columna(db):
+    """El filtro compara la columna directamente, sin convertirla a fecha local."""
+    sql = str(Parto.objects.filter(**filtro_fechas('fecha_registro', date(2025, 7, 1), date(2025, 7, 2))).query)
+    assert 'cast_date' not in sql.lower() and 'convert_tz' not in sql.lower()
+
+
+@pytest.mark.django_db
+def test_fecha_hasta_incluye_todo_el_dia():
+    """Un alta creada a las 23:30 del último día entra en el filtro fecha_hasta."""
+    madre = Madre.objects.create(rut='9100000-1', nombre='Madre Noche', edad=25, direccion='...', telefono='...', controles_prenatales=3)
+    parto = Parto.objects.create(madre=madre, tipo='natural', fecha_hora_inicio=timezone.now(), medico_responsable='...', matrona_responsable='...')
+    rn = RecienNacido.objects.create(parto=parto, sexo='F', peso=3.1, talla=49, apgar_1_min=8, apgar_5_min=9)
+    alta = Alta.objects.create(madre=madre, parto=parto, recien_nacido=rn)
+    noche = datetime(2025, 7, 10, 23, 30, tzinfo=timezone.get_current_timezone())
+    Alta.objects.filter(pk=alta.pk).update(fecha_creacion=noche)
+
+    form = BuscarAltaForm({'fecha_desde': '2025-07-10', 'fecha_hasta': '2025-07-10'})
+    assert form.is_valid()
+    assert list(form.filtrar(Alta.objects.all())) == [alta]
+
+    form = BuscarAltaForm({'fecha_hasta': '2025-07-09'})
+    assert form.is_valid()
+    assert not form.filtrar(Alta.objects.all()).exists()
@@ -0,0 +1,71 @@
+"""
+Pruebas de regresión de planes de consulta.
+Cada consulta caliente del flujo de altas debe resolverse con un índice;
+la prueba falla si el motor cae en un recorrido completo de la tabla.
+"""
+import re
+import pytest
+from datetime import timedelta
+from django.db import connection
+from django.utils import timezone
+from altas.models import Alta
+from pacientes.models import TokenNombreMadre
+from partos.models import Parto
+from usuarios.models import Usuario
+from reportes.periodos import rango_dia, filtro_rango
+
+
+def plan_de(queryset):
+    """Retorna el plan de ejecución del queryset en el formato del motor."""
+    if connection.vendor == 'mysql':
+        return queryset.explain(format='json')
+    return queryset.explain()
+
+
+def recorre_tabla_completa(plan):
+    """Detecta un recorrido completo según el motor de base de datos."""
+    if connection.vendor == 'sqlite':
+        return any(re.search(r'\bSCAN\b', linea) for linea in plan.splitlines())
+    if connection.vendor == 'mysql':
+        return re.search(r'"access_type":\s*"(ALL|index)"', plan) is not None
+    if connection.vendor == 'postgresql':
+        return 'Seq Scan' in plan
+    return False
+
+
+def consultas_calientes():
+    hoy = timezone.now().replace(hour=0, minute=0, second=0, microsecond=0)
+    matrona = Usuario.objects.create(username='matrona', rut='11111111-1', rol='matrona')
+    return {
+        'altas por estado y fecha': Alta.objects.filter(
+            estado='pendiente', fecha_creacion__gte=hoy - timedelta(days=30)
+        ).order_by('-fecha_creacion'),
+        'panel médico': Alta.objects.pendientes_clinica().order_by(),
+        'panel administrativo': Alta.objects.pendientes_administrativa().order_by(),
+        'panel matrona': Parto.objects.filter(
+            creado_por=matrona, **filtro_rango('fecha_registro', rango_dia())
+        ).order_by(),
+    }
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('nombre', [
+    'altas por estado y fecha',
+    'panel médico',
+    'panel administrativo',
+    'panel matrona',
+])
+def test_consulta_usa_indice(nombre):
+    """La consulta no debe recorrer la tabla completa."""
+    plan = plan_de(consultas_calientes()[nombre])
+    assert not recorre_tabla_completa(plan), f"{nombre}: recorrido completo\n{plan}"
+
+
+@pytest.mark.django_db
+@pytest.mark.skipif(connection.vendor != 'mysql', reason="LIKE con prefijo solo usa el índice en MySQL")
+def test_busqueda_por_prefijo_usa_indice():
+    """La búsqueda de nombres no debe caer en LIKE BINARY (recorre el índice completo)."""
+    consulta = TokenNombreMadre.objects.filter(token__istartswith='gonz').values('madre_id')
+    plan = plan_de(consulta)
+    assert not recorre_tabla_completa(plan), f"búsqueda por nombre: recorrido completo\n{plan}"
+    assert 'BINARY' not in str(consulta.query).upper()
@@ -0,0 +1,159 @@
+"""
+Pruebas de los resúmenes diarios y del panel de reportes.
+"""
+import threading
+from collections import Counter
+from datetime import date, timedelta
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.utils import timezone
+from pacientes.models import Madre
+from partos.models import Parto
+from recien_nacidos.models import RecienNacido
+from altas.models import Alta
+from reportes.models import ResumenDiario
+from reportes import resumenes
+from reportes.resumenes import calcular
+
+DESDE, HASTA = date(2000, 1, 1), date(2100, 1, 1)
+
+
+def _guardados():
+    """Resúmenes guardados como Counter comparable con calcular()"""
+    return Counter({
+        (r.fecha, r.metrica, r.valor): r.cantidad
+        for r in ResumenDiario.objects.all() if r.cantidad
+    })
+
+
+@pytest.fixture
+def registros():
+    """Dos partos con un recién nacido y un alta cada uno."""
+    altas = []
+    for i, tipo in enumerate(['natural', 'cesarea']):
+        madre = Madre.objects.create(rut=f'4000000{i}-{i}', nombre=f'Madre {i}', edad=25, direccion='...', telefono='...', controles_prenatales=3)
+        parto = Parto.objects.create(madre=madre, tipo=tipo, fecha_hora_inicio=timezone.now(), medico_responsable='...', matrona_responsable='...')
+        rn = RecienNacido.objects.create(parto=parto, sexo='F', peso=3.1, talla=49, apgar_1_min=8, apgar_5_min=9)
+        altas.append(Alta.objects.create(madre=madre, parto=parto, recien_nacido=rn))
+    return altas
+
+
+@pytest.mark.django_db
+def test_resumenes_se_mantienen_con_las_senales(registros):
+    """Crear, modificar y eliminar deja los resúmenes iguales a recontar desde cero."""
+    hoy = timezone.localdate()
+    assert _guardados()[(hoy, 'partos_tipo', 'cesarea')] == 1
+    assert _guardados() == calcular(DESDE, HASTA)
+
+    # Cambios de valores
+    rn = RecienNacido.objects.get(parto=registros[0].parto)
+    rn.sexo = 'M'
+    rn.requiere_derivacion = True
+    rn.servicio_derivacion = 'Neonatología'
+    rn.save()
+    alta = Alta.objects.only('pk').get(pk=registros[1].pk)
+    alta.estado = 'pendiente_clinica'
+    alta.save()
+    assert _guardados() == calcular(DESDE, HASTA)
+
+    # Un parto que cambia de día arrastra a su recién nacido
+    parto = registros[0].parto
+    parto.fecha_hora_inicio = timezone.now() - timedelta(days=40)
+    parto.tuvo_complicaciones = True
+    parto.save()
+    assert _guardados()[(timezone.localdate(parto.fecha_hora_inicio), 'rn_sexo', 'M')] == 1
+    assert _guardados() == calcular(DESDE, HASTA)
+
+    # Eliminar en cascada
+    registros[1].madre.delete()
+    assert _guardados() == calcular(DESDE, HASTA)
+    assert (hoy, 'partos_tipo', 'cesarea') not in _guardados()
+
+
+@pytest.mark.django_db
+def test_recalcular_repara_cambios_sin_senales(registros):
+    """update() no pasa por las señales; el comando deja los resúmenes al día."""
+    Parto.objects.update(tipo='instrumental')
+    assert _guardados() != calcular(DESDE, HASTA)
+
+    call_command('recalcular_resumenes')
+    assert _guardados() == calcular(DESDE, HASTA)
+    assert _guardados()[(timezone.localdate(), 'partos_tipo', 'instrumental')] == 2
+
+
+@pytest.mark.django_db(transaction=True)
+def test_recalcular_cuenta_dentro_de_su_transaccion(registros, monkeypatch):
+    """Un cambio hecho mientras corre recalcular (antes de contar) queda en los resúmenes."""
+    original = resumenes.calcular
+
+    def calcular_con_cambio(desde, hasta):
+        assert connection.in_atomic_block
+        madre = Madre.objects.create(rut='40000009-9', nombre='Madre 9', edad=25, direccion='...', telefono='...', controles_prenatales=3)
+        Parto.objects.create(madre=madre, tipo='natural', fecha_hora_inicio=timezone.now(), medico_responsable='...', matrona_responsable='...')
+        return original(desde, hasta)
+
+    monkeypatch.setattr(resumenes, 'calcular', calcular_con_cambio)
+    resumenes.recalcular(DESDE, HASTA)
+    assert _guardados() == calcular(DESDE, HASTA)
+    assert _guardados()[(timezone.localdate(), 'partos_tipo', 'natural')] == 2
+
+
+@pytest.mark.skipif(not connection.features.has_select_for_update, reason="Requiere bloqueo de filas (FOR UPDATE)")
+@pytest.mark.django_db(transaction=True)
+def test_ajuste_concurrente_con_recalcular_no_se_pierde(registros, monkeypatch):
+    """Una señal de otra conexión que llega después del conteo espera el bloqueo y no se borra."""
+    original = resumenes.calcular
+    parto = Parto.objects.get(tipo='natural')
+
+    def cambiar_tipo():
+        try:
+            otro = Parto.objects.get(pk=parto.pk)
+            otro.tipo = 'instrumental'
+            otro.save()
+        finally:
+            connection.close()
+
+    escritor = threading.Thread(target=cambiar_tipo)
+
+    def calcular_y_esperar(desde, hasta):
+        conteo = original(desde, hasta)
+        escritor.start()
+        # El ajuste del escritor queda esperando la fila bloqueada
+        escritor.join(timeout=1)
+        assert escritor.is_alive()
+        return conteo
+
+    monkeypatch.setattr(resumenes, 'calcular', calcular_y_esperar)
+    resumenes.recalcular(DESDE, HASTA)
+    escritor.join()
+    assert _guardados() == calcular(DESDE, HASTA)
+    assert _guardados()[(timezone.localdate(), 'partos_tipo', 'instrumental')] == 1
+
+
+@pytest.fixture
+def supervisor(client):
+    from usuarios.models import Usuario
+    usuario = Usuario.objects.create_user(username='supervisor1', rut='5126663-3', password='clave', rol='supervisor')
+    client.force_login(usuario)
+    return usuario
+
+
+@pytest.mark.django_db
+def test_panel_lee_solo_resumenes(client, supervisor, registros, django_assert_max_num_queries):
+    """Un reporte anual consulta solo la tabla de resúmenes, no los registros."""
+    hoy = timezone.localdate()
+    with django_assert_max_num_queries(10) as capturadas:
+        respuesta = client.get('/reportes/', {'fecha_desde': f'{hoy.year}-01-01', 'fecha_hasta': f'{hoy.year}-12-31'})
+    assert respuesta.status_code == 200
+
+    tablas = ('partos_parto', 'recien_nacidos_reciennacido', 'altas_alta')
+    assert not any(tabla in q['sql'] for q in capturadas.captured_queries for tabla in tablas)
+
+    partos = respuesta.context['secciones'][0]
+    assert partos['total'] == 2
+    assert respuesta.context['por_mes']
+    serie = respuesta.context['serie']
+    assert [periodo for periodo, _ in serie] == [hoy.replace(day=1)]
+    assert sum(serie[0][1]) == 2
@@ -0,0 +1,122 @@
+"""
+Pruebas de la revalidación en lote de altas (reglas de registros en SQL).
+"""
+from collections import Counter
+from datetime import date
+from itertools import product
+
+import pytest
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from pacientes.models import Madre
+from partos.models import Parto
+from recien_nacidos.models import RecienNacido
+from altas.models import Alta, ContadorPanel
+from altas.contadores import pendientes_administrativa, pendientes_clinica
+from altas.revalidacion import revalidar_altas
+from reportes.models import ResumenDiario
+from reportes.resumenes import calcular
+
+DESDE, HASTA = date(2000, 1, 1), date(2100, 1, 1)
+
+# Un dato faltante por registro; None = registro completo
+FALTANTES_MADRE = [None, {'controles_prenatales': 0}, {'telefono': ''}, {'edad': 0}]
+FALTANTES_PARTO = [None, {'fecha_hora_termino': None}, {'medico_responsable': ''}]
+FALTANTES_RN = [None, {'peso': 0}, {'sexo': ''}]
+ESTADOS = [('pendiente', False), ('validada', True), ('validada', False), ('alta_clinica', True)]
+
+
+@pytest.fixture
+def altas():
+    """Una alta por combinación de registros incompletos y estado inicial"""
+    cache.clear()
+    ahora = timezone.now()
+    altas = []
+    combinaciones = product(FALTANTES_MADRE, FALTANTES_PARTO, FALTANTES_RN)
+    for i, ((madre, parto, rn), (estado, completos)) in enumerate(zip(combinaciones, ESTADOS * 9)):
+        m = Madre.objects.create(**{
+            'rut': f'9{i:07d}-0', 'nombre': f'Madre {i}', 'edad': 25, 'direccion': '...',
+            'telefono': '...', 'controles_prenatales': 3, **(madre or {}),
+        })
+        p = Parto.objects.create(**{
+            'madre': m, 'tipo': 'natural', 'fecha_hora_inicio': ahora, 'fecha_hora_termino': ahora,
+            'medico_responsable': '...', 'matrona_responsable': '...', **(parto or {}),
+        })
+        r = RecienNacido.objects.create(**{
+            'parto': p, 'sexo': 'F', 'peso': 3.1, 'talla': 49, 'apgar_1_min': 8, 'apgar_5_min': 9, **(rn or {}),
+        })
+        altas.append(Alta.objects.create(
+            madre=m, parto=p, recien_nacido=r, estado=estado, registros_completos=completos,
+            alta_clinica_confirmada=estado == 'alta_clinica',
+        ))
+    return altas
+
+
+def _estado_validacion():
+    return {
+        pk: (completos, observaciones, estado)
+        for pk, completos, observaciones, estado in Alta.objects.values_list(
+            'pk', 'registros_completos', 'observaciones_validacion', 'estado'
+        )
+    }
+
+
+def _guardados():
+    return Counter({
+        (r.fecha, r.metrica, r.valor): r.cantidad for r in ResumenDiario.objects.all() if r.cantidad
+    })
+
+
+@pytest.mark.django_db
+def test_paridad_con_validar_registros(altas, django_capture_on_commit_callbacks):
+    # Resultado esperado: validar_registros alta por alta, luego se revierte
+    with transaction.atomic():
+        for alta in Alta.objects.filter(estado__in=['pendiente', 'validada']):
+            alta.validar_registros()
+        esperado = _estado_validacion()
+        transaction.set_rollback(True)
+    # Contadores contados antes del lote, para que se ajusten
+    ContadorPanel.objects.update(valor=None)
+    antes = pendientes_clinica(), pendientes_administrativa()
+
+    with django_capture_on_commit_callbacks(execute=True):
+        resumen = revalidar_altas(tamano=7)
+    assert _estado_validacion() == esperado
+    assert resumen['revisadas'] == 27 and resumen['actualizadas'] > 0
+    assert resumen['completas'] == sum(1 for alta in altas if alta.estado != 'alta_clinica' and esperado[alta.pk][0])
+
+    # Contadores del panel y resúmenes diarios quedan como al recontar
+    contadores = (pendientes_clinica(), pendientes_administrativa())
+    assert contadores != antes
+    ContadorPanel.objects.update(valor=None)
+    assert contadores == (pendientes_clinica(), pendientes_administrativa())
+    assert _guardados() == calcular(DESDE, HASTA)
+
+    # Sin cambios pendientes, una segunda pasada solo lee
+    with CaptureQueriesContext(connection) as consultas:
+        assert revalidar_altas()['actualizadas'] == 0
+    assert not [c for c in consultas if c['sql'].startswith('UPDATE')]
+
+
+@pytest.mark.django_db
+def test_comando_y_accion_admin(client, altas):
+    alta = altas[len(FALTANTES_PARTO) * len(FALTANTES_RN)]  # primera con la madre incompleta
+    madre = Madre.objects.get(pk=alta.madre_id)
+    assert not madre.tiene_registros_completos()
+    madre.controles_prenatales = 2
+    madre.save()
+
+    call_command('revalidar_altas', tamano=10)
+    assert Alta.objects.get(pk=alta.pk).registros_completos
+
+    from usuarios.models import Usuario
+    admin = Usuario.objects.create_superuser(username='admin', rut='5126663-3', password='clave', email='a@b.cl')
+    client.force_login(admin)
+    ids = [alta.pk for alta in altas[:4]]
+    respuesta = client.post('/admin/altas/alta/', {
+        'action': 'validar_registros_action', '_selected_action': ids,
+    }, follow=True)
+    assert '1 alta(s) ya confirmada(s) no se revalidaron' in respuesta.content.decode()
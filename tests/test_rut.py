@@ -0,0 +1,83 @@
+"""
+Pruebas de la clave numérica del RUT y su búsqueda indexada.
+"""
+import pytest
+from django.core.management import call_command
+from django.utils import timezone
+from pacientes.models import Madre
+from altas.forms import BuscarAltaForm
+from altas.models import Alta
+from usuarios.models import Usuario
+from usuarios.validador import separar_rut, validar_rut, filtro_rut
+
+
+@pytest.fixture
+def madres():
+    """Crea madres con RUT en distintos formatos."""
+    datos = [('12.345.678-5', 'Ana'), ('12345679-3', 'Berta'), ('7654321-6', 'Carla'), ('1234567-4', 'Daniela')]
+    return [
+        Madre.objects.create(rut=rut, nombre=nombre, edad=30, direccion='...', telefono='...', controles_prenatales=2)
+        for rut, nombre in datos
+    ]
+
+
+def test_separar_y_validar():
+    """El cuerpo y DV se separan con o sin puntos y guión."""
+    assert separar_rut('12.345.678-5') == (12345678, '5')
+    assert separar_rut('123456785') == (12345678, '5')
+    assert separar_rut('abc') == (None, '')
+    assert validar_rut('12.345.678-5')
+    assert not validar_rut('12.345.678-9')
+
+
+@pytest.mark.django_db
+def test_guardar_normaliza(madres):
+    """Al guardar se rellena la clave numérica."""
+    assert (madres[0].rut_numero, madres[0].rut_dv) == (12345678, '5')
+    usuario = Usuario.objects.create(username='u1', rut='7.654.321-6')
+    assert usuario.rut_numero == 7654321
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('texto, esperadas', [
+    ('12.345.678-5', {'Ana'}),
+    ('12345678-5', {'Ana'}),
+    ('123456785', {'Ana'}),
+    ('1234567', {'Ana', 'Berta', 'Daniela'}),
+    ('12.345', {'Ana', 'Berta', 'Daniela'}),
+    ('765', {'Carla'}),
+])
+def test_busqueda_por_rut(madres, texto, esperadas):
+    """Se encuentra por RUT completo o por prefijo del cuerpo."""
+    encontradas = Madre.objects.filter(filtro_rut(texto))
+    assert {m.nombre for m in encontradas} == esperadas
+
+
+def test_texto_no_rut():
+    """Un nombre no genera filtro de RUT."""
+    assert filtro_rut('María González') is None
+
+
+@pytest.mark.parametrize('texto', ['0', '000', '0123', '0-K', '012345678-5'])
+def test_prefijo_con_cero_no_es_rut(texto):
+    """Ningún RUT empieza con 0: el texto no filtra por RUT (con "0" cubriría a todos)."""
+    assert filtro_rut(texto) is None
+
+
+@pytest.mark.parametrize('buscar', ['-', '...', '¿?'])
+def test_busqueda_sin_terminos_no_retorna_todo(buscar):
+    """Un texto que no es RUT ni nombre buscable no devuelve todas las altas."""
+    form = BuscarAltaForm({'buscar': buscar})
+    assert form.is_valid()
+    assert form.filtrar(Alta.objects.all()).query.is_empty()
+
+
+@pytest.mark.django_db
+def test_comando_normalizar(madres):
+    """El comando rellena las filas antiguas sin clave numérica y las marca como actualizadas."""
+    Madre.objects.update(rut_numero=None, rut_dv='')
+    antes = timezone.now()
+    call_command('normalizar_ruts')
+    assert Madre.objects.filter(rut_numero__isnull=True).count() == 0
+    assert Madre.objects.get(nombre='Carla').rut_numero == 7654321
+    assert not Madre.objects.filter(fecha_actualizacion__lt=antes).exists()
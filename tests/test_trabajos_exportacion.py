@@ -0,0 +1,101 @@
+"""
+Pruebas de las exportaciones en segundo plano.
+"""
+import os
+from datetime import timedelta
+
+import pytest
+from django.core.management import call_command
+from django.utils import timezone
+from pacientes.models import Madre
+from partos.models import Parto
+from recien_nacidos.models import RecienNacido
+from altas.models import Alta, TrabajoExportacion
+from altas.trabajos import MAXIMO_INTENTOS, PLAZO_LATIDO, encolar_exportacion, procesar, tomar_siguiente
+from usuarios.models import Usuario
+
+
+@pytest.fixture
+def supervisor(client, settings, tmp_path):
+    """Supervisor con sesión iniciada, MEDIA_ROOT y EXPORTACIONES_ROOT temporales."""
+    settings.MEDIA_ROOT = str(tmp_path / 'media')
+    settings.EXPORTACIONES_ROOT = str(tmp_path / 'privado')
+    usuario = Usuario.objects.create_user(username='supervisor', rut='5126663-3', password='clave', rol='supervisor')
+    client.force_login(usuario)
+    return usuario
+
+
+@pytest.fixture
+def altas_creadas():
+    """Crea dos altas, una de ellas completada."""
+    altas = []
+    for i in range(2):
+        madre = Madre.objects.create(rut=f'6000000{i}-{i}', nombre=f'Madre {i}', edad=25, direccion='...', telefono='...', controles_prenatales=3)
+        parto = Parto.objects.create(madre=madre, tipo='natural', fecha_hora_inicio=timezone.now(), medico_responsable='...', matrona_responsable='...')
+        rn = RecienNacido.objects.create(parto=parto, sexo='F', peso=3.1, talla=49, apgar_1_min=8, apgar_5_min=9)
+        altas.append(Alta.objects.create(madre=madre, parto=parto, recien_nacido=rn))
+    Alta.objects.filter(pk=altas[0].pk).update(estado='completada')
+    return altas
+
+
+@pytest.mark.django_db
+def test_flujo_completo(client, settings, supervisor, altas_creadas):
+    """Se encola desde la vista, el comando la procesa y el archivo se descarga."""
+    client.post('/altas/exportaciones/', {'formato': 'csv', 'estado': 'completada'})
+    trabajo = TrabajoExportacion.objects.get()
+    assert trabajo.estado == 'pendiente'
+    assert trabajo.filtros == {'estado': 'completada'}
+
+    call_command('procesar_exportaciones', '--una-vez')
+
+    estado = client.get(f'/altas/exportaciones/{trabajo.pk}/estado/').json()
+    assert estado['estado'] == 'completado'
+    assert estado['porcentaje'] == 100
+    assert estado['total_filas'] == 1
+
+    response = client.get(estado['url_descarga'])
+    lineas = b''.join(response.streaming_content).decode().splitlines()
+    assert len(lineas) == 2
+    assert lineas[1].startswith(f'{altas_creadas[0].pk},')
+    assert f'altas_export_{trabajo.pk}_' in response['Content-Disposition']
+
+    # El archivo queda fuera de MEDIA_ROOT, con un nombre que no se deduce del trabajo
+    trabajo.refresh_from_db()
+    assert trabajo.archivo.path.startswith(settings.EXPORTACIONES_ROOT)
+    assert not trabajo.archivo.name.startswith('altas_export') and len(trabajo.archivo.name) > 30
+    assert not os.path.exists(settings.MEDIA_ROOT) or not os.listdir(settings.MEDIA_ROOT)
+
+
+@pytest.mark.django_db
+def test_trabajo_se_toma_una_vez(supervisor):
+    """Un trabajo tomado no vuelve a entregarse a otro trabajador."""
+    trabajo = encolar_exportacion(supervisor, 'xlsx', {})
+    assert tomar_siguiente().pk == trabajo.pk
+    assert tomar_siguiente() is None
+
+
+@pytest.mark.django_db
+def test_trabajo_abandonado_se_retoma(supervisor, altas_creadas):
+    """Si el trabajador se cae, el trabajo se retoma al vencer el plazo y, tras varios intentos, queda con error."""
+    trabajo = encolar_exportacion(supervisor, 'csv', {})
+    tomado = tomar_siguiente()
+    assert tomar_siguiente() is None
+
+    # Sin avance por más del plazo: otro trabajador lo retoma
+    vencido = timezone.now() - PLAZO_LATIDO - timedelta(seconds=1)
+    TrabajoExportacion.objects.filter(pk=trabajo.pk).update(fecha_latido=vencido)
+    retomado = tomar_siguiente()
+    assert (retomado.pk, retomado.intentos) == (trabajo.pk, 2)
+
+    # El trabajador original ya no puede cerrar el trabajo
+    procesar(tomado)
+    assert TrabajoExportacion.objects.get(pk=trabajo.pk).estado == 'en_proceso'
+    assert procesar(retomado).estado == 'completado'
+
+    otro = encolar_exportacion(supervisor, 'csv', {})
+    for _ in range(MAXIMO_INTENTOS):
+        assert tomar_siguiente().pk == otro.pk
+        TrabajoExportacion.objects.filter(pk=otro.pk).update(fecha_latido=vencido)
+    assert tomar_siguiente() is None
+    otro.refresh_from_db()
+    assert otro.estado == 'error' and 'interrumpió' in otro.error
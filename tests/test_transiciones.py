@@ -0,0 +1,153 @@
+"""
+Pruebas de las transiciones de estado del alta (UPDATE condicional).
+"""
+import threading
+
+import pytest
+from django.core.cache import cache
+from django.db import OperationalError, connection
+from django.db.models.signals import post_save, pre_save
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from pacientes.models import Madre
+from partos.models import Parto
+from recien_nacidos.models import RecienNacido
+from altas.models import Alta, ContadorPanel, TransicionConflicto, transicion_en_lote
+from altas.contadores import madres_hospitalizadas, pendientes_administrativa, pendientes_clinica
+
+CONFIRMACIONES_PARALELAS = 4
+
+
+def _crear_alta(i=0):
+    madre = Madre.objects.create(rut=f'7000000{i}-{i}', nombre=f'Madre {i}', edad=25, direccion='...', telefono='...', controles_prenatales=3)
+    parto = Parto.objects.create(madre=madre, tipo='natural', fecha_hora_inicio=timezone.now(), fecha_hora_termino=timezone.now(), medico_responsable='...', matrona_responsable='...')
+    rn = RecienNacido.objects.create(parto=parto, sexo='F', peso=3.1, talla=49, apgar_1_min=8, apgar_5_min=9)
+    alta = Alta.objects.create(madre=madre, parto=parto, recien_nacido=rn)
+    alta.validar_registros()
+    return alta
+
+
+@pytest.mark.django_db
+def test_confirmaciones_en_una_escritura(django_capture_on_commit_callbacks):
+    cache.clear()
+    alta = _crear_alta()
+    assert (pendientes_clinica(), pendientes_administrativa(), madres_hospitalizadas()) == (1, 0, 1)
+
+    with CaptureQueriesContext(connection) as consultas, django_capture_on_commit_callbacks(execute=True):
+        estado = alta.confirmar_alta_clinica('Dr. Soto', 'Sin novedades')
+    assert estado == alta.estado == 'alta_clinica'
+    # Una sola sentencia sobre el alta, sin releerla (el resto son los resúmenes diarios)
+    sobre_alta = [c['sql'] for c in consultas if '"altas_alta"' in c['sql']]
+    assert len(sobre_alta) == 1 and sobre_alta[0].startswith('UPDATE')
+
+    with django_capture_on_commit_callbacks(execute=True):
+        estado = alta.confirmar_alta_administrativa('Sra. Pérez')
+    assert estado == 'completada'
+
+    alta.refresh_from_db()
+    assert alta.estado == 'completada' and alta.fecha_alta is not None
+    assert alta.observaciones.endswith('[Alta Clínica] Sin novedades')
+    # Los contadores se ajustan igual que con save()
+    assert (pendientes_clinica(), pendientes_administrativa(), madres_hospitalizadas()) == (0, 0, 0)
+
+
+@pytest.mark.django_db
+def test_carrera_perdida_no_modifica_el_alta():
+    alta = _crear_alta()
+    primera = Alta.objects.get(pk=alta.pk)
+    segunda = Alta.objects.get(pk=alta.pk)
+
+    primera.confirmar_alta_clinica('Dr. Soto')
+    with pytest.raises(TransicionConflicto):
+        segunda.confirmar_alta_clinica('Dra. Rojas')
+
+    alta.refresh_from_db()
+    assert alta.medico_confirma == 'Dr. Soto'
+    assert segunda.estado == 'validada'
+
+
+@pytest.mark.django_db
+def test_conflicto_no_envia_senales(django_capture_on_commit_callbacks):
+    """Si el UPDATE no cambia el alta, ningún receptor se ejecuta"""
+    alta = _crear_alta()
+    segunda = Alta.objects.get(pk=alta.pk)
+    alta.confirmar_alta_clinica('Dr. Soto')
+
+    recibidas = []
+
+    def recibir(sender, **kwargs):
+        recibidas.append(kwargs)
+
+    senales = (pre_save, post_save, transicion_en_lote)
+    for senal in senales:
+        senal.connect(recibir, sender=Alta)
+    try:
+        with django_capture_on_commit_callbacks() as callbacks, pytest.raises(TransicionConflicto):
+            segunda.confirmar_alta_clinica('Dra. Rojas')
+    finally:
+        for senal in senales:
+            senal.disconnect(recibir, sender=Alta)
+    assert recibidas == [] and callbacks == []
+
+
+@pytest.mark.django_db
+def test_misma_precondicion_que_save(django_capture_on_commit_callbacks):
+    """
+    Como con save(), la confirmación clínica solo exige registros completos
+    (no un estado en particular); el WHERE además exige el estado cargado.
+    """
+    alta = _crear_alta()
+    Alta.objects.filter(pk=alta.pk).update(estado='pendiente')
+    alta = Alta.objects.get(pk=alta.pk)
+    assert (pendientes_clinica(), pendientes_administrativa()) == (1, 0)
+    with django_capture_on_commit_callbacks(execute=True):
+        assert alta.confirmar_alta_clinica('Dr. Soto') == 'alta_clinica'
+
+    # Los contadores quedan como al recontar
+    assert (pendientes_clinica(), pendientes_administrativa()) == (0, 1)
+    ContadorPanel.objects.update(valor=None)
+    assert (pendientes_clinica(), pendientes_administrativa()) == (0, 1)
+
+    # Otro usuario invalidó los registros después de cargarla
+    otra = _crear_alta(1)
+    cargada = Alta.objects.get(pk=otra.pk)
+    Alta.objects.filter(pk=otra.pk).update(registros_completos=False)
+    with pytest.raises(TransicionConflicto):
+        cargada.confirmar_alta_clinica('Dr. Soto')
+    assert not Alta.objects.get(pk=otra.pk).alta_clinica_confirmada
+
+
+@pytest.mark.django_db(transaction=True)
+def test_confirmaciones_paralelas():
+    """Varias confirmaciones simultáneas: exactamente una gana"""
+    cache.clear()
+    alta = _crear_alta()
+    barrera = threading.Barrier(CONFIRMACIONES_PARALELAS)
+    resultados = []
+
+    def confirmar(i):
+        try:
+            instancia = Alta.objects.get(pk=alta.pk)
+            barrera.wait()
+            while True:
+                try:
+                    resultados.append(instancia.confirmar_alta_clinica(f'Médico {i}'))
+                except TransicionConflicto:
+                    resultados.append('conflicto')
+                except OperationalError:
+                    # SQLite en memoria no espera el bloqueo de la tabla como
+                    # MySQL: se reintenta hasta que la escritura concurrente termine
+                    continue
+                break
+        finally:
+            connection.close()
+
+    hilos = [threading.Thread(target=confirmar, args=(i,)) for i in range(CONFIRMACIONES_PARALELAS)]
+    for hilo in hilos:
+        hilo.start()
+    for hilo in hilos:
+        hilo.join()
+
+    assert sorted(resultados) == ['alta_clinica'] + ['conflicto'] * (CONFIRMACIONES_PARALELAS - 1)
+    assert (pendientes_clinica(), pendientes_administrativa()) == (0, 1)
+    assert Alta.objects.filter(estado='alta_clinica').count() == 1
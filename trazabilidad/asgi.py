@@ -3,6 +3,20 @@ ASGI config for trazabilidad project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
 
+Los contadores en vivo del panel (app.views.eventos_panel) son una vista
+asíncrona con conexiones abiertas por mucho tiempo; para que no ocupen un
+hilo cada una, el sitio se sirve con un servidor ASGI:
+
+    uvicorn trazabilidad.asgi:application
+
+Con WSGI (wsgi.py, runserver) el panel no abre el flujo y la vista responde
+204: un flujo asíncrono sin fin bajo WSGIHandler nunca se envía y deja el
+worker ocupado.
+
+Bajo ASGI, Django arma en memoria las respuestas por partes de contenido
+síncrono antes de enviarlas; las descargas (exportaciones, certificados, ZIP)
+pasan por altas.respuestas.por_partes, que las envía de a una parte.
+
 For more information on this file, see
 https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
 """
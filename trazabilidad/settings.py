@@ -79,6 +79,14 @@ TEMPLATES = [
     },
 ]
 
+# El sitio se sirve con ASGI (uvicorn trazabilidad.asgi:application): los
+# contadores en vivo del panel son flujos SSE abiertos por mucho tiempo. Las
+# descargas por partes se envían con altas.respuestas.por_partes, que bajo
+# ASGI las entrega de a un lote en vez de armarlas completas en memoria.
+# WSGI (runserver, gunicorn con wsgi.py) sigue funcionando, pero sin
+# contadores en vivo: app.views.eventos_panel responde 204 y el panel no
+# abre el flujo.
+ASGI_APPLICATION = 'trazabilidad.asgi.application'
 WSGI_APPLICATION = 'trazabilidad.wsgi.application'
 
 
@@ -107,6 +115,27 @@ DATABASES = {
         },
     }
 }
+
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+# Compartida entre procesos (web, procesar_exportaciones, procesar_certificados):
+# las invalidaciones de un proceso deben llegar a los demás. Con REDIS_URL se
+# usa Redis; si no, una tabla en la base (crearla con createcachetable).
+if os.getenv("REDIS_URL"):
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": os.getenv("REDIS_URL"),
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.db.DatabaseCache",
+            "LOCATION": "cache_trazabilidad",
+        }
+    }
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
@@ -140,6 +169,10 @@ STATIC_URL = 'static/'
 STATICFILES_DIRS = [os.path.join(BASE_DIR, 'static')] if os.path.exists(os.path.join(BASE_DIR, 'static')) else []
 MEDIA_URL = '/media/'
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
+# Exportaciones y certificados de altas: fuera de MEDIA_ROOT, se descargan
+# solo desde altas.views.descargar_exportacion y descargar_certificado
+# (ver altas/almacenamiento.py)
+EXPORTACIONES_ROOT = os.getenv("EXPORTACIONES_ROOT", os.path.join(BASE_DIR, 'privado', 'exportaciones'))
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
@@ -3,6 +3,10 @@ WSGI config for trazabilidad project.
 
 It exposes the WSGI callable as a module-level variable named ``application``.
 
+El despliegue usa trazabilidad/asgi.py. Bajo WSGI los contadores en vivo del
+panel quedan desactivados (app.views.eventos_panel responde 204); las
+descargas por partes funcionan igual con ambos.
+
 For more information on this file, see
 https://docs.djangoproject.com/en/5.2/howto/deployment/wsgi/
 """
@@ -2,6 +2,7 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin
 from .models import Usuario
+from .validador import filtro_rut
 
 @admin.register(Usuario)
 class UsuarioAdmin(UserAdmin):
@@ -18,3 +19,10 @@ class UsuarioAdmin(UserAdmin):
             'fields': ('rut', 'email', 'rol'), # Agregamos RUT aquí para que lo pida al inicio
         }),
     )
+
+    def get_search_results(self, request, queryset, search_term):
+        """Las búsquedas por RUT usan la clave numérica indexada"""
+        por_rut = filtro_rut(search_term, campo='rut_numero')
+        if por_rut is not None:
+            return queryset.filter(por_rut), False
+        return super().get_search_results(request, queryset, search_term)
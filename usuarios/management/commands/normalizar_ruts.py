@@ -0,0 +1,60 @@
+# usuarios/management/commands/normalizar_ruts.py
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from pacientes.models import Madre
+from usuarios.models import Usuario
+from usuarios.validador import separar_rut
+
+
+class Command(BaseCommand):
+    help = "Rellena rut_numero y rut_dv de Madre y Usuario a partir del RUT guardado"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--todos',
+            action='store_true',
+            help='Recalcula todas las filas, no solo las que aún no tienen clave numérica'
+        )
+        parser.add_argument(
+            '--lote',
+            type=int,
+            default=1000,
+            help='Cantidad de filas por UPDATE (por defecto 1000)'
+        )
+
+    def handle(self, *args, **options):
+        for modelo in (Madre, Usuario):
+            actualizadas = self._normalizar(modelo, options['todos'], options['lote'])
+            self.stdout.write(self.style.SUCCESS(
+                f"{modelo._meta.verbose_name_plural}: {actualizadas} RUT(s) normalizado(s)"
+            ))
+
+    def _normalizar(self, modelo, todos, lote):
+        filas = modelo.objects.only('pk', 'rut', 'rut_numero', 'rut_dv').order_by('pk')
+        if not todos:
+            filas = filas.filter(rut_numero__isnull=True)
+
+        # bulk_update no toca auto_now: fecha_actualizacion va explícita, así
+        # la exportación incremental también entrega las filas corregidas
+        campos = ['rut_numero', 'rut_dv']
+        con_fecha = any(campo.name == 'fecha_actualizacion' for campo in modelo._meta.concrete_fields)
+        if con_fecha:
+            campos.append('fecha_actualizacion')
+
+        pendientes = []
+        actualizadas = 0
+        for fila in filas.iterator(chunk_size=lote):
+            numero, dv = separar_rut(fila.rut)
+            if numero is None or (fila.rut_numero, fila.rut_dv) == (numero, dv):
+                continue
+            fila.rut_numero, fila.rut_dv = numero, dv
+            if con_fecha:
+                fila.fecha_actualizacion = timezone.now()
+            pendientes.append(fila)
+            if len(pendientes) >= lote:
+                actualizadas += modelo.objects.bulk_update(pendientes, campos)
+                pendientes = []
+        if pendientes:
+            actualizadas += modelo.objects.bulk_update(pendientes, campos)
+        return actualizadas
@@ -1,6 +1,7 @@
 # usuarios/models.py
 from django.db import models
 from django.contrib.auth.models import AbstractUser
+from .validador import separar_rut
 
 class Usuario(AbstractUser):
     ROLES = [
@@ -22,6 +23,20 @@ class Usuario(AbstractUser):
         verbose_name="RUT",
         help_text="RUT del usuario (ej: 12345678-9)"
     )
+    # Clave numérica del RUT, derivada al guardar (ver save)
+    rut_numero = models.PositiveIntegerField(
+        null=True,
+        blank=True,
+        editable=False,
+        db_index=True,
+        verbose_name="RUT (cuerpo numérico)"
+    )
+    rut_dv = models.CharField(
+        max_length=1,
+        blank=True,
+        editable=False,
+        verbose_name="RUT (dígito verificador)"
+    )
     telefono = models.CharField(
         max_length=15,
         blank=True,
@@ -35,6 +50,15 @@ class Usuario(AbstractUser):
     def __str__(self):
         return f"{self.get_full_name()} - {self.get_rol_display()}"
     
+    def save(self, *args, **kwargs):
+        """Normaliza el RUT en su cuerpo numérico y dígito verificador"""
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None or 'rut' in update_fields:
+            self.rut_numero, self.rut_dv = separar_rut(self.rut)
+            if update_fields is not None:
+                kwargs['update_fields'] = set(update_fields) | {'rut_numero', 'rut_dv'}
+        super().save(*args, **kwargs)
+    
     def es_medico(self):
         return self.rol == 'medico'
     
@@ -1,29 +1,87 @@
 import re
 from itertools import cycle
 
+from django.db.models import Q
+
+# Largo máximo del cuerpo de un RUT (sin dígito verificador)
+MAX_DIGITOS_RUT = 8
+
+
+def limpiar_rut(rut):
+    """Elimina puntos, guiones y espacios, y deja la K en mayúscula"""
+    return rut.replace('.', '').replace('-', '').replace(' ', '').strip().upper()
+
+
+def calcular_dv(cuerpo):
+    """Calcula el dígito verificador (Módulo 11) para el cuerpo de un RUT"""
+    rev_cuerpo = map(int, reversed(str(cuerpo)))
+    factors = cycle(range(2, 8))
+    s = sum(d * f for d, f in zip(rev_cuerpo, factors))
+    mod = (-s) % 11
+
+    return {10: 'K', 11: '0'}.get(mod, str(mod))
+
+
+def separar_rut(rut):
+    """
+    Separa un RUT en (cuerpo numérico, dígito verificador).
+    Solo revisa el formato, no el dígito verificador.
+    Retorna (None, '') si el RUT no tiene formato reconocible.
+    """
+    rut_limpio = limpiar_rut(rut or '')
+    if len(rut_limpio) < 2 or not re.match(r'^\d+[0-9K]$', rut_limpio):
+        return None, ''
+    return int(rut_limpio[:-1]), rut_limpio[-1]
+
+
 def validar_rut(rut):
     """
     Valida que un RUT chileno sea correcto (formato y dígito verificador).
     Retorna True si es válido, False si no.
     Acepta formatos: 12.345.678-9, 12345678-9, 123456789
     """
-    # 1. Limpieza: Eliminar puntos y guiones
-    rut_limpio = rut.replace('.', '').replace('-', '').upper()
-    
-    # Validar largo mínimo y que sean números (excepto el K final)
-    if len(rut_limpio) < 2 or not re.match(r'^\d+[0-9K]$', rut_limpio):
+    # 1. Limpieza y separación de cuerpo y dígito verificador (DV)
+    cuerpo, dv = separar_rut(rut)
+    if cuerpo is None:
         return False
-        
-    # 2. Separar cuerpo y dígito verificador (DV)
-    cuerpo = rut_limpio[:-1]
-    dv = rut_limpio[-1]
-    
-    # 3. Calcular DV esperado (Algoritmo Módulo 11)
-    rev_cuerpo = map(int, reversed(cuerpo))
-    factors = cycle(range(2, 8))
-    s = sum(d * f for d, f in zip(rev_cuerpo, factors))
-    mod = (-s) % 11
-    
-    dv_esperado = {10: 'K', 11: '0'}.get(mod, str(mod))
-    
-    return dv == dv_esperado
\ No newline at end of file
+
+    # 2. Comparar con el DV esperado (Algoritmo Módulo 11)
+    return dv == calcular_dv(cuerpo)
+
+
+def filtro_rut(texto, campo='rut_numero'):
+    """
+    Construye un filtro Q sobre el cuerpo numérico del RUT a partir de un
+    texto de búsqueda. Retorna None si el texto no parece un RUT (tampoco si
+    el cuerpo empieza con 0: ningún RUT lo hace, y "0" cubriría a todos).
+
+    - "12.345.678-9" / "12345678-K": búsqueda exacta por cuerpo.
+    - "1234": prefijo; se traduce a rangos numéricos (1234, 12340-12349, ...)
+      que se resuelven con el índice de la columna.
+    - "123456789": puede ser un RUT completo sin guión o un prefijo;
+      se buscan ambas opciones.
+    """
+    texto = (texto or '').replace('.', '').replace(' ', '').strip().upper()
+    if texto.startswith('0'):
+        return None
+
+    completo = re.match(r'^(\d+)-?([0-9K])$', texto)
+    if completo and ('-' in texto or texto.endswith('K')):
+        return Q(**{campo: int(completo.group(1))})
+
+    if not re.match(r'^\d+$', texto):
+        return None
+
+    filtro = Q()
+    largo = len(texto)
+    prefijo = int(texto)
+    for digitos in range(largo, MAX_DIGITOS_RUT + 1):
+        escala = 10 ** (digitos - largo)
+        filtro |= Q(**{f'{campo}__range': (prefijo * escala, (prefijo + 1) * escala - 1)})
+
+    if len(texto) >= 2 and validar_rut(texto):
+        filtro |= Q(**{campo: int(texto[:-1])})
+
+    if not filtro:
+        return None
+    return filtro